@@ -0,0 +1,98 @@
+"""
+Benchmark: punch-write throughput, one commit per write vs group commit.
+
+--threads kiosk threads each insert --punches attendance rows, either
+  - 'direct': DBManager.execute_query, one transaction/fsync per punch
+  - 'group':  DBManager.write, queued to the single writer and batched
+
+Usage:
+    python benchmarks/punch_throughput.py [--threads 16] [--punches 200] [--profile durable]
+"""
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from datetime import date, datetime, timedelta
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT_DIR)
+
+from database.db_manager import DBManager
+from database.query_stats import query_stats
+
+SCHEMA_PATH = os.path.join(ROOT_DIR, 'database', 'schema.sql')
+
+PUNCH = "INSERT INTO attendance (employee_id, date, clock_in, status) VALUES (?, ?, ?, 'Present')"
+
+
+def run_mode(mode, threads, punches, profile):
+    path = os.path.join(tempfile.mkdtemp(prefix="bench_"), "bench.db")
+    db = DBManager(path, profile=profile)
+    db.execute_script(SCHEMA_PATH)
+    db.bulk_insert(
+        'employees', ['employee_code', 'first_name', 'last_name', 'email', 'status'],
+        ((f"EMP{i}", "Bench", f"User{i}", f"user{i}@bench.local", 'Active') for i in range(1, threads + 1))
+    )
+
+    latencies = []
+    errors = [0]
+    lock = threading.Lock()
+
+    def kiosk(employee_id):
+        local, failed = [], 0
+        for n in range(punches):
+            day = str(date.today() + timedelta(days=n))
+            t0 = time.perf_counter()
+            if mode == 'group':
+                try:
+                    db.write(PUNCH, (employee_id, day, datetime.now()))
+                except Exception:
+                    failed += 1
+            elif db.execute_query(PUNCH, (employee_id, day, datetime.now())) is None:
+                failed += 1
+            local.append((time.perf_counter() - t0) * 1000)
+        with lock:
+            latencies.extend(local)
+            errors[0] += failed
+
+    workers = [threading.Thread(target=kiosk, args=(i,)) for i in range(1, threads + 1)]
+    started = time.perf_counter()
+    for t in workers:
+        t.start()
+    for t in workers:
+        t.join()
+    elapsed = time.perf_counter() - started
+
+    writer = db.pool_stats().get('writer', {})
+    db.pool.close_all()
+    latencies.sort()
+    return {
+        'mode': mode,
+        'writes_per_s': len(latencies) / elapsed,
+        'p50_ms': statistics.median(latencies),
+        'p99_ms': latencies[max(0, int(len(latencies) * 0.99) - 1)],
+        'batches': writer.get('batches', len(latencies)),
+        'errors': errors[0],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--threads', type=int, default=16)
+    parser.add_argument('--punches', type=int, default=200)
+    parser.add_argument('--profile', default='durable')
+    args = parser.parse_args()
+
+    query_stats.enabled = False  # keep the benchmark out of the slow-query log
+    print(f"{'mode':<8}{'writes/s':>10}{'p50 ms':>10}{'p99 ms':>10}{'commits':>9}{'errors':>8}")
+    for mode in ('direct', 'group'):
+        r = run_mode(mode, args.threads, args.punches, args.profile)
+        print(f"{r['mode']:<8}{r['writes_per_s']:>10.0f}{r['p50_ms']:>10.2f}{r['p99_ms']:>10.2f}"
+              f"{r['batches']:>9}{r['errors']:>8}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,135 @@
+"""
+Benchmark: report-style read latency while kiosk-style writes are in flight.
+
+Runs the same workload against each storage profile:
+  - --writers threads insert attendance rows, one commit per punch
+  - one reader repeatedly runs a month-long history scan
+
+Usage:
+    python benchmarks/read_latency_under_writes.py [--seconds 5] [--writers 4] [--rows 50000]
+"""
+import argparse
+import os
+import random
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from datetime import date, datetime, timedelta
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT_DIR)
+
+from database.db_manager import DBManager, STORAGE_PROFILES
+from database.query_stats import query_stats
+
+SCHEMA_PATH = os.path.join(ROOT_DIR, 'database', 'schema.sql')
+
+# The workload seeds and writes, so read-only profiles can't run it
+WRITABLE_PROFILES = [name for name, pragmas in STORAGE_PROFILES.items() if not pragmas.get('query_only')]
+
+REPORT_QUERY = """
+SELECT a.*, e.first_name, e.last_name, e.employee_code
+FROM attendance a
+JOIN employees e ON a.employee_id = e.id
+WHERE a.date >= ? AND a.date <= ?
+ORDER BY a.date DESC, a.clock_in DESC
+"""
+
+
+def seed(db, employees, rows):
+    """Fill a fresh database with employees and past attendance"""
+    start = date.today() - timedelta(days=rows // employees + 1)
+    with db.connection() as conn:
+        conn.executemany(
+            "INSERT INTO employees (employee_code, first_name, last_name, email, status) VALUES (?, ?, ?, ?, 'Active')",
+            [(f"EMP{i}", "Bench", f"User{i}", f"user{i}@bench.local") for i in range(1, employees + 1)]
+        )
+        conn.executemany(
+            "INSERT OR IGNORE INTO attendance (employee_id, date, clock_in, clock_out, status, total_hours) "
+            "VALUES (?, ?, ?, ?, 'Present', 8)",
+            (
+                (i % employees + 1, str(day), f"{day} 09:00:00", f"{day} 17:00:00")
+                for i in range(rows)
+                for day in [start + timedelta(days=i // employees)]
+            )
+        )
+        conn.commit()
+
+
+def run_profile(profile, seconds, writers, employees, rows):
+    path = os.path.join(tempfile.mkdtemp(prefix="bench_"), "bench.db")
+    db = DBManager(path, profile=profile)
+    db.execute_script(SCHEMA_PATH)
+    seed(db, employees, rows)
+
+    stop = threading.Event()
+    lock = threading.Lock()
+    counters = {'writes': 0, 'errors': 0, 'day': 0}
+
+    def writer():
+        while not stop.is_set():
+            with lock:
+                counters['day'] += 1
+                day = str(date.today() + timedelta(days=counters['day']))
+            result = db.execute_query(
+                "INSERT INTO attendance (employee_id, date, clock_in, status) VALUES (?, ?, ?, 'Present')",
+                (random.randint(1, employees), day, datetime.now())
+            )
+            with lock:
+                counters['errors' if result is None else 'writes'] += 1
+
+    threads = [threading.Thread(target=writer, daemon=True) for _ in range(writers)]
+    for t in threads:
+        t.start()
+
+    latencies = []
+    month_start = str(date.today() - timedelta(days=30))
+    month_end = str(date.today())
+    deadline = time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        t0 = time.perf_counter()
+        db.execute_query(REPORT_QUERY, (month_start, month_end), fetch_all=True)
+        latencies.append((time.perf_counter() - t0) * 1000)
+
+    stop.set()
+    for t in threads:
+        t.join()
+    db.pool.close_all()
+
+    latencies.sort()
+    return {
+        'profile': profile,
+        'reads': len(latencies),
+        'p50_ms': statistics.median(latencies),
+        'p99_ms': latencies[max(0, int(len(latencies) * 0.99) - 1)],
+        'max_ms': latencies[-1],
+        'writes': counters['writes'],
+        'errors': counters['errors'],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--seconds', type=float, default=5)
+    parser.add_argument('--writers', type=int, default=4)
+    parser.add_argument('--employees', type=int, default=500)
+    parser.add_argument('--rows', type=int, default=50000)
+    parser.add_argument('--profiles', nargs='*', default=WRITABLE_PROFILES,
+                        help=f"storage profiles to compare (default: {' '.join(WRITABLE_PROFILES)})")
+    args = parser.parse_args()
+    for profile in args.profiles:
+        if profile not in WRITABLE_PROFILES:
+            parser.error(f"profile {profile!r} is read-only or unknown; choose from {', '.join(WRITABLE_PROFILES)}")
+
+    query_stats.enabled = False  # keep the benchmark out of the slow-query log
+    print(f"{'profile':<12}{'reads':>8}{'p50 ms':>10}{'p99 ms':>10}{'max ms':>10}{'writes':>9}{'errors':>8}")
+    for profile in args.profiles:
+        r = run_profile(profile, args.seconds, args.writers, args.employees, args.rows)
+        print(f"{r['profile']:<12}{r['reads']:>8}{r['p50_ms']:>10.2f}{r['p99_ms']:>10.2f}"
+              f"{r['max_ms']:>10.2f}{r['writes']:>9}{r['errors']:>8}")
+
+
+if __name__ == "__main__":
+    main()
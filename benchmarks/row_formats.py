@@ -0,0 +1,111 @@
+"""
+Benchmark: memory and time of DBManager result formats on a large history read.
+
+For each row_format ('dict', 'record', 'columns') fetches the org-wide
+attendance history and reports peak Python memory (tracemalloc) and wall
+time, optionally including the pd.DataFrame build the pages do next.
+
+Usage:
+    python benchmarks/row_formats.py [--employees 1000] [--days 250]
+"""
+import argparse
+import gc
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import date, timedelta
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT_DIR)
+
+from database.db_manager import DBManager
+from database.query_stats import query_stats
+from database.rows import ROW_FORMATS
+
+try:
+    import pandas as pd
+except ImportError:
+    pd = None
+
+SCHEMA_PATH = os.path.join(ROOT_DIR, 'database', 'schema.sql')
+
+HISTORY_QUERY = """
+SELECT a.*, e.first_name, e.last_name, e.employee_code, d.name as department_name
+FROM attendance a
+JOIN employees e ON a.employee_id = e.id
+LEFT JOIN departments d ON e.department_id = d.id
+ORDER BY a.date DESC, a.clock_in DESC
+"""
+
+
+def build_database(employees, days):
+    path = os.path.join(tempfile.mkdtemp(prefix="bench_"), "bench.db")
+    db = DBManager(path)
+    db.execute_script(SCHEMA_PATH)
+    db.bulk_insert('departments', ['name'], [(f"Dept {i}",) for i in range(10)])
+    db.bulk_insert(
+        'employees', ['employee_code', 'first_name', 'last_name', 'email', 'department_id', 'status'],
+        ((f"EMP{i}", "Bench", f"User{i}", f"user{i}@bench.local", i % 10 + 1, 'Active') for i in range(1, employees + 1))
+    )
+    start = date.today() - timedelta(days=days)
+    db.bulk_insert(
+        'attendance',
+        ['employee_id', 'date', 'clock_in', 'clock_out', 'status', 'total_hours', 'regular_hours', 'overtime_hours'],
+        (
+            (emp, str(day), f"{day} 09:00:00", f"{day} 17:30:00", 'Present', 7.5, 7.5, 0.0)
+            for d in range(days)
+            for day in [start + timedelta(days=d)]
+            for emp in range(1, employees + 1)
+        )
+    )
+    return db
+
+
+def measure(db, row_format, with_frame):
+    """Wall time without tracing, then peak allocations with tracemalloc"""
+    gc.collect()
+    t0 = time.perf_counter()
+    rows = db.execute_query(HISTORY_QUERY, fetch_all=True, row_format=row_format)
+    fetched = time.perf_counter() - t0
+    frame_time = None
+    if with_frame:
+        t1 = time.perf_counter()
+        pd.DataFrame(rows)
+        frame_time = time.perf_counter() - t1
+    count = len(rows['id']) if row_format == 'columns' else len(rows)
+    del rows
+
+    gc.collect()
+    tracemalloc.start()
+    rows = db.execute_query(HISTORY_QUERY, fetch_all=True, row_format=row_format)
+    _, peak_rows = tracemalloc.get_traced_memory()
+    if with_frame:
+        pd.DataFrame(rows)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return count, fetched, peak_rows, frame_time, peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--employees', type=int, default=1000)
+    parser.add_argument('--days', type=int, default=250)
+    args = parser.parse_args()
+
+    query_stats.enabled = False  # keep the benchmark out of the slow-query log
+    db = build_database(args.employees, args.days)
+    with_frame = pd is not None
+    if not with_frame:
+        print("(pandas not installed: skipping DataFrame construction)")
+
+    print(f"{'format':<9}{'rows':>9}{'fetch s':>10}{'rows MB':>10}{'frame s':>10}{'peak MB':>10}")
+    for row_format in ROW_FORMATS:
+        count, fetched, peak_rows, frame_time, peak = measure(db, row_format, with_frame)
+        frame = f"{frame_time:>10.2f}" if frame_time is not None else f"{'-':>10}"
+        print(f"{row_format:<9}{count:>9}{fetched:>10.2f}{peak_rows / 2**20:>10.1f}{frame}{peak / 2**20:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
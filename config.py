@@ -11,7 +11,7 @@ VERSION = "1.0.0"
 DEBUG = True
 
 # Security
-SECRET_KEY = os.getenv("SECRET_KEY", "your-secret-key-here")  # Use env var in production
+SECRET_KEY = os.getenv("SECRET_KEY", "your-secret-key-here")  # Use env var in production; also keys kiosk PIN digests, so changing it resets all PINs
 SESSION_EXPIRY_MINUTES = 60
 
 # Attendance Settings
@@ -22,3 +22,59 @@ DEFAULT_BREAK_DURATION = 60  # minutes
 PAGE_TITLE = "Work Attendance System"
 PAGE_ICON = "🏢"
 LAYOUT = "wide"
+
+# Database Connection Pool
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "16"))  # max open connections per database file
+DB_POOL_TIMEOUT = 30  # seconds to wait for a free connection / SQLite lock
+DB_POOL_HEALTH_CHECK_SECONDS = 60  # ping idle connections older than this before reuse
+
+# Database Storage Profile (see STORAGE_PROFILES in database/db_manager.py)
+# "concurrent": WAL journal so kiosk writes don't block report scans (recommended)
+# "rollback": SQLite defaults, single file with no -wal/-shm side files
+DB_STORAGE_PROFILE = os.getenv("DB_STORAGE_PROFILE", "concurrent")
+DB_CHECKPOINT_INTERVAL_SECONDS = 300  # background PASSIVE checkpoint of the WAL file
+DB_BULK_CHUNK_SIZE = 5000  # rows per transaction for DBManager.bulk_insert / bulk_upsert
+DB_FETCH_CHUNK_SIZE = 1000  # rows per fetchmany() for DBManager.iter_query
+
+# Query Instrumentation
+QUERY_STATS_ENABLED = True
+SLOW_QUERY_THRESHOLD_MS = float(os.getenv("SLOW_QUERY_THRESHOLD_MS", "200"))
+SLOW_QUERY_LOG_PATH = os.path.join(ROOT_DIR, 'logs', 'slow_queries.log')  # JSON lines; None to disable
+
+# Backups (database/backup.py)
+BACKUP_DIR = os.path.join(ROOT_DIR, 'backups')
+BACKUP_KEEP = 14  # rotating snapshots to keep
+BACKUP_PAGES_PER_STEP = 1024  # pages copied per backup step (lock is released between steps)
+BACKUP_STEP_SLEEP = 0.005  # seconds to yield to other connections between steps
+
+# Group-commit writer (DBManager.write / submit_write)
+DB_WRITE_QUEUE_SIZE = 2000  # pending writes before callers get WriteQueueFull (backpressure)
+DB_WRITE_QUEUE_TIMEOUT = 5  # seconds a caller may block waiting for queue space
+DB_WRITE_TIMEOUT = 30  # seconds DBManager.write waits for its batch to commit
+DB_GROUP_COMMIT_MAX_BATCH = 256  # writes folded into one commit
+
+# asyncio facade (database/async_db.py)
+DB_ASYNC_WORKERS = 8  # executor threads per database file; keep below DB_POOL_SIZE
+
+# History screens (keyset-paginated, see Attendance.get_history_page)
+HISTORY_PAGE_SIZE = 50
+IMPORT_REPORT_DIR = os.path.join(ROOT_DIR, 'logs', 'imports')  # error reports from services/import_service.py
+
+# Calendar feed (services/calendar_service.py)
+CALENDAR_CACHE_MONTHS = 4096  # cached (employee, month) event lists, least recently used evicted
+CALENDAR_CACHE_TTL_SECONDS = 300  # bounds staleness from writes made by other processes
+
+# Shift roster (services/roster_service.py)
+ROSTER_HORIZON_DAYS = 92  # days ahead expanded into shift_schedule (about a quarter)
+ROSTER_CHUNK_EMPLOYEES = 100  # employees expanded per transaction (~50 ms write lock at 92 days)
+
+# Geofencing (services/geofence_service.py)
+GEOFENCE_CELL_DEGREES = 0.01  # grid index cell size (about 1.1 km of latitude)
+GEOFENCE_REJECT_OFFSITE = os.getenv("GEOFENCE_REJECT_OFFSITE", "0") == "1"  # refuse off-site clock-ins instead of flagging them
+
+# Anomaly detection (services/anomaly_service.py)
+ANOMALY_LONG_DAY_HOURS = 16  # clock-in to clock-out span flagged as a long day
+ANOMALY_LATE_COUNT = 3  # late arrivals within ANOMALY_LATE_WINDOW_DAYS flagged as repeated lateness
+ANOMALY_LATE_WINDOW_DAYS = 14
+ANOMALY_SHIFT_TOLERANCE_MINUTES = 120  # how far a punch may fall outside the shift window
+ANOMALY_CLOCK_OUT_GRACE_HOURS = 4  # after shift end (or midnight) before a missing clock-out is flagged
@@ -0,0 +1,93 @@
+"""
+asyncio facade over DBManager.
+
+sqlite3 is blocking, so AsyncDBManager runs each call on a bounded thread
+pool shared by every facade of the same database file. Independent reads
+then overlap under asyncio.gather instead of running back to back, and an
+event loop serving many kiosks is never blocked by a query:
+
+    adb = AsyncDBManager()
+    employees, pending = await asyncio.gather(
+        adb.execute_query("SELECT * FROM employees", fetch_all=True),
+        adb.execute_query("SELECT * FROM attendance WHERE is_approved = 0", fetch_all=True),
+    )
+
+Writes go to the group-commit writer and are awaited without holding a
+worker thread. Transactions are bound to one thread, so a multi-statement
+unit is passed in as a function (run_in_transaction / write_unit).
+"""
+import asyncio
+import itertools
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from config import DB_ASYNC_WORKERS, DB_FETCH_CHUNK_SIZE
+from database.db_manager import DBManager
+
+_executors = {}
+_executors_lock = threading.Lock()
+
+
+def get_executor(db_path, max_workers=DB_ASYNC_WORKERS):
+    """Process-wide executor for a database file; size is fixed on first use"""
+    with _executors_lock:
+        executor = _executors.get(db_path)
+        if executor is None:
+            executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="db-async")
+            _executors[db_path] = executor
+        return executor
+
+
+class AsyncDBManager:
+    def __init__(self, db=None, max_workers=DB_ASYNC_WORKERS):
+        self.db = db or DBManager()
+        self.executor = get_executor(self.db.db_path, max_workers)
+
+    async def run(self, fn, *args, **kwargs):
+        """Await fn(*args, **kwargs) executed on the database executor"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.executor, lambda: fn(*args, **kwargs))
+
+    async def execute_query(self, query, params=(), fetch_one=False, fetch_all=False, row_format='dict'):
+        return await self.run(self.db.execute_query, query, params, fetch_one, fetch_all, row_format)
+
+    async def query_frame(self, query, params=(), dtypes=None):
+        return await self.run(self.db.query_frame, query, params, dtypes)
+
+    async def iter_query(self, query, params=(), chunk_size=DB_FETCH_CHUNK_SIZE, row_format='dict'):
+        """Async generator over DBManager.iter_query; each chunk is fetched on the executor"""
+        async for row in self.iterate(self.db.iter_query, query, params, chunk_size, row_format,
+                                      batch_size=chunk_size):
+            yield row
+
+    async def iterate(self, gen_fn, *args, batch_size=DB_FETCH_CHUNK_SIZE, **kwargs):
+        """
+        Drive a blocking generator from the event loop. Items are pulled on
+        the executor batch_size at a time, so chunked fetches never block it
+        and the executor round trip is paid once per batch, not per row.
+        """
+        gen = gen_fn(*args, **kwargs)
+        try:
+            while True:
+                batch = await self.run(lambda: list(itertools.islice(gen, batch_size)))
+                for item in batch:
+                    yield item
+                if len(batch) < batch_size:
+                    return
+        finally:
+            await self.run(gen.close)
+
+    async def run_in_transaction(self, fn, *args, immediate=False, **kwargs):
+        """Run fn inside db.transaction() on one worker thread; model calls it makes join it"""
+        def unit():
+            with self.db.transaction(immediate=immediate):
+                return fn(*args, **kwargs)
+        return await self.run(unit)
+
+    async def write(self, query, params=()):
+        """Group-committed write (see DBManager.write); raises on failure or WriteQueueFull"""
+        future = await self.run(self.db.submit_write, query, params)
+        return await asyncio.wrap_future(future)
+
+    async def write_unit(self, fn, *args, **kwargs):
+        future = await self.run(self.db.submit_unit, fn, *args, **kwargs)
+        return await asyncio.wrap_future(future)
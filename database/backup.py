@@ -0,0 +1,171 @@
+"""
+Online hot backups built on the SQLite backup API.
+
+Copying work_attendance.db while kiosks are writing can produce a torn
+file. create_snapshot() instead copies pages through sqlite3's backup API
+in small steps, releasing the lock and sleeping between steps so clock-ins
+are never stalled. In WAL mode the source connection also pins one read
+snapshot for the whole copy: writers keep committing to the WAL, and the
+backup neither blocks them nor restarts because of them.
+
+Snapshots rotate in BACKUP_DIR and can be opened read-only for reports.
+
+CLI (schedule nightly, e.g. cron or Windows Task Scheduler):
+    python -m database.backup           # take a snapshot and rotate
+    python -m database.backup --list
+"""
+import argparse
+import logging
+import os
+import re
+import sqlite3
+import time
+from datetime import datetime
+from urllib.parse import quote
+from config import DATABASE_PATH, BACKUP_DIR, BACKUP_KEEP, BACKUP_PAGES_PER_STEP, BACKUP_STEP_SLEEP
+from database.db_manager import DBManager
+
+logger = logging.getLogger(__name__)
+
+# Microseconds since snapshots can be taken back to back; older files have none
+_SNAPSHOT_FILE = re.compile(r'^(?P<stem>.+)-(?P<stamp>\d{8}-\d{6})(?:-(?P<micros>\d{6}))?\.db$')
+
+
+def _snapshot_name(db_path, when):
+    stem = os.path.splitext(os.path.basename(db_path))[0]
+    return f"{stem}-{when.strftime('%Y%m%d-%H%M%S-%f')}.db"
+
+
+def _claim_target(db_path, backup_dir):
+    """
+    (target, partial) for a new snapshot. The partial is created exclusively,
+    so concurrent backups never share one, and a name whose snapshot already
+    exists is skipped rather than overwritten.
+    """
+    while True:
+        target = os.path.join(backup_dir, _snapshot_name(db_path, datetime.now()))
+        partial = target + ".partial"
+        try:
+            with open(partial, 'x'):
+                pass
+        except FileExistsError:
+            continue
+        if os.path.exists(target):
+            os.remove(partial)
+            continue
+        return target, partial
+
+
+def create_snapshot(db_path=DATABASE_PATH, backup_dir=BACKUP_DIR, pages=BACKUP_PAGES_PER_STEP,
+                    sleep=BACKUP_STEP_SLEEP, progress=None):
+    """
+    Copy the live database into a new timestamped snapshot file.
+    progress(remaining, total) is called after every step.
+    Returns the snapshot path; raises sqlite3.Error / OSError on failure.
+    """
+    os.makedirs(backup_dir, exist_ok=True)
+    target, partial = _claim_target(db_path, backup_dir)
+
+    started = time.perf_counter()
+    src = dst = None
+    try:
+        src = sqlite3.connect(db_path, timeout=30)
+        dst = sqlite3.connect(partial)
+        wal = src.execute("PRAGMA journal_mode").fetchone()[0].lower() == 'wal'
+        if wal:
+            # Pin a read snapshot: every step sees the same database state
+            src.execute("BEGIN")
+            src.execute("SELECT 1 FROM sqlite_master LIMIT 1").fetchone()
+
+        def on_progress(status, remaining, total):
+            if progress:
+                progress(remaining, total)
+
+        src.backup(dst, pages=pages, progress=on_progress, sleep=sleep)
+
+        # Snapshots are standalone files: no -wal/-shm needed to read them
+        dst.execute("PRAGMA journal_mode = DELETE")
+        dst.commit()
+    except BaseException:
+        for conn in (dst, src):
+            if conn is not None:
+                conn.close()
+        if os.path.exists(partial):
+            os.remove(partial)
+        raise
+    dst.close()
+    src.close()
+
+    os.replace(partial, target)
+    logger.info(f"Backup snapshot written to {target} in {time.perf_counter() - started:.1f}s")
+    return target
+
+
+def list_snapshots(backup_dir=BACKUP_DIR):
+    """Completed snapshots, newest first, as dicts with path/created/size_mb"""
+    if not os.path.isdir(backup_dir):
+        return []
+    snapshots = []
+    for filename in os.listdir(backup_dir):
+        match = _SNAPSHOT_FILE.match(filename)
+        if not match:
+            continue
+        path = os.path.join(backup_dir, filename)
+        snapshots.append({
+            'path': path,
+            'name': filename,
+            'created': datetime.strptime(match.group('stamp') + (match.group('micros') or '000000'),
+                                         '%Y%m%d-%H%M%S%f'),
+            'size_mb': round(os.path.getsize(path) / 2**20, 2),
+        })
+    snapshots.sort(key=lambda s: s['created'], reverse=True)
+    return snapshots
+
+
+def rotate(backup_dir=BACKUP_DIR, keep=BACKUP_KEEP):
+    """Delete all but the newest `keep` snapshots; returns the deleted paths"""
+    removed = []
+    for snap in list_snapshots(backup_dir)[keep:]:
+        try:
+            os.remove(snap['path'])
+            removed.append(snap['path'])
+        except OSError as e:
+            logger.warning(f"Could not remove old snapshot {snap['path']}: {e}")
+    return removed
+
+
+def backup(db_path=DATABASE_PATH, backup_dir=BACKUP_DIR, keep=BACKUP_KEEP):
+    """Take a snapshot and rotate old ones. Returns the new path, or None on failure."""
+    try:
+        path = create_snapshot(db_path, backup_dir)
+    except (sqlite3.Error, OSError) as e:
+        logger.error(f"Backup of {db_path} failed: {e}")
+        return None
+    rotate(backup_dir, keep)
+    return path
+
+
+def open_snapshot(path):
+    """Read-only DBManager over a snapshot; model code can use it in place of the live db"""
+    return DBManager(f"file:{quote(os.path.abspath(path))}?mode=ro", profile='readonly')
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Online backup of the attendance database")
+    parser.add_argument('--list', action='store_true', help="list existing snapshots")
+    parser.add_argument('--keep', type=int, default=BACKUP_KEEP)
+    args = parser.parse_args()
+
+    if args.list:
+        for snap in list_snapshots():
+            print(f"{snap['created']:%Y-%m-%d %H:%M:%S}  {snap['size_mb']:>9.2f} MB  {snap['path']}")
+        return
+
+    path = backup(keep=args.keep)
+    if not path:
+        raise SystemExit("Backup failed. See log for details.")
+    print(f"Snapshot written to {path}")
+
+
+if __name__ == "__main__":
+    main()
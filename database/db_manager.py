@@ -1,61 +1,728 @@
 import sqlite3
 import logging
-from config import DATABASE_PATH
+import queue
+import re
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future
+from contextlib import contextmanager
+import config
+from config import (
+    DB_POOL_SIZE, DB_POOL_TIMEOUT, DB_POOL_HEALTH_CHECK_SECONDS,
+    DB_STORAGE_PROFILE, DB_CHECKPOINT_INTERVAL_SECONDS, DB_BULK_CHUNK_SIZE,
+    DB_FETCH_CHUNK_SIZE, DB_WRITE_QUEUE_SIZE, DB_WRITE_QUEUE_TIMEOUT, DB_WRITE_TIMEOUT,
+    DB_GROUP_COMMIT_MAX_BATCH
+)
+from database.query_stats import query_stats
+from database.rows import ROW_FORMATS, format_row, format_rows
 
 logger = logging.getLogger(__name__)
 
-class DBManager:
-    def __init__(self, db_path=DATABASE_PATH):
+# Pragmas applied once when a pooled connection is opened, not on every query.
+# Order matters: journal_mode must be set before anything touches the file.
+STORAGE_PROFILES = {
+    # SQLite defaults: readers and the writer block each other
+    'rollback': {
+        'journal_mode': 'DELETE',
+        'synchronous': 'FULL',
+        'busy_timeout': DB_POOL_TIMEOUT * 1000,
+        'temp_store': 'MEMORY',
+    },
+    # Readers never block the writer and vice versa. NORMAL is durable against
+    # application crashes; a power loss can drop the last few commits.
+    'concurrent': {
+        'journal_mode': 'WAL',
+        'synchronous': 'NORMAL',
+        'mmap_size': 256 * 1024 * 1024,
+        'cache_size': -16000,  # negative = KiB, so ~16 MB per connection
+        'busy_timeout': DB_POOL_TIMEOUT * 1000,
+        'temp_store': 'MEMORY',
+        'wal_autocheckpoint': 1000,
+    },
+    # WAL concurrency with an fsync on every commit
+    'durable': {
+        'journal_mode': 'WAL',
+        'synchronous': 'FULL',
+        'mmap_size': 256 * 1024 * 1024,
+        'cache_size': -16000,
+        'busy_timeout': DB_POOL_TIMEOUT * 1000,
+        'temp_store': 'MEMORY',
+        'wal_autocheckpoint': 1000,
+    },
+    # Read-only access, e.g. reports against a backup snapshot ("file:...?mode=ro")
+    'readonly': {
+        'query_only': 1,
+        'mmap_size': 256 * 1024 * 1024,
+        'cache_size': -16000,
+        'busy_timeout': DB_POOL_TIMEOUT * 1000,
+        'temp_store': 'MEMORY',
+    },
+}
+
+
+def get_storage_profile(name=DB_STORAGE_PROFILE):
+    """Pragmas for a named storage profile, falling back to 'rollback' if unknown"""
+    if name not in STORAGE_PROFILES:
+        logger.warning(f"Unknown storage profile '{name}', using 'rollback'")
+        name = 'rollback'
+    return STORAGE_PROFILES[name]
+
+
+class Checkpointer(threading.Thread):
+    """Background thread that periodically folds the WAL file back into the database"""
+
+    def __init__(self, db_path, interval=DB_CHECKPOINT_INTERVAL_SECONDS, mode='PASSIVE'):
+        super().__init__(name=f"wal-checkpoint:{db_path}", daemon=True)
+        self.db_path = db_path
+        self.interval = interval
+        self.mode = mode
+        self._stop_event = threading.Event()
+        self.last_result = None
+
+    def checkpoint(self):
+        """Run one checkpoint; returns (busy, wal_pages, checkpointed_pages)"""
+        conn = sqlite3.connect(self.db_path, timeout=DB_POOL_TIMEOUT)
+        try:
+            self.last_result = conn.execute(f"PRAGMA wal_checkpoint({self.mode})").fetchone()
+            return self.last_result
+        finally:
+            conn.close()
+
+    def run(self):
+        while not self._stop_event.wait(self.interval):
+            try:
+                self.checkpoint()
+            except sqlite3.Error as e:
+                logger.warning(f"WAL checkpoint failed: {e}")
+
+    def stop(self):
+        self._stop_event.set()
+
+
+class WriteQueueFull(sqlite3.OperationalError):
+    """The group-commit queue stayed full past the submit timeout (backpressure)"""
+
+
+class GroupCommitWriter(threading.Thread):
+    """
+    Single writer thread for one database file.
+
+    Queued jobs are applied in batches: one BEGIN IMMEDIATE ... COMMIT per
+    batch instead of one per write, and each job runs inside its own SAVEPOINT
+    so a failing job is undone without taking the batch down. While a batch
+    runs, its connection is bound as this thread's transaction, so model code
+    executed by a job joins it transparently. Futures resolve after COMMIT.
+    """
+
+    def __init__(self, pool, max_queue=DB_WRITE_QUEUE_SIZE, max_batch=DB_GROUP_COMMIT_MAX_BATCH):
+        super().__init__(name=f"db-writer:{pool.db_path}", daemon=True)
+        self.pool = pool
+        self.queue = queue.Queue(maxsize=max_queue)
+        self.max_batch = max_batch
+        self._lock = threading.Lock()
+        self._stats = {'batches': 0, 'jobs': 0, 'failed_jobs': 0, 'largest_batch': 0, 'rejected': 0}
+        self._error = None  # set if the writer could not open its connection and stopped
+
+    def submit(self, job, timeout=DB_WRITE_QUEUE_TIMEOUT):
+        """Queue job(conn); returns a Future. Raises WriteQueueFull if no room frees up in time."""
+        future = Future()
+        try:
+            self.queue.put((job, future), timeout=timeout)
+        except queue.Full:
+            with self._lock:
+                self._stats['rejected'] += 1
+            raise WriteQueueFull(f"Write queue full ({self.queue.maxsize} pending writes), try again shortly")
+        if self._error is not None:
+            self._fail_queued()  # queued just as the writer stopped; nobody else will run it
+        return future
+
+    def run(self):
+        try:
+            conn = self.pool._connect()
+        except sqlite3.Error as e:
+            # Fail what is queued and step aside; the next submit starts a new writer
+            logger.error(f"Writer for {self.pool.db_path} could not connect: {e}")
+            self._error = e
+            self.pool._writer_stopped(self)
+            self._fail_queued()
+            return
+        while True:
+            batch = [self.queue.get()]
+            while len(batch) < self.max_batch:
+                try:
+                    batch.append(self.queue.get_nowait())
+                except queue.Empty:
+                    break
+            self._apply(conn, batch)
+
+    def _fail_queued(self):
+        while True:
+            try:
+                _, future = self.queue.get_nowait()
+            except queue.Empty:
+                return
+            if future.set_running_or_notify_cancel():
+                future.set_exception(self._error)
+
+    def _apply(self, conn, batch):
+        outcomes = []
+        self.pool.bind_transaction(conn)
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            for job, future in batch:
+                if not future.set_running_or_notify_cancel():
+                    continue
+                conn.execute("SAVEPOINT group_commit_job")
+                try:
+                    value = job(conn)
+                except Exception as e:
+                    conn.execute("ROLLBACK TO group_commit_job")
+                    outcomes.append((future, None, e))
+                else:
+                    outcomes.append((future, value, None))
+                conn.execute("RELEASE group_commit_job")
+            conn.commit()
+        except sqlite3.Error as e:
+            # BEGIN, a savepoint or COMMIT failed: nothing from this batch persisted
+            logger.error(f"Group commit of {len(batch)} writes failed: {e}")
+            if conn.in_transaction:
+                conn.rollback()
+            outcomes = [(future, None, e) for _, future in batch if not future.cancelled()]
+        finally:
+            self.pool.bind_transaction(None)
+
+        failed = 0
+        for future, value, error in outcomes:
+            if error is None:
+                future.set_result(value)
+            else:
+                failed += 1
+                future.set_exception(error)
+        with self._lock:
+            self._stats['batches'] += 1
+            self._stats['jobs'] += len(batch)
+            self._stats['failed_jobs'] += failed
+            self._stats['largest_batch'] = max(self._stats['largest_batch'], len(batch))
+
+    def stats(self):
+        with self._lock:
+            snapshot = dict(self._stats)
+        snapshot['queued'] = self.queue.qsize()
+        return snapshot
+
+
+class ConnectionPool:
+    """Thread-safe pool of long-lived SQLite connections for one database file"""
+
+    def __init__(self, db_path, max_size=DB_POOL_SIZE, timeout=DB_POOL_TIMEOUT,
+                 health_check_seconds=DB_POOL_HEALTH_CHECK_SECONDS, pragmas=None,
+                 profile=DB_STORAGE_PROFILE):
         self.db_path = db_path
+        self.max_size = max_size
+        self.timeout = timeout
+        self.health_check_seconds = health_check_seconds
+        self.profile = profile
+        self.pragmas = dict(get_storage_profile(profile) if pragmas is None else pragmas)
+        self.checkpointer = None
+        if str(self.pragmas.get('journal_mode', '')).upper() == 'WAL' and DB_CHECKPOINT_INTERVAL_SECONDS:
+            self.checkpointer = Checkpointer(db_path)
+            self.checkpointer.start()
+        self._idle = deque()  # (conn, last_used); LIFO keeps the warmest connections busy
+        self._cond = threading.Condition()
+        self._open = 0
+        self._stats = {'hits': 0, 'misses': 0, 'waits': 0, 'timeouts': 0, 'discarded': 0}
+        self._local = threading.local()  # connection of this thread's open transaction, if any
+        self._writer = None
+
+    def _connect(self):
+        """Open a new connection and apply the per-connection setup"""
+        conn = sqlite3.connect(
+            self.db_path, timeout=self.timeout, check_same_thread=False,
+            uri=str(self.db_path).startswith('file:')
+        )
+        conn.row_factory = sqlite3.Row
+        for name, value in self.pragmas.items():
+            conn.execute(f"PRAGMA {name} = {value}")
+        return conn
+
+    def _is_healthy(self, conn):
+        try:
+            conn.execute("SELECT 1").fetchone()
+            return True
+        except sqlite3.Error:
+            return False
+
+    def _discard(self, conn):
+        try:
+            conn.close()
+        except sqlite3.Error:
+            pass
+        with self._cond:
+            self._open -= 1
+            self._stats['discarded'] += 1
+            self._cond.notify()
+
+    def acquire(self):
+        """Check out a connection, opening one if the pool is not yet full"""
+        deadline = time.monotonic() + self.timeout
+        with self._cond:
+            waited = False
+            while not self._idle and self._open >= self.max_size:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    self._stats['timeouts'] += 1
+                    raise sqlite3.OperationalError(
+                        f"Timed out after {self.timeout}s waiting for a pooled connection"
+                    )
+                if not waited:
+                    self._stats['waits'] += 1
+                    waited = True
+                self._cond.wait(remaining)
+
+            if self._idle:
+                conn, last_used = self._idle.pop()
+                self._stats['hits'] += 1
+            else:
+                conn, last_used = None, None
+                self._open += 1
+                self._stats['misses'] += 1
+
+        if conn is None:
+            try:
+                return self._connect()
+            except sqlite3.Error:
+                with self._cond:
+                    self._open -= 1
+                    self._cond.notify()
+                raise
+
+        if time.monotonic() - last_used > self.health_check_seconds and not self._is_healthy(conn):
+            logger.warning("Discarding unhealthy pooled connection")
+            self._discard(conn)
+            return self.acquire()
+        return conn
+
+    def release(self, conn):
+        """Return a connection to the pool, rolling back anything left uncommitted"""
+        try:
+            if conn.in_transaction:
+                conn.rollback()
+        except sqlite3.Error:
+            self._discard(conn)
+            return
+        with self._cond:
+            self._idle.append((conn, time.monotonic()))
+            self._cond.notify()
+
+    def writer(self):
+        """The pool's group-commit writer thread, started on first use"""
+        if self._writer is None:
+            with self._cond:
+                if self._writer is None:
+                    writer = GroupCommitWriter(self)
+                    writer.start()
+                    self._writer = writer
+        return self._writer
+
+    def _writer_stopped(self, writer):
+        with self._cond:
+            if self._writer is writer:
+                self._writer = None
+
+    def transaction_connection(self):
+        """Connection of the transaction open on the calling thread, or None"""
+        return getattr(self._local, 'conn', None)
+
+    def bind_transaction(self, conn):
+        self._local.conn = conn
+
+    def close_all(self):
+        """Close all idle connections, e.g. before the database file is replaced"""
+        if self.checkpointer:
+            self.checkpointer.stop()
+        with self._cond:
+            while self._idle:
+                conn, _ = self._idle.pop()
+                conn.close()
+                self._open -= 1
+
+    def stats(self):
+        """Snapshot of pool counters"""
+        with self._cond:
+            snapshot = dict(self._stats)
+            snapshot.update({
+                'open': self._open,
+                'idle': len(self._idle),
+                'in_use': self._open - len(self._idle),
+                'max_size': self.max_size,
+            })
+        if self._writer is not None:
+            snapshot['writer'] = self._writer.stats()
+        return snapshot
+
+
+_pools = {}
+_pools_lock = threading.Lock()
+
+
+def get_pool(db_path=None, profile=DB_STORAGE_PROFILE):
+    """
+    Process-wide pool for a database file, shared by every DBManager instance.
+    The storage profile only takes effect when the pool is first created.
+    """
+    db_path = db_path or config.DATABASE_PATH
+    with _pools_lock:
+        pool = _pools.get(db_path)
+        if pool is None:
+            pool = ConnectionPool(db_path, profile=profile)
+            _pools[db_path] = pool
+        return pool
+
+
+class DBManager:
+    def __init__(self, db_path=None, profile=DB_STORAGE_PROFILE):
+        # config.DATABASE_PATH is read per instance, so tools and tests can point it elsewhere
+        self.db_path = db_path or config.DATABASE_PATH
+        self.pool = get_pool(self.db_path, profile)
+        self.query_stats = query_stats
 
     def get_connection(self):
-        """Create a database connection"""
+        """Create a dedicated (unpooled) database connection"""
         try:
-            conn = sqlite3.connect(self.db_path)
-            conn.row_factory = sqlite3.Row
-            return conn
+            return self.pool._connect()
         except sqlite3.Error as e:
             logger.error(f"Error connecting to database: {e}")
             return None
 
-    def execute_query(self, query, params=(), fetch_one=False, fetch_all=False):
-        """Execute a query with optional parameters"""
-        conn = self.get_connection()
-        if not conn:
+    @contextmanager
+    def connection(self):
+        """Borrow a pooled connection for the block (or join this thread's open transaction)"""
+        conn = self.pool.transaction_connection()
+        if conn is not None:
+            yield conn
+            return
+        conn = self.pool.acquire()
+        try:
+            yield conn
+        finally:
+            self.pool.release(conn)
+
+    @contextmanager
+    def transaction(self, immediate=False):
+        """
+        Unit of work spanning several model calls.
+
+        Every DBManager on this thread (whichever model created it) runs its
+        queries on the same connection until the block exits; the block then
+        commits once, or rolls back if it raised. Inside the block, database
+        errors propagate instead of being logged and swallowed. Nested blocks
+        join the outermost one. Use immediate=True for check-then-write flows
+        so the write lock is taken up front.
+        """
+        conn = self.pool.transaction_connection()
+        if conn is not None:
+            yield conn
+            return
+
+        conn = self.pool.acquire()
+        self.pool.bind_transaction(conn)
+        try:
+            conn.execute("BEGIN IMMEDIATE" if immediate else "BEGIN")
+            yield conn
+            conn.commit()
+        except BaseException:
+            conn.rollback()
+            raise
+        finally:
+            self.pool.bind_transaction(None)
+            self.pool.release(conn)
+
+    def in_transaction(self):
+        """True while a transaction() block is open on the calling thread"""
+        return self.pool.transaction_connection() is not None
+
+    def pool_stats(self):
+        """Connection pool statistics (hits, misses, waits, open connections)"""
+        return self.pool.stats()
+
+    def checkpoint(self, mode='PASSIVE'):
+        """Checkpoint the WAL file now; returns (busy, wal_pages, checkpointed_pages)"""
+        try:
+            with self.connection() as conn:
+                return tuple(conn.execute(f"PRAGMA wal_checkpoint({mode})").fetchone())
+        except sqlite3.Error as e:
+            logger.error(f"WAL checkpoint failed: {e}")
+            return None
+
+    def storage_info(self):
+        """Effective storage pragmas of a pooled connection"""
+        with self.connection() as conn:
+            return {
+                name: conn.execute(f"PRAGMA {name}").fetchone()[0]
+                for name in self.pool.pragmas
+            }
+
+    def _record(self, conn, query, params, elapsed, rows):
+        """Feed one execution (elapsed in seconds) into the query statistics; never fails the query"""
+        try:
+            self.query_stats.record(conn, query, params, elapsed * 1000, rows)
+        except Exception as e:
+            logger.debug(f"Query instrumentation failed: {e}")
+
+    def execute_query(self, query, params=(), fetch_one=False, fetch_all=False, row_format='dict'):
+        """
+        Execute a query with optional parameters.
+        row_format: 'dict' (default), 'record' or 'columns'; see database/rows.py
+        """
+        if row_format not in ROW_FORMATS:
+            raise ValueError(f"Unknown row_format: {row_format!r}")
+        tx_conn = self.pool.transaction_connection()
+        try:
+            conn = tx_conn or self.pool.acquire()
+        except sqlite3.Error as e:
+            logger.error(f"Error connecting to database: {e}")
             return None
-        
+
         try:
+            started = time.perf_counter()
             cursor = conn.cursor()
+            if row_format != 'dict':
+                cursor.row_factory = None  # plain tuples; formatted below
             cursor.execute(query, params)
-            
+
             if fetch_one:
                 result = cursor.fetchone()
+                self._record(conn, query, params, time.perf_counter() - started, 1 if result else 0)
+                if row_format != 'dict':
+                    return format_row(cursor, result, row_format)
                 return dict(result) if result else None
-            
+
             if fetch_all:
                 result = cursor.fetchall()
+                self._record(conn, query, params, time.perf_counter() - started, len(result))
+                if row_format != 'dict':
+                    return format_rows(cursor, result, row_format)
                 return [dict(row) for row in result] if result else []
-            
-            conn.commit()
+
+            if tx_conn is None:
+                conn.commit()
+            self._record(conn, query, params, time.perf_counter() - started, cursor.rowcount)
             return cursor.lastrowid
-            
+
         except sqlite3.Error as e:
             logger.error(f"Database error executing query: {query}, Error: {e}")
+            if tx_conn is not None:
+                raise  # let transaction() roll back the whole unit of work
             conn.rollback()
             return None
         finally:
-            conn.close()
+            if tx_conn is None:
+                self.pool.release(conn)
+
+    # 'columns' needs the whole result set, so it can't be streamed
+    STREAM_ROW_FORMATS = ('dict', 'record')
+
+    def iter_query(self, query, params=(), chunk_size=DB_FETCH_CHUNK_SIZE, row_format='dict'):
+        """
+        Stream rows as dicts (or records, see database/rows.py), fetching
+        `chunk_size` rows at a time.
+        The pooled connection is held until the generator is exhausted or closed,
+        so consume it promptly (or wrap it in contextlib.closing).
+        Raises ValueError right away for a row_format that can't be streamed.
+        """
+        if row_format not in self.STREAM_ROW_FORMATS:
+            raise ValueError(f"Unknown or non-streaming row_format: {row_format!r}")
+        return self._iter_query(query, params, chunk_size, row_format)
+
+    def _iter_query(self, query, params, chunk_size, row_format):
+        tx_conn = self.pool.transaction_connection()
+        try:
+            conn = tx_conn or self.pool.acquire()
+        except sqlite3.Error as e:
+            logger.error(f"Error connecting to database: {e}")
+            return
+
+        count = 0
+        elapsed = 0.0  # time spent inside SQLite, excluding the consumer's work
+        try:
+            started = time.perf_counter()
+            cursor = conn.cursor()
+            if row_format == 'record':
+                cursor.row_factory = None
+            cursor.execute(query, params)
+            while True:
+                rows = cursor.fetchmany(chunk_size)
+                elapsed += time.perf_counter() - started
+                if not rows:
+                    break
+                count += len(rows)
+                if row_format == 'record':
+                    yield from format_rows(cursor, rows, 'record')
+                else:
+                    for row in rows:
+                        yield dict(row)
+                started = time.perf_counter()
+        except sqlite3.Error as e:
+            logger.error(f"Database error streaming query: {query}, Error: {e}")
+            if tx_conn is not None:
+                raise
+        finally:
+            self._record(conn, query, params, elapsed, count)
+            if tx_conn is None:
+                self.pool.release(conn)
+
+    def query_frame(self, query, params=(), dtypes=None):
+        """
+        Build a pandas DataFrame straight from the cursor's column arrays,
+        skipping the list-of-dicts detour.
+        dtypes: {column: dtype}. 'datetime' parses ISO text once with
+        pd.to_datetime; 'category' suits repetitive text like status or
+        department; anything else goes to Series.astype.
+        Returns None on a database error, like execute_query.
+        """
+        import pandas as pd
+
+        columns = self.execute_query(query, params, fetch_all=True, row_format='columns')
+        if columns is None:
+            return None
+        frame = pd.DataFrame(columns)
+        for name, dtype in (dtypes or {}).items():
+            if name not in frame.columns:
+                continue
+            if dtype == 'datetime':
+                frame[name] = pd.to_datetime(frame[name], format='ISO8601', errors='coerce')
+            else:
+                frame[name] = frame[name].astype(dtype)
+        return frame
+
+    # --- Group-commit writes ---
+    def submit_write(self, query, params=()):
+        """Queue one write statement; the Future resolves to its lastrowid after commit"""
+        return self.pool.writer().submit(lambda conn: self.execute_query(query, params))
+
+    def submit_unit(self, fn, *args, **kwargs):
+        """
+        Queue fn(*args, **kwargs) to run on the writer thread inside the current
+        batch; model calls it makes join that batch. The Future resolves to fn's
+        return value after commit, or to its exception (its writes undone).
+        """
+        return self.pool.writer().submit(lambda conn: fn(*args, **kwargs))
+
+    def write(self, query, params=(), timeout=DB_WRITE_TIMEOUT):
+        """
+        Write through the group-commit writer and wait for the commit.
+        Unlike execute_query, failures raise (WriteQueueFull under overload)
+        instead of returning None. Inside transaction() the statement runs
+        on the transaction's connection instead, since queueing it behind
+        our own write lock would deadlock.
+        """
+        if self.in_transaction():
+            return self.execute_query(query, params)
+        return self.submit_write(query, params).result(timeout)
+
+    def write_unit(self, fn, *args, timeout=DB_WRITE_TIMEOUT, **kwargs):
+        """Run fn atomically through the writer (see submit_unit) and wait for its result"""
+        if self.in_transaction():
+            return fn(*args, **kwargs)
+        return self.submit_unit(fn, *args, **kwargs).result(timeout)
+
+    # --- Bulk writes ---
+    _IDENTIFIER = re.compile(r'^[A-Za-z_][A-Za-z0-9_]*$')
+
+    def _check_identifiers(self, *names):
+        for name in names:
+            if not self._IDENTIFIER.match(name):
+                raise ValueError(f"Invalid SQL identifier: {name!r}")
+
+    def _chunks(self, columns, rows, chunk_size):
+        """Yield lists of parameter tuples; dict rows are ordered by `columns`"""
+        chunk = []
+        for row in rows:
+            if isinstance(row, dict):
+                row = tuple(row.get(c) for c in columns)
+            chunk.append(row)
+            if len(chunk) >= chunk_size:
+                yield chunk
+                chunk = []
+        if chunk:
+            yield chunk
+
+    def execute_many(self, query, columns, rows, chunk_size=DB_BULK_CHUNK_SIZE):
+        """
+        Run `query` with executemany, committing once per chunk of rows.
+        A failing chunk is rolled back and reported; later chunks still run.
+        Inside transaction() nothing is committed here and the first error raises.
+        Returns a list of {'chunk', 'rows', 'affected', 'error'} dicts.
+        """
+        results = []
+        tx_conn = self.pool.transaction_connection()
+        try:
+            conn = tx_conn or self.pool.acquire()
+        except sqlite3.Error as e:
+            logger.error(f"Error connecting to database: {e}")
+            return [{'chunk': 0, 'rows': 0, 'affected': 0, 'error': str(e)}]
+
+        try:
+            for index, chunk in enumerate(self._chunks(columns, rows, chunk_size)):
+                try:
+                    started = time.perf_counter()
+                    cursor = conn.executemany(query, chunk)
+                    if tx_conn is None:
+                        conn.commit()
+                    self._record(conn, query, chunk[0], time.perf_counter() - started, cursor.rowcount)
+                    results.append({'chunk': index, 'rows': len(chunk), 'affected': cursor.rowcount, 'error': None})
+                except sqlite3.Error as e:
+                    logger.error(f"Bulk write chunk {index} failed: {query}, Error: {e}")
+                    if tx_conn is not None:
+                        raise
+                    conn.rollback()
+                    results.append({'chunk': index, 'rows': len(chunk), 'affected': 0, 'error': str(e)})
+        finally:
+            if tx_conn is None:
+                self.pool.release(conn)
+        return results
+
+    def bulk_insert(self, table, columns, rows, chunk_size=DB_BULK_CHUNK_SIZE, or_ignore=False):
+        """
+        Insert an iterable of rows (tuples in `columns` order, or dicts) in
+        chunked transactions. See execute_many for the return value.
+        """
+        self._check_identifiers(table, *columns)
+        verb = "INSERT OR IGNORE" if or_ignore else "INSERT"
+        query = f"{verb} INTO {table} ({', '.join(columns)}) VALUES ({', '.join('?' for _ in columns)})"
+        return self.execute_many(query, columns, rows, chunk_size)
+
+    def bulk_upsert(self, table, columns, rows, conflict_columns, update_columns=None,
+                    chunk_size=DB_BULK_CHUNK_SIZE, touch_updated_at=False):
+        """
+        Insert rows, updating `update_columns` (default: every non-key column)
+        when `conflict_columns` already exist. See execute_many for the return value.
+        """
+        if update_columns is None:
+            update_columns = [c for c in columns if c not in conflict_columns]
+        self._check_identifiers(table, *columns, *conflict_columns, *update_columns)
+
+        assignments = [f"{c} = excluded.{c}" for c in update_columns]
+        if touch_updated_at:
+            assignments.append("updated_at = CURRENT_TIMESTAMP")
+        action = f"DO UPDATE SET {', '.join(assignments)}" if assignments else "DO NOTHING"
+        query = (
+            f"INSERT INTO {table} ({', '.join(columns)}) VALUES ({', '.join('?' for _ in columns)}) "
+            f"ON CONFLICT ({', '.join(conflict_columns)}) {action}"
+        )
+        return self.execute_many(query, columns, rows, chunk_size)
 
     def execute_script(self, script_path):
         """Execute a SQL script from a file"""
         conn = self.get_connection()
         if not conn:
             return False
-            
+
         try:
             with open(script_path, 'r') as f:
                 script = f.read()
-            
+
             cursor = conn.cursor()
             cursor.executescript(script)
             conn.commit()
@@ -0,0 +1,144 @@
+"""
+Versioned schema migrations.
+
+schema.sql only creates missing tables; it can never alter an existing
+database. Changes to existing databases go in database/migrations/ as
+numbered files (0001_description.sql, 0002_...). Each pending file runs in
+its own transaction and is recorded in the schema_version table, so every
+migration is applied exactly once and a failed one leaves nothing behind.
+
+Migrations that need Python (e.g. backfilling a computed column) are .py
+files defining upgrade(conn); they run inside the same kind of transaction
+and must not commit themselves.
+
+CLI:
+    python -m database.migrate            # apply pending migrations
+    python -m database.migrate --status   # list applied / pending
+"""
+import argparse
+import importlib.util
+import logging
+import os
+import re
+import sqlite3
+from database.db_manager import DBManager
+
+logger = logging.getLogger(__name__)
+
+MIGRATIONS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'migrations')
+_MIGRATION_FILE = re.compile(r'^(\d+)_(\w+)\.(sql|py)$')
+
+SCHEMA_VERSION_TABLE = """
+CREATE TABLE IF NOT EXISTS schema_version (
+    version INTEGER PRIMARY KEY,
+    name TEXT NOT NULL,
+    applied_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+)
+"""
+
+
+def discover(migrations_dir=MIGRATIONS_DIR):
+    """All migration files as (version, name, path), ordered by version"""
+    migrations = []
+    for filename in os.listdir(migrations_dir):
+        match = _MIGRATION_FILE.match(filename)
+        if match:
+            migrations.append((int(match.group(1)), match.group(2), os.path.join(migrations_dir, filename)))
+    migrations.sort()
+    versions = [v for v, _, _ in migrations]
+    if len(versions) != len(set(versions)):
+        raise ValueError(f"Duplicate migration version in {migrations_dir}")
+    return migrations
+
+
+def applied_versions(db):
+    db.execute_query(SCHEMA_VERSION_TABLE)
+    rows = db.execute_query("SELECT version FROM schema_version", fetch_all=True) or []
+    return {r['version'] for r in rows}
+
+
+def pending(db, migrations_dir=MIGRATIONS_DIR):
+    done = applied_versions(db)
+    return [m for m in discover(migrations_dir) if m[0] not in done]
+
+
+def apply_migration(db, version, name, path):
+    """Run one migration file and record it, all in a single transaction"""
+    if path.endswith('.py'):
+        return _apply_python_migration(db, version, name, path)
+
+    with open(path, 'r') as f:
+        script = f.read()
+
+    # executescript() commits any open transaction before it starts, so the
+    # BEGIN/COMMIT pair is part of the script itself.
+    conn = db.get_connection()
+    try:
+        conn.executescript(
+            f"BEGIN;\n{script}\n;"
+            f"INSERT INTO schema_version (version, name) VALUES ({int(version)}, '{name}');\n"
+            "COMMIT;"
+        )
+    except sqlite3.Error:
+        if conn.in_transaction:
+            conn.rollback()
+        raise
+    finally:
+        conn.close()
+
+
+def _apply_python_migration(db, version, name, path):
+    spec = importlib.util.spec_from_file_location(f"migration_{version:04d}_{name}", path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+
+    conn = db.get_connection()
+    try:
+        conn.execute("BEGIN")
+        module.upgrade(conn)
+        conn.execute("INSERT INTO schema_version (version, name) VALUES (?, ?)", (int(version), name))
+        conn.commit()
+    except Exception:
+        if conn.in_transaction:
+            conn.rollback()
+        raise
+    finally:
+        conn.close()
+
+
+def run_migrations(db=None, migrations_dir=MIGRATIONS_DIR):
+    """
+    Apply every pending migration in version order.
+    Returns the list of applied versions; stops at the first failure.
+    """
+    db = db or DBManager()
+    applied = []
+    for version, name, path in pending(db, migrations_dir):
+        try:
+            apply_migration(db, version, name, path)
+        except Exception as e:
+            logger.error(f"Migration {version:04d}_{name} failed: {e}")
+            break
+        logger.info(f"Applied migration {version:04d}_{name}")
+        applied.append(version)
+    return applied
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Apply versioned schema migrations")
+    parser.add_argument('--status', action='store_true', help="list migrations without applying")
+    args = parser.parse_args()
+
+    db = DBManager()
+    if args.status:
+        done = applied_versions(db)
+        for version, name, _ in discover():
+            print(f"{'applied' if version in done else 'pending':<8} {version:04d}_{name}")
+        return
+
+    applied = run_migrations(db)
+    print(f"Applied {len(applied)} migration(s)." if applied else "Schema is up to date.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,28 @@
+-- Secondary indexes for the filters our models and pages run constantly.
+-- schema.sql only has UNIQUE constraints, so all of these were full scans.
+
+-- Date-range history, dashboard trend, reports, payroll
+CREATE INDEX IF NOT EXISTS idx_attendance_date ON attendance(date);
+
+-- Pending approvals (is_approved = 0 ORDER BY date): partial index stays tiny
+CREATE INDEX IF NOT EXISTS idx_attendance_pending ON attendance(date) WHERE is_approved = 0;
+
+-- Employee.get_all(active_only=True)
+CREATE INDEX IF NOT EXISTS idx_employees_status ON employees(status);
+
+-- Kiosk PIN lookup
+CREATE INDEX IF NOT EXISTS idx_employees_pin_code ON employees(pin_code);
+
+-- LeaveRequest.get_requests status filter (ordered by created_at)
+CREATE INDEX IF NOT EXISTS idx_leave_requests_status ON leave_requests(status, created_at);
+
+-- LeaveRequest.get_balance per employee / type / status
+CREATE INDEX IF NOT EXISTS idx_leave_requests_employee ON leave_requests(employee_id, leave_type_id, status);
+
+-- Expense.get_pending / get_approved_for_month
+CREATE INDEX IF NOT EXISTS idx_expenses_status_date ON expenses(status, date);
+
+-- AuditLog.get_logs (ORDER BY timestamp DESC LIMIT ?)
+CREATE INDEX IF NOT EXISTS idx_audit_logs_timestamp ON audit_logs(timestamp);
+
+ANALYZE;
@@ -0,0 +1,33 @@
+"""
+Replace plaintext kiosk PINs with keyed digests (see utils/pins.py).
+
+Adds employees.pin_digest behind a UNIQUE index, backfills it from
+pin_code and clears the plaintext. When two employees shared a PIN, only
+the first keeps it; the others are logged and need a new PIN.
+"""
+import logging
+from utils.pins import pin_digest
+
+logger = logging.getLogger(__name__)
+
+
+def upgrade(conn):
+    conn.execute("ALTER TABLE employees ADD COLUMN pin_digest TEXT")
+    conn.execute("CREATE UNIQUE INDEX idx_employees_pin_digest ON employees(pin_digest)")
+    # Incremental refresh of the kiosk PIN index reads recently changed employees
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_employees_updated_at ON employees(updated_at)")
+
+    seen = set()
+    rows = conn.execute(
+        "SELECT id, pin_code FROM employees WHERE pin_code IS NOT NULL AND pin_code != '' ORDER BY id"
+    ).fetchall()
+    for employee_id, pin in rows:
+        digest = pin_digest(pin)
+        if digest in seen:
+            logger.warning(f"Employee {employee_id} shares a kiosk PIN with another employee; PIN cleared, assign a new one")
+            continue
+        seen.add(digest)
+        conn.execute("UPDATE employees SET pin_digest = ? WHERE id = ?", (digest, employee_id))
+
+    conn.execute("UPDATE employees SET pin_code = NULL")
+    conn.execute("DROP INDEX IF EXISTS idx_employees_pin_code")
@@ -0,0 +1,109 @@
+-- Per-day rollup of attendance by department and status, so dashboards and
+-- reports read a few dozen rows instead of every attendance record.
+-- Triggers keep it in step inside the writing transaction (clock-in,
+-- clock-out, manual entry, bulk upserts alike). department_id 0 means the
+-- employee has no department; counts follow the employee's current
+-- department, like the reports' joins do.
+-- Repair with: python -m models.attendance_summary --rebuild
+
+CREATE TABLE IF NOT EXISTS daily_attendance_summary (
+    date DATE NOT NULL,
+    department_id INTEGER NOT NULL DEFAULT 0,
+    status TEXT NOT NULL,
+    records INTEGER NOT NULL DEFAULT 0,
+    total_hours REAL NOT NULL DEFAULT 0,
+    overtime_hours REAL NOT NULL DEFAULT 0,
+    PRIMARY KEY (date, department_id, status)
+) WITHOUT ROWID;
+
+CREATE TRIGGER IF NOT EXISTS trg_attendance_summary_insert AFTER INSERT ON attendance
+BEGIN
+    INSERT INTO daily_attendance_summary (date, department_id, status, records, total_hours, overtime_hours)
+    VALUES (
+        NEW.date,
+        COALESCE((SELECT department_id FROM employees WHERE id = NEW.employee_id), 0),
+        COALESCE(NEW.status, 'Unknown'),
+        1, COALESCE(NEW.total_hours, 0), COALESCE(NEW.overtime_hours, 0)
+    )
+    ON CONFLICT (date, department_id, status) DO UPDATE SET
+        records = records + 1,
+        total_hours = total_hours + excluded.total_hours,
+        overtime_hours = overtime_hours + excluded.overtime_hours;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_attendance_summary_delete AFTER DELETE ON attendance
+BEGIN
+    UPDATE daily_attendance_summary SET
+        records = records - 1,
+        total_hours = total_hours - COALESCE(OLD.total_hours, 0),
+        overtime_hours = overtime_hours - COALESCE(OLD.overtime_hours, 0)
+    WHERE date = OLD.date
+      AND department_id = COALESCE((SELECT department_id FROM employees WHERE id = OLD.employee_id), 0)
+      AND status = COALESCE(OLD.status, 'Unknown');
+    DELETE FROM daily_attendance_summary WHERE date = OLD.date AND records <= 0;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_attendance_summary_update
+AFTER UPDATE OF employee_id, date, status, total_hours, overtime_hours ON attendance
+BEGIN
+    UPDATE daily_attendance_summary SET
+        records = records - 1,
+        total_hours = total_hours - COALESCE(OLD.total_hours, 0),
+        overtime_hours = overtime_hours - COALESCE(OLD.overtime_hours, 0)
+    WHERE date = OLD.date
+      AND department_id = COALESCE((SELECT department_id FROM employees WHERE id = OLD.employee_id), 0)
+      AND status = COALESCE(OLD.status, 'Unknown');
+    DELETE FROM daily_attendance_summary WHERE date = OLD.date AND records <= 0;
+
+    INSERT INTO daily_attendance_summary (date, department_id, status, records, total_hours, overtime_hours)
+    VALUES (
+        NEW.date,
+        COALESCE((SELECT department_id FROM employees WHERE id = NEW.employee_id), 0),
+        COALESCE(NEW.status, 'Unknown'),
+        1, COALESCE(NEW.total_hours, 0), COALESCE(NEW.overtime_hours, 0)
+    )
+    ON CONFLICT (date, department_id, status) DO UPDATE SET
+        records = records + 1,
+        total_hours = total_hours + excluded.total_hours,
+        overtime_hours = overtime_hours + excluded.overtime_hours;
+END;
+
+-- Moving an employee between departments moves their history with them
+CREATE TRIGGER IF NOT EXISTS trg_employee_department_summary
+AFTER UPDATE OF department_id ON employees
+WHEN COALESCE(OLD.department_id, 0) != COALESCE(NEW.department_id, 0)
+BEGIN
+    UPDATE daily_attendance_summary SET
+        records = records - moved.n,
+        total_hours = total_hours - moved.hours,
+        overtime_hours = overtime_hours - moved.ot
+    FROM (
+        SELECT date AS day, COALESCE(status, 'Unknown') AS day_status, COUNT(*) AS n,
+               COALESCE(SUM(total_hours), 0) AS hours, COALESCE(SUM(overtime_hours), 0) AS ot
+        FROM attendance WHERE employee_id = NEW.id
+        GROUP BY date, COALESCE(status, 'Unknown')
+    ) AS moved
+    WHERE daily_attendance_summary.date = moved.day
+      AND daily_attendance_summary.status = moved.day_status
+      AND daily_attendance_summary.department_id = COALESCE(OLD.department_id, 0);
+    DELETE FROM daily_attendance_summary WHERE department_id = COALESCE(OLD.department_id, 0) AND records <= 0;
+
+    INSERT INTO daily_attendance_summary (date, department_id, status, records, total_hours, overtime_hours)
+    SELECT date, COALESCE(NEW.department_id, 0), COALESCE(status, 'Unknown'), COUNT(*),
+           COALESCE(SUM(total_hours), 0), COALESCE(SUM(overtime_hours), 0)
+    FROM attendance WHERE employee_id = NEW.id
+    GROUP BY date, COALESCE(status, 'Unknown')
+    ON CONFLICT (date, department_id, status) DO UPDATE SET
+        records = records + excluded.records,
+        total_hours = total_hours + excluded.total_hours,
+        overtime_hours = overtime_hours + excluded.overtime_hours;
+END;
+
+-- Backfill from existing attendance
+DELETE FROM daily_attendance_summary;
+INSERT INTO daily_attendance_summary (date, department_id, status, records, total_hours, overtime_hours)
+SELECT a.date, COALESCE(e.department_id, 0), COALESCE(a.status, 'Unknown'), COUNT(*),
+       COALESCE(SUM(a.total_hours), 0), COALESCE(SUM(a.overtime_hours), 0)
+FROM attendance a
+LEFT JOIN employees e ON e.id = a.employee_id
+GROUP BY a.date, COALESCE(e.department_id, 0), COALESCE(a.status, 'Unknown');
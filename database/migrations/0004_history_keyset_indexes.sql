@@ -0,0 +1,13 @@
+-- Keyset pagination of attendance history (Attendance.get_history_page).
+-- History is ordered by (date, COALESCE(clock_in, ''), id) DESC; these
+-- indexes match that expression exactly, so each page is an index range
+-- scan that stops after LIMIT rows instead of a sort of the filtered set.
+
+-- Org-wide / date-range history; supersedes idx_attendance_date
+CREATE INDEX IF NOT EXISTS idx_attendance_history ON attendance(date, COALESCE(clock_in, ''), id);
+DROP INDEX IF EXISTS idx_attendance_date;
+
+-- One employee's history (My History, Recent Activity)
+CREATE INDEX IF NOT EXISTS idx_attendance_employee_history ON attendance(employee_id, date, COALESCE(clock_in, ''), id);
+
+ANALYZE;
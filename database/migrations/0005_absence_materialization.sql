@@ -0,0 +1,18 @@
+-- End-of-day absence materialization (services/absence_service.py).
+-- The job's per-day INSERT ... SELECT needs to know which days are
+-- holidays, which days each shift works, and who is on approved leave.
+
+-- Used by models/holidays.py and the Public Holidays settings tab
+CREATE TABLE IF NOT EXISTS public_holidays (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    date DATE UNIQUE NOT NULL,
+    name TEXT NOT NULL,
+    year INTEGER
+);
+
+-- Working days as strftime('%w') digits (0 = Sunday); default Monday-Friday
+ALTER TABLE shifts ADD COLUMN work_days TEXT NOT NULL DEFAULT '12345';
+
+-- "Is this employee on approved leave on day D": one probe per employee
+CREATE INDEX IF NOT EXISTS idx_leave_requests_approved
+    ON leave_requests(employee_id, start_date, end_date) WHERE status = 'Approved';
@@ -0,0 +1,165 @@
+-- Precomputed shift roster (services/roster_service.py).
+-- shift_schedule holds one slot per employee per scheduled day up to the
+-- roster horizon, expanded from the employee's shift (on its work_days) or
+-- rotation, minus public holidays and approved leave.
+--
+-- Triggers keep it honest between regenerations: any change that affects
+-- an employee's slots deletes that employee's slots from today on and
+-- queues the employee in shift_schedule_dirty. Readers therefore see
+-- either a current slot or no slot (and fall back to the shift), never a
+-- stale one; the engine refills only the queued employees.
+
+-- Rotation patterns: day_index = days since anchor_date modulo cycle_days;
+-- a day without a slot row is a day off
+CREATE TABLE IF NOT EXISTS shift_rotations (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    name TEXT UNIQUE NOT NULL,
+    cycle_days INTEGER NOT NULL CHECK (cycle_days > 0),
+    anchor_date DATE NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS shift_rotation_slots (
+    rotation_id INTEGER NOT NULL,
+    day_index INTEGER NOT NULL,
+    shift_id INTEGER NOT NULL,
+    PRIMARY KEY (rotation_id, day_index),
+    FOREIGN KEY (rotation_id) REFERENCES shift_rotations(id),
+    FOREIGN KEY (shift_id) REFERENCES shifts(id)
+) WITHOUT ROWID;
+
+-- A rotation, when set, takes precedence over shift_id
+ALTER TABLE employees ADD COLUMN rotation_id INTEGER REFERENCES shift_rotations(id);
+
+CREATE TABLE IF NOT EXISTS shift_schedule (
+    employee_id INTEGER NOT NULL,
+    date DATE NOT NULL,
+    shift_id INTEGER NOT NULL,
+    start_at DATETIME NOT NULL,
+    end_at DATETIME NOT NULL,
+    grace_period_minutes INTEGER NOT NULL DEFAULT 15,
+    PRIMARY KEY (employee_id, date)
+) WITHOUT ROWID;
+
+-- Who is on which shift on a day (Shift Schedule tab)
+CREATE INDEX IF NOT EXISTS idx_shift_schedule_date ON shift_schedule(date, shift_id);
+
+CREATE TABLE IF NOT EXISTS shift_schedule_dirty (
+    employee_id INTEGER PRIMARY KEY
+);
+
+-- Employees: assignment, status or hire date changed
+CREATE TRIGGER IF NOT EXISTS trg_schedule_employee_insert AFTER INSERT ON employees
+BEGIN
+    INSERT OR IGNORE INTO shift_schedule_dirty (employee_id) VALUES (NEW.id);
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_schedule_employee_update
+AFTER UPDATE OF shift_id, rotation_id, status, hire_date ON employees
+WHEN NEW.shift_id IS NOT OLD.shift_id OR NEW.rotation_id IS NOT OLD.rotation_id
+  OR NEW.status IS NOT OLD.status OR NEW.hire_date IS NOT OLD.hire_date
+BEGIN
+    DELETE FROM shift_schedule WHERE employee_id = NEW.id AND date >= date('now', 'localtime');
+    INSERT OR IGNORE INTO shift_schedule_dirty (employee_id) VALUES (NEW.id);
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_schedule_employee_delete AFTER DELETE ON employees
+BEGIN
+    DELETE FROM shift_schedule WHERE employee_id = OLD.id AND date >= date('now', 'localtime');
+    DELETE FROM shift_schedule_dirty WHERE employee_id = OLD.id;
+END;
+
+-- Shifts: times or work days changed, or the shift was removed
+CREATE TRIGGER IF NOT EXISTS trg_schedule_shift_update
+AFTER UPDATE OF start_time, end_time, grace_period_minutes, work_days ON shifts
+BEGIN
+    INSERT OR IGNORE INTO shift_schedule_dirty (employee_id)
+    SELECT employee_id FROM shift_schedule WHERE shift_id = NEW.id AND date >= date('now', 'localtime');
+    INSERT OR IGNORE INTO shift_schedule_dirty (employee_id)
+    SELECT id FROM employees WHERE shift_id = NEW.id AND rotation_id IS NULL;
+    DELETE FROM shift_schedule WHERE date >= date('now', 'localtime')
+      AND employee_id IN (SELECT employee_id FROM shift_schedule_dirty);
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_schedule_shift_delete AFTER DELETE ON shifts
+BEGIN
+    INSERT OR IGNORE INTO shift_schedule_dirty (employee_id)
+    SELECT employee_id FROM shift_schedule WHERE shift_id = OLD.id AND date >= date('now', 'localtime');
+    DELETE FROM shift_schedule WHERE date >= date('now', 'localtime')
+      AND employee_id IN (SELECT employee_id FROM shift_schedule_dirty);
+END;
+
+-- Rotations: pattern, cycle or anchor changed
+CREATE TRIGGER IF NOT EXISTS trg_schedule_rotation_update AFTER UPDATE ON shift_rotations
+BEGIN
+    INSERT OR IGNORE INTO shift_schedule_dirty (employee_id)
+    SELECT id FROM employees WHERE rotation_id = NEW.id;
+    DELETE FROM shift_schedule WHERE date >= date('now', 'localtime')
+      AND employee_id IN (SELECT id FROM employees WHERE rotation_id = NEW.id);
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_schedule_rotation_slot_insert AFTER INSERT ON shift_rotation_slots
+BEGIN
+    INSERT OR IGNORE INTO shift_schedule_dirty (employee_id)
+    SELECT id FROM employees WHERE rotation_id = NEW.rotation_id;
+    DELETE FROM shift_schedule WHERE date >= date('now', 'localtime')
+      AND employee_id IN (SELECT id FROM employees WHERE rotation_id = NEW.rotation_id);
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_schedule_rotation_slot_update AFTER UPDATE ON shift_rotation_slots
+BEGIN
+    INSERT OR IGNORE INTO shift_schedule_dirty (employee_id)
+    SELECT id FROM employees WHERE rotation_id IN (OLD.rotation_id, NEW.rotation_id);
+    DELETE FROM shift_schedule WHERE date >= date('now', 'localtime')
+      AND employee_id IN (SELECT id FROM employees WHERE rotation_id IN (OLD.rotation_id, NEW.rotation_id));
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_schedule_rotation_slot_delete AFTER DELETE ON shift_rotation_slots
+BEGIN
+    INSERT OR IGNORE INTO shift_schedule_dirty (employee_id)
+    SELECT id FROM employees WHERE rotation_id = OLD.rotation_id;
+    DELETE FROM shift_schedule WHERE date >= date('now', 'localtime')
+      AND employee_id IN (SELECT id FROM employees WHERE rotation_id = OLD.rotation_id);
+END;
+
+-- Holidays: a new one removes that day's slots; removing one refills the day
+CREATE TRIGGER IF NOT EXISTS trg_schedule_holiday_insert AFTER INSERT ON public_holidays
+BEGIN
+    DELETE FROM shift_schedule WHERE date = NEW.date;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_schedule_holiday_delete AFTER DELETE ON public_holidays
+WHEN OLD.date >= date('now', 'localtime')
+BEGIN
+    INSERT OR IGNORE INTO shift_schedule_dirty (employee_id)
+    SELECT id FROM employees WHERE status = 'Active';
+    DELETE FROM shift_schedule WHERE date >= date('now', 'localtime')
+      AND employee_id IN (SELECT employee_id FROM shift_schedule_dirty);
+END;
+
+-- Leave: approving removes the covered slots; any other change to approved
+-- leave (rejection, new dates, deletion) queues the employee for a refill
+CREATE TRIGGER IF NOT EXISTS trg_schedule_leave_insert AFTER INSERT ON leave_requests
+WHEN NEW.status = 'Approved'
+BEGIN
+    DELETE FROM shift_schedule WHERE employee_id = NEW.employee_id
+      AND date >= NEW.start_date AND date <= NEW.end_date;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_schedule_leave_update
+AFTER UPDATE OF status, start_date, end_date, employee_id ON leave_requests
+WHEN NEW.status = 'Approved' OR OLD.status = 'Approved'
+BEGIN
+    DELETE FROM shift_schedule WHERE employee_id = NEW.employee_id
+      AND date >= NEW.start_date AND date <= NEW.end_date AND NEW.status = 'Approved';
+    INSERT OR IGNORE INTO shift_schedule_dirty (employee_id)
+    SELECT OLD.employee_id WHERE OLD.status = 'Approved';
+    DELETE FROM shift_schedule WHERE OLD.status = 'Approved'
+      AND employee_id = OLD.employee_id AND date >= date('now', 'localtime');
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_schedule_leave_delete AFTER DELETE ON leave_requests
+WHEN OLD.status = 'Approved'
+BEGIN
+    INSERT OR IGNORE INTO shift_schedule_dirty (employee_id) VALUES (OLD.employee_id);
+    DELETE FROM shift_schedule WHERE employee_id = OLD.employee_id AND date >= date('now', 'localtime');
+END;
@@ -0,0 +1,22 @@
+-- Work sites for geofenced clock-ins (services/geofence_service.py).
+-- A site is a circle (latitude, longitude, radius_m) or, when polygon is
+-- set, a JSON array of [lat, lon] vertices. Each punch with coordinates is
+-- classified at clock-in; geofence_site_id is the matching site.
+
+CREATE TABLE IF NOT EXISTS sites (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    name TEXT UNIQUE NOT NULL,
+    latitude REAL NOT NULL,
+    longitude REAL NOT NULL,
+    radius_m REAL NOT NULL DEFAULT 200,
+    polygon TEXT,
+    is_active BOOLEAN DEFAULT 1,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+-- 'On-site', 'Off-site', or NULL when the punch had no coordinates
+ALTER TABLE attendance ADD COLUMN geofence_status TEXT;
+ALTER TABLE attendance ADD COLUMN geofence_site_id INTEGER REFERENCES sites(id);
+
+-- Off-site punch review lists only the flagged rows
+CREATE INDEX IF NOT EXISTS idx_attendance_offsite ON attendance(date) WHERE geofence_status = 'Off-site';
@@ -0,0 +1,38 @@
+-- Attendance anomaly findings (services/anomaly_service.py).
+-- The detector streams attendance in (updated_at, id) order from a
+-- high-water mark ('anomalies_through' in system_settings) and keeps a
+-- little state per employee, so each run only reads what changed.
+
+CREATE TABLE IF NOT EXISTS attendance_anomalies (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    attendance_id INTEGER NOT NULL REFERENCES attendance(id) ON DELETE CASCADE,
+    employee_id INTEGER NOT NULL REFERENCES employees(id),
+    date DATE NOT NULL,
+    kind TEXT NOT NULL,
+    detail TEXT,
+    detected_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    resolved_at TIMESTAMP,
+    resolved_by INTEGER REFERENCES users(id),
+    UNIQUE (attendance_id, kind)
+);
+
+-- The review page lists open findings, newest first
+CREATE INDEX IF NOT EXISTS idx_attendance_anomalies_open ON attendance_anomalies(date) WHERE resolved_at IS NULL;
+
+-- Punches still waiting for a clock-out; flagged once the deadline passes
+CREATE TABLE IF NOT EXISTS attendance_anomaly_pending (
+    attendance_id INTEGER PRIMARY KEY REFERENCES attendance(id) ON DELETE CASCADE,
+    employee_id INTEGER NOT NULL,
+    date DATE NOT NULL,
+    deadline TIMESTAMP NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_attendance_anomaly_pending_deadline ON attendance_anomaly_pending(deadline);
+
+-- Per-employee detector state: a JSON list of recent late arrivals [[date, attendance_id], ...]
+CREATE TABLE IF NOT EXISTS attendance_anomaly_state (
+    employee_id INTEGER PRIMARY KEY,
+    late TEXT NOT NULL DEFAULT '[]'
+) WITHOUT ROWID;
+
+-- Incremental scans seek past the high-water mark
+CREATE INDEX IF NOT EXISTS idx_attendance_updated ON attendance(updated_at, id);
@@ -0,0 +1,199 @@
+"""
+Per-statement query instrumentation for DBManager.
+
+Every statement is keyed by its whitespace-normalized SQL, so each shape of
+dynamic SQL (e.g. get_history with and without an employee filter) is tracked
+separately. Statements slower than SLOW_QUERY_THRESHOLD_MS are written to the
+slow-query log together with their EXPLAIN QUERY PLAN.
+
+CLI (summarizes the slow-query log file):
+    python -m database.query_stats [--top 20]
+"""
+import argparse
+import json
+import logging
+import os
+import re
+import sqlite3
+import sys
+import threading
+from collections import deque
+from datetime import datetime
+from config import ROOT_DIR, QUERY_STATS_ENABLED, SLOW_QUERY_THRESHOLD_MS, SLOW_QUERY_LOG_PATH
+
+logger = logging.getLogger(__name__)
+
+_WHITESPACE = re.compile(r'\s+')
+_INTERNAL_FILES = {'db_manager.py', 'query_stats.py', 'contextlib.py'}
+
+
+def normalize(query):
+    """Collapse whitespace so the same statement always maps to the same key"""
+    return _WHITESPACE.sub(' ', query).strip()
+
+
+def call_site():
+    """First caller frame outside the database layer, as 'path:line function'"""
+    frame = sys._getframe(1)
+    while frame is not None and os.path.basename(frame.f_code.co_filename) in _INTERNAL_FILES:
+        frame = frame.f_back
+    if frame is None:
+        return "?"
+    path = frame.f_code.co_filename
+    if path.startswith(str(ROOT_DIR)):
+        path = os.path.relpath(path, ROOT_DIR)
+    return f"{path}:{frame.f_lineno} {frame.f_code.co_name}"
+
+
+def is_full_scan(plan):
+    """
+    True if any step of an EXPLAIN QUERY PLAN walks a whole table. SCAN ... USING
+    INDEX is still a full pass (in index order); only SEARCH steps are selective.
+    """
+    return any(step.startswith('SCAN ') and 'CONSTANT ROW' not in step for step in plan)
+
+
+class QueryStats:
+    """Thread-safe latency/row-count aggregates and slow-query log"""
+
+    def __init__(self, threshold_ms=SLOW_QUERY_THRESHOLD_MS, log_path=SLOW_QUERY_LOG_PATH,
+                 enabled=QUERY_STATS_ENABLED, max_slow=200, max_call_sites=5):
+        self.threshold_ms = threshold_ms
+        self.log_path = log_path
+        self.enabled = enabled
+        self.max_call_sites = max_call_sites
+        self._lock = threading.Lock()
+        self._stats = {}
+        self._plans = {}  # EXPLAIN output is cached per statement
+        self.slow = deque(maxlen=max_slow)
+
+    def record(self, conn, query, params, elapsed_ms, rows):
+        """Record one execution; explain and log it if it crossed the threshold"""
+        if not self.enabled:
+            return
+        key = normalize(query)
+        site = call_site()
+        with self._lock:
+            entry = self._stats.get(key)
+            if entry is None:
+                entry = self._stats[key] = {
+                    'statement': key, 'calls': 0, 'total_ms': 0.0, 'max_ms': 0.0,
+                    'rows': 0, 'slow_calls': 0, 'call_sites': {},
+                }
+            entry['calls'] += 1
+            entry['total_ms'] += elapsed_ms
+            entry['max_ms'] = max(entry['max_ms'], elapsed_ms)
+            entry['rows'] += max(rows or 0, 0)
+            sites = entry['call_sites']
+            if site in sites or len(sites) < self.max_call_sites:
+                sites[site] = sites.get(site, 0) + 1
+            slow = elapsed_ms >= self.threshold_ms
+            if slow:
+                entry['slow_calls'] += 1
+
+        if slow:
+            self._log_slow(conn, key, query, params, elapsed_ms, rows, site)
+
+    def explain(self, conn, query, params=()):
+        """EXPLAIN QUERY PLAN details for a statement (cached per statement)"""
+        key = normalize(query)
+        plan = self._plans.get(key)
+        if plan is None:
+            try:
+                plan = [row[3] for row in conn.execute(f"EXPLAIN QUERY PLAN {query}", params).fetchall()]
+            except sqlite3.Error as e:
+                plan = [f"(EXPLAIN failed: {e})"]
+            self._plans[key] = plan
+        return plan
+
+    def _log_slow(self, conn, key, query, params, elapsed_ms, rows, site):
+        plan = self.explain(conn, query, params)
+        record = {
+            'timestamp': datetime.now().isoformat(timespec='seconds'),
+            'elapsed_ms': round(elapsed_ms, 2),
+            'rows': rows,
+            'call_site': site,
+            'statement': key,
+            'full_scan': is_full_scan(plan),
+            'plan': plan,
+        }
+        self.slow.append(record)
+        logger.warning(f"Slow query ({elapsed_ms:.1f} ms, {site}): {key} | plan: {'; '.join(plan)}")
+        if self.log_path:
+            try:
+                os.makedirs(os.path.dirname(self.log_path), exist_ok=True)
+                with open(self.log_path, 'a', encoding='utf-8') as f:
+                    f.write(json.dumps(record) + "\n")
+            except OSError as e:
+                logger.error(f"Could not write slow query log {self.log_path}: {e}")
+
+    def top(self, limit=20, order_by='total_ms'):
+        """Statements ordered by total time (or 'calls', 'max_ms', 'rows')"""
+        with self._lock:
+            entries = [dict(e, call_sites=dict(e['call_sites'])) for e in self._stats.values()]
+        for e in entries:
+            e['avg_ms'] = e['total_ms'] / e['calls'] if e['calls'] else 0.0
+            plan = self._plans.get(e['statement'])
+            e['full_scan'] = is_full_scan(plan) if plan is not None else None
+        entries.sort(key=lambda e: e[order_by], reverse=True)
+        return entries[:limit]
+
+    def slow_queries(self):
+        """Most recent slow queries, newest first"""
+        return list(reversed(self.slow))
+
+    def reset(self):
+        with self._lock:
+            self._stats.clear()
+            self._plans.clear()
+            self.slow.clear()
+
+
+# Process-wide collector shared by every DBManager
+query_stats = QueryStats()
+
+
+def summarize_log(log_path=SLOW_QUERY_LOG_PATH, limit=20):
+    """Aggregate the slow-query log file by statement, ordered by total time"""
+    summary = {}
+    if not log_path or not os.path.exists(log_path):
+        return []
+    with open(log_path, encoding='utf-8') as f:
+        for line in f:
+            try:
+                rec = json.loads(line)
+            except ValueError:
+                continue
+            entry = summary.setdefault(rec['statement'], {
+                'statement': rec['statement'], 'calls': 0, 'total_ms': 0.0, 'max_ms': 0.0,
+                'full_scan': rec.get('full_scan'), 'plan': rec.get('plan'), 'call_sites': set(),
+            })
+            entry['calls'] += 1
+            entry['total_ms'] += rec['elapsed_ms']
+            entry['max_ms'] = max(entry['max_ms'], rec['elapsed_ms'])
+            entry['call_sites'].add(rec.get('call_site'))
+    return sorted(summary.values(), key=lambda e: e['total_ms'], reverse=True)[:limit]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Top slow statements from the slow-query log")
+    parser.add_argument('--top', type=int, default=20)
+    parser.add_argument('--log', default=SLOW_QUERY_LOG_PATH)
+    args = parser.parse_args()
+
+    entries = summarize_log(args.log, args.top)
+    if not entries:
+        print(f"No slow queries logged in {args.log}")
+        return
+    for e in entries:
+        scan = "FULL SCAN" if e['full_scan'] else "indexed"
+        print(f"{e['total_ms']:>10.1f} ms total  {e['calls']:>5} calls  {e['max_ms']:>8.1f} ms max  [{scan}]")
+        print(f"    {e['statement']}")
+        for step in e['plan'] or []:
+            print(f"      plan: {step}")
+        for site in sorted(s for s in e['call_sites'] if s):
+            print(f"      from: {site}")
+
+
+if __name__ == "__main__":
+    main()
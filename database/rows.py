@@ -0,0 +1,81 @@
+"""
+Compact result-row formats for DBManager.
+
+'dict'     one dict per row (the historical default)
+'record'   tuple subclass per row; column names live once on the class, so a
+           row costs one tuple. Supports row['col'], row.col, row.get() and
+           row.keys(), and pandas builds DataFrames from them like namedtuples.
+'columns'  {column: [values...]}, i.e. column arrays ready for pd.DataFrame
+"""
+import threading
+from collections import namedtuple
+
+ROW_FORMATS = ('dict', 'record', 'columns')
+
+_record_types = {}
+_record_types_lock = threading.Lock()
+
+
+def record_type(columns):
+    """Record class for a column list; cached so each result shape is built once"""
+    columns = tuple(columns)
+    cls = _record_types.get(columns)
+    if cls is not None:
+        return cls
+
+    # namedtuple needs identifiers; rename=True turns e.g. "count(*)" into _0.
+    # Name lookups go through _index, which keeps the original column names
+    # (later duplicates win, matching dict(row)).
+    base = namedtuple('Record', columns, rename=True)
+    index = {name: i for i, name in enumerate(columns)}
+
+    class Record(base):
+        __slots__ = ()
+        _index = index
+        _columns = columns
+
+        def __getitem__(self, key):
+            if isinstance(key, str):
+                return tuple.__getitem__(self, self._index[key])
+            return tuple.__getitem__(self, key)
+
+        def get(self, key, default=None):
+            i = self._index.get(key)
+            return default if i is None else tuple.__getitem__(self, i)
+
+        def keys(self):
+            return self._index.keys()
+
+        def __contains__(self, key):
+            return key in self._index
+
+        def to_dict(self):
+            return {name: tuple.__getitem__(self, i) for name, i in self._index.items()}
+
+    with _record_types_lock:
+        return _record_types.setdefault(columns, Record)
+
+
+def columns_of(cursor):
+    return [d[0] for d in cursor.description] if cursor.description else []
+
+
+def format_rows(cursor, rows, row_format):
+    """Convert plain tuples fetched from `cursor` into the requested format"""
+    if row_format == 'record':
+        make = record_type(columns_of(cursor))._make
+        return [make(r) for r in rows]
+    if row_format == 'columns':
+        names = columns_of(cursor)
+        if not rows:
+            return {name: [] for name in names}
+        return {name: list(values) for name, values in zip(names, zip(*rows))}
+    return [dict(zip(columns_of(cursor), r)) for r in rows]
+
+
+def format_row(cursor, row, row_format):
+    if row is None:
+        return None
+    if row_format == 'record':
+        return record_type(columns_of(cursor))._make(row)
+    return dict(zip(columns_of(cursor), row))
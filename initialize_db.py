@@ -1,4 +1,5 @@
 from database.db_manager import DBManager
+from database.migrate import run_migrations, pending
 import os
 import bcrypt
 
@@ -16,6 +17,14 @@ def init():
         print("Failed to execute schema.")
         return
 
+    # Bring existing databases up to date (indexes, altered tables, ...)
+    applied = run_migrations(db)
+    if applied:
+        print(f"Applied migrations: {', '.join(f'{v:04d}' for v in applied)}")
+    if pending(db):
+        print("Failed to apply all migrations. See log for details.")
+        return
+
     # Check if admin exists
     admin = db.execute_query("SELECT * FROM users WHERE username = ?", ('admin',), fetch_one=True)
     if not admin:
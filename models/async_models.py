@@ -0,0 +1,76 @@
+"""
+Async variants of the model classes, for asyncio.gather on pages and for a
+headless API layer serving many kiosks from one event loop.
+
+Every public model method becomes a coroutine run on the database executor
+(see database/async_db.py); streaming iter_* methods such as iter_history
+become async generators:
+
+    emp, att = AsyncEmployee(), AsyncAttendance()
+    employees, pending = await asyncio.gather(emp.get_all(active_only=True), att.get_pending_approvals())
+"""
+import functools
+import inspect
+from config import DB_FETCH_CHUNK_SIZE
+from database.async_db import AsyncDBManager
+from models.announcement import Announcement
+from models.attendance import Attendance
+from models.attendance_summary import AttendanceSummary
+from models.audit import AuditLog
+from models.employee import Employee
+from models.expense import Expense
+from models.leave import LeaveRequest
+
+
+class AsyncModel:
+    model_class = None
+
+    def __init__(self, adb=None):
+        self.model = self.model_class()
+        self.adb = adb or AsyncDBManager(self.model.db)
+
+    def __getattr__(self, name):
+        attr = getattr(self.model, name)
+        if name.startswith('_') or not callable(attr):
+            return attr
+
+        if name.startswith('iter_') or inspect.isgeneratorfunction(attr):
+            @functools.wraps(attr)
+            def stream(*args, **kwargs):
+                # One executor hop per fetched chunk
+                batch_size = kwargs.get('chunk_size') or DB_FETCH_CHUNK_SIZE
+                return self.adb.iterate(attr, *args, batch_size=batch_size, **kwargs)
+            return stream
+
+        @functools.wraps(attr)
+        async def method(*args, **kwargs):
+            return await self.adb.run(attr, *args, **kwargs)
+        return method
+
+
+class AsyncAttendance(AsyncModel):
+    model_class = Attendance
+
+
+class AsyncAttendanceSummary(AsyncModel):
+    model_class = AttendanceSummary
+
+
+class AsyncEmployee(AsyncModel):
+    model_class = Employee
+
+
+class AsyncLeaveRequest(AsyncModel):
+    model_class = LeaveRequest
+
+
+class AsyncExpense(AsyncModel):
+    model_class = Expense
+
+
+class AsyncAuditLog(AsyncModel):
+    model_class = AuditLog
+
+
+class AsyncAnnouncement(AsyncModel):
+    model_class = Announcement
@@ -1,4 +1,6 @@
 from database.db_manager import DBManager
+from models.calendar_cache import get_calendar_cache
+import itertools
 import logging
 from datetime import datetime
 
@@ -7,15 +9,19 @@ logger = logging.getLogger(__name__)
 class Attendance:
     def __init__(self):
         self.db = DBManager()
+        self.calendar_cache = get_calendar_cache(self.db.db_path)
 
     def create_record(self, data):
-        """Create a new attendance record (e.g. clock in)"""
+        """
+        Create a new attendance record (e.g. clock in).
+        Goes through the group-commit writer; raises on failure.
+        """
         query = """
         INSERT INTO attendance (
             employee_id, date, clock_in, clock_out, status, work_type, latitude, longitude
         ) VALUES (?, ?, ?, ?, ?, ?, ?, ?)
         """
-        return self.db.execute_query(query, (
+        record_id = self.db.write(query, (
             data['employee_id'], 
             data['date'], 
             data['clock_in'],
@@ -25,9 +31,102 @@ class Attendance:
             data.get('latitude'),
             data.get('longitude')
         ))
+        self.calendar_cache.invalidate(data['employee_id'])
+        return record_id
+
+    # Column types for get_history(as_frame=True)
+    HISTORY_FRAME_DTYPES = {
+        'date': 'datetime', 'clock_in': 'datetime', 'clock_out': 'datetime',
+        'total_hours': 'float64', 'regular_hours': 'float64', 'overtime_hours': 'float64',
+        'status': 'category', 'work_type': 'category', 'department_name': 'category',
+    }
+
+    RECORD_COLUMNS = [
+        'employee_id', 'date', 'clock_in', 'clock_out', 'break_duration', 'total_hours',
+        'regular_hours', 'overtime_hours', 'status', 'work_type', 'notes', 'latitude', 'longitude'
+    ]
+
+    def upsert_records(self, records, chunk_size=None):
+        """
+        Bulk create/overwrite records keyed on (employee_id, date).
+        records: iterable of dicts using RECORD_COLUMNS keys; the keys of the
+        first record decide which columns are written (others keep their defaults).
+        Returns per-chunk results from DBManager.bulk_upsert.
+        """
+        records = iter(records)
+        first = next(records, None)
+        if first is None:
+            return []
+        columns = [c for c in self.RECORD_COLUMNS if c in first]
+        kwargs = {'chunk_size': chunk_size} if chunk_size else {}
+        try:
+            return self.db.bulk_upsert(
+                'attendance', columns, itertools.chain([first], records),
+                conflict_columns=['employee_id', 'date'], touch_updated_at=True, **kwargs
+            )
+        finally:
+            self.calendar_cache.invalidate()
+
+    # Late/Present against the day's precomputed roster slot, if it has one
+    SLOT_STATUS = """
+        SELECT CASE WHEN :now > datetime(ss.start_at, '+' || ss.grace_period_minutes || ' minutes')
+                    THEN 'Late' ELSE 'Present' END
+        FROM shift_schedule ss WHERE ss.employee_id = :employee_id AND ss.date = :date
+    """
+
+    # Clock-in insert: the day's roster slot (rotations, shift changes) decides
+    # Late/Present, else :status (shift cache hit), else the employee's shift,
+    # looked up in the same statement (default 09:00 with 15 minutes grace).
+    # Selecting from employees means a cached but since-deleted employee
+    # inserts nothing. ON CONFLICT DO NOTHING makes a second punch the same
+    # day a no-op (no row returned) instead of a UNIQUE violation.
+    CLOCK_IN_QUERY = f"""
+    INSERT INTO attendance (employee_id, date, clock_in, status, work_type, latitude, longitude,
+                            geofence_status, geofence_site_id)
+    SELECT e.id, :date, :clock_in,
+        COALESCE(({SLOT_STATUS}), :status,
+            CASE WHEN :now > datetime(:date || ' ' || COALESCE(s.start_time, '09:00'),
+                                      '+' || COALESCE(s.grace_period_minutes, 15) || ' minutes')
+                 THEN 'Late' ELSE 'Present' END),
+        'Regular', :latitude, :longitude, :geofence_status, :geofence_site_id
+    FROM employees e
+    LEFT JOIN shifts s ON s.id = e.shift_id
+    WHERE e.id = :employee_id
+    ON CONFLICT (employee_id, date) DO NOTHING
+    RETURNING id, status
+    """
 
-    def update_record(self, attendance_id, data):
-        """Update attendance record (e.g. clock out, add break)"""
+    def clock_in(self, employee_id, now, location=None, status=None, geofence=(None, None)):
+        """
+        Atomically create today's record for a clock-in at `now`.
+        The day's shift_schedule slot decides Late/Present when there is one;
+        otherwise `status`, or without it the employee's shift, in SQL.
+        geofence: (geofence_status, site_id) from services.geofence_service.
+        Returns {'id', 'status'}, or None if the employee already has a record
+        for the day or does not exist. Raises on database errors.
+        """
+        params = {
+            'employee_id': employee_id,
+            'date': str(now.date()),
+            'clock_in': now,
+            'now': now.strftime('%Y-%m-%d %H:%M:%S'),
+            'status': status,
+            'latitude': location[0] if location else None,
+            'longitude': location[1] if location else None,
+            'geofence_status': geofence[0],
+            'geofence_site_id': geofence[1],
+        }
+        # RETURNING needs the row fetched before commit, so it runs as a writer unit
+        record = self.db.write_unit(self.db.execute_query, self.CLOCK_IN_QUERY, params, fetch_one=True)
+        if record:
+            self.calendar_cache.invalidate(employee_id)
+        return record
+
+    def update_record(self, attendance_id, data, employee_id=None):
+        """
+        Update attendance record (e.g. clock out, add break). Raises on failure.
+        employee_id, when known, limits calendar cache invalidation to that employee.
+        """
         fields = []
         params = []
         for key, value in data.items():
@@ -36,18 +135,20 @@ class Attendance:
         
         params.append(attendance_id)
         query = f"UPDATE attendance SET {', '.join(fields)}, updated_at = CURRENT_TIMESTAMP WHERE id = ?"
-        return self.db.execute_query(query, tuple(params))
+        result = self.db.write(query, tuple(params))
+        self.calendar_cache.invalidate(employee_id)
+        return result
 
     def get_todays_record(self, employee_id, date_str):
         """Get attendance record for a specific employee and date"""
         query = "SELECT * FROM attendance WHERE employee_id = ? AND date = ?"
         return self.db.execute_query(query, (employee_id, date_str), fetch_one=True)
 
-    def get_history(self, filters=None):
-        """
-        Get attendance history with optional filters.
-        filters: dict containing 'start_date', 'end_date', 'employee_id', 'department_id'
-        """
+    # History order; matches idx_attendance_history so keyset pages are index range scans
+    HISTORY_ORDER = "a.date DESC, COALESCE(a.clock_in, '') DESC, a.id DESC"
+
+    def _history_query(self, filters=None, after=None, limit=None):
+        """Build the history SELECT and its params from the supported filters"""
         query = """
         SELECT a.*, e.first_name, e.last_name, e.employee_code, d.name as department_name
         FROM attendance a
@@ -70,9 +171,79 @@ class Attendance:
             if filters.get('department_id'):
                 query += " AND e.department_id = ?"
                 params.append(filters['department_id'])
+
+        if after:
+            query += " AND (a.date, COALESCE(a.clock_in, ''), a.id) < (?, ?, ?)"
+            params.extend(after)
         
-        query += " ORDER BY a.date DESC, a.clock_in DESC"
-        return self.db.execute_query(query, tuple(params), fetch_all=True)
+        query += f" ORDER BY {self.HISTORY_ORDER}"
+        if limit:
+            query += " LIMIT ?"
+            params.append(limit)
+        return query, tuple(params)
+
+    def get_history(self, filters=None, row_format='dict', as_frame=False):
+        """
+        Get attendance history with optional filters.
+        filters: dict containing 'start_date', 'end_date', 'employee_id', 'department_id'
+        row_format: 'record' returns compact tuple rows (see database/rows.py)
+        as_frame: return a typed pandas DataFrame (dates parsed, status/department categorical)
+        """
+        query, params = self._history_query(filters)
+        if as_frame:
+            return self.db.query_frame(query, params, dtypes=self.HISTORY_FRAME_DTYPES)
+        return self.db.execute_query(query, params, fetch_all=True, row_format=row_format)
+
+    def get_history_page(self, filters=None, limit=50, after=None, row_format='dict'):
+        """
+        One page of history, newest first (same filters as get_history).
+        after: cursor returned with the previous page, None for the first.
+        Returns (rows, next_cursor); next_cursor is None on the last page.
+        Cursors are (date, clock_in or '', id) tuples: seeking past them costs
+        the same on page 1 and page 1000, unlike OFFSET.
+        """
+        query, params = self._history_query(filters, after=after, limit=limit + 1)
+        rows = self.db.execute_query(query, params, fetch_all=True, row_format=row_format)
+        if not rows:
+            return [], None
+        if len(rows) <= limit:
+            return rows, None
+        rows = rows[:limit]
+        last = rows[-1]
+        return rows, (last['date'], last['clock_in'] or '', last['id'])
+
+    def iter_history(self, filters=None, chunk_size=None, row_format='dict'):
+        """Stream attendance history (same filters as get_history) in constant memory"""
+        query, params = self._history_query(filters)
+        if chunk_size:
+            return self.db.iter_query(query, params, chunk_size, row_format=row_format)
+        return self.db.iter_query(query, params, row_format=row_format)
+
+    def get_roster(self, date_str, department_id=None, row_format='record'):
+        """
+        One row per active employee for a date, LEFT JOINed to that day's
+        record: status 'Absent' when there is none, clock times as HH:MM.
+        Each employee's record is a (employee_id, date) unique-index lookup.
+        """
+        query = """
+        SELECT e.id as employee_id, e.first_name, e.last_name, e.employee_code,
+               d.name as department_name, a.id as attendance_id,
+               COALESCE(a.status, 'Absent') as status,
+               strftime('%H:%M', a.clock_in) as clock_in,
+               strftime('%H:%M', a.clock_out) as clock_out,
+               COALESCE(a.total_hours, 0.0) as total_hours,
+               COALESCE(a.overtime_hours, 0.0) as overtime_hours
+        FROM employees e
+        LEFT JOIN departments d ON e.department_id = d.id
+        LEFT JOIN attendance a ON a.employee_id = e.id AND a.date = ?
+        WHERE e.status = 'Active'
+        """
+        params = [date_str]
+        if department_id:
+            query += " AND e.department_id = ?"
+            params.append(department_id)
+        query += " ORDER BY e.last_name, e.first_name"
+        return self.db.execute_query(query, tuple(params), fetch_all=True, row_format=row_format)
 
     def get_pending_approvals(self, manager_id=None):
         """Get records needing approval"""
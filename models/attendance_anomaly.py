@@ -0,0 +1,47 @@
+import json
+from database.db_manager import DBManager
+
+class AttendanceAnomaly:
+    """Findings written by services/anomaly_service.py"""
+    def __init__(self):
+        self.db = DBManager()
+
+    def get_findings(self, start_date, end_date, kind=None, include_resolved=False, limit=500):
+        """Findings for records dated start_date..end_date, newest first"""
+        query = """
+        SELECT f.id, f.attendance_id, f.date, f.kind, f.detail, f.detected_at, f.resolved_at,
+               e.employee_code, e.first_name, e.last_name, d.name as department_name,
+               strftime('%H:%M', a.clock_in) as clock_in, strftime('%H:%M', a.clock_out) as clock_out, a.status
+        FROM attendance_anomalies f
+        JOIN attendance a ON a.id = f.attendance_id
+        JOIN employees e ON e.id = f.employee_id
+        LEFT JOIN departments d ON d.id = e.department_id
+        WHERE f.date >= ? AND f.date <= ?
+        """
+        params = [str(start_date), str(end_date)]
+        if kind:
+            query += " AND f.kind = ?"
+            params.append(kind)
+        if not include_resolved:
+            query += " AND f.resolved_at IS NULL"
+        query += " ORDER BY f.date DESC, f.id DESC LIMIT ?"
+        params.append(limit)
+        return self.db.execute_query(query, tuple(params), fetch_all=True)
+
+    def open_counts(self, start_date, end_date):
+        """{kind: open findings} for a date range"""
+        query = """
+        SELECT kind, COUNT(*) as n FROM attendance_anomalies
+        WHERE resolved_at IS NULL AND date >= ? AND date <= ?
+        GROUP BY kind
+        """
+        rows = self.db.execute_query(query, (str(start_date), str(end_date)), fetch_all=True) or []
+        return {r['kind']: r['n'] for r in rows}
+
+    def resolve(self, anomaly_ids, user_id):
+        """Mark findings as reviewed"""
+        query = """
+        UPDATE attendance_anomalies SET resolved_at = CURRENT_TIMESTAMP, resolved_by = ?
+        WHERE id IN (SELECT value FROM json_each(?)) AND resolved_at IS NULL
+        """
+        return self.db.execute_query(query, (user_id, json.dumps([int(i) for i in anomaly_ids])))
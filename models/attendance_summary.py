@@ -0,0 +1,125 @@
+"""
+Reads over daily_attendance_summary (date x department x status rollup).
+
+The table is maintained by triggers on attendance and employees (see
+database/migrations/0003_daily_attendance_summary.sql), so it is always in
+the same transaction state as the records it counts. rebuild() recomputes
+it from attendance should it ever drift, e.g. after editing the database
+by hand with triggers disabled:
+
+    python -m models.attendance_summary --rebuild [--start YYYY-MM-DD] [--end YYYY-MM-DD]
+"""
+import argparse
+import logging
+from database.db_manager import DBManager
+
+logger = logging.getLogger(__name__)
+
+PRESENT_STATUSES = ('Present', 'Late')
+
+
+class AttendanceSummary:
+    def __init__(self):
+        self.db = DBManager()
+
+    FRAME_DTYPES = {
+        'date': 'datetime', 'status': 'category', 'department_name': 'category',
+        'records': 'int64', 'total_hours': 'float64', 'overtime_hours': 'float64',
+    }
+
+    def get_range(self, start_date, end_date, as_frame=False):
+        """Summary rows (date, department_id, department_name, status, records, hours) for a date range"""
+        query = """
+        SELECT s.date, s.department_id, d.name as department_name, s.status, s.records,
+               ROUND(s.total_hours, 2) as total_hours, ROUND(s.overtime_hours, 2) as overtime_hours
+        FROM daily_attendance_summary s
+        LEFT JOIN departments d ON d.id = s.department_id
+        WHERE s.date >= ? AND s.date <= ?
+        ORDER BY s.date
+        """
+        params = (str(start_date), str(end_date))
+        if as_frame:
+            return self.db.query_frame(query, params, dtypes=self.FRAME_DTYPES)
+        return self.db.execute_query(query, params, fetch_all=True)
+
+    def status_counts(self, start_date, end_date=None):
+        """{status: records} over a date range (a single day by default)"""
+        query = """
+        SELECT status, SUM(records) as records FROM daily_attendance_summary
+        WHERE date >= ? AND date <= ? GROUP BY status
+        """
+        rows = self.db.execute_query(query, (str(start_date), str(end_date or start_date)), fetch_all=True) or []
+        return {r['status']: r['records'] for r in rows}
+
+    def daily_counts(self, start_date, end_date):
+        """
+        {date: {'records', 'present', 'absent', 'on_leave', 'overtime_hours'}}
+        for each day that has records. Absent/On Leave are only complete for
+        days services/absence_service.py has materialized.
+        """
+        query = f"""
+        SELECT date, SUM(records) as records,
+               SUM(CASE WHEN status IN ({', '.join('?' * len(PRESENT_STATUSES))}) THEN records ELSE 0 END) as present,
+               SUM(CASE WHEN status = 'Absent' THEN records ELSE 0 END) as absent,
+               SUM(CASE WHEN status = 'On Leave' THEN records ELSE 0 END) as on_leave,
+               ROUND(SUM(overtime_hours), 2) as overtime_hours
+        FROM daily_attendance_summary
+        WHERE date >= ? AND date <= ?
+        GROUP BY date
+        """
+        rows = self.db.execute_query(query, (*PRESENT_STATUSES, str(start_date), str(end_date)), fetch_all=True) or []
+        return {r['date']: r for r in rows}
+
+    def rebuild(self, start_date=None, end_date=None):
+        """
+        Recompute the summary from attendance, for all dates or a range.
+        Returns the number of summary rows written, or None on failure.
+        """
+        where, params = [], []
+        if start_date:
+            where.append("date >= ?")
+            params.append(str(start_date))
+        if end_date:
+            where.append("date <= ?")
+            params.append(str(end_date))
+        clause = f"WHERE {' AND '.join(where)}" if where else ""
+        source_clause = f"WHERE {' AND '.join('a.' + w for w in where)}" if where else ""
+        try:
+            with self.db.transaction(immediate=True):
+                self.db.execute_query(f"DELETE FROM daily_attendance_summary {clause}", tuple(params))
+                self.db.execute_query(f"""
+                    INSERT INTO daily_attendance_summary (date, department_id, status, records, total_hours, overtime_hours)
+                    SELECT a.date, COALESCE(e.department_id, 0), COALESCE(a.status, 'Unknown'), COUNT(*),
+                           COALESCE(SUM(a.total_hours), 0), COALESCE(SUM(a.overtime_hours), 0)
+                    FROM attendance a
+                    LEFT JOIN employees e ON e.id = a.employee_id
+                    {source_clause}
+                    GROUP BY a.date, COALESCE(e.department_id, 0), COALESCE(a.status, 'Unknown')
+                """, tuple(params))
+                written = self.db.execute_query(
+                    f"SELECT COUNT(*) as n FROM daily_attendance_summary {clause}", tuple(params), fetch_one=True
+                )
+        except Exception as e:
+            logger.error(f"Rebuilding daily_attendance_summary failed: {e}")
+            return None
+        return written['n']
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Daily attendance summary maintenance")
+    parser.add_argument('--rebuild', action='store_true', help="recompute the summary from attendance")
+    parser.add_argument('--start', help="first date to rebuild (YYYY-MM-DD)")
+    parser.add_argument('--end', help="last date to rebuild (YYYY-MM-DD)")
+    args = parser.parse_args()
+
+    if not args.rebuild:
+        parser.print_help()
+        return
+    written = AttendanceSummary().rebuild(args.start, args.end)
+    if written is None:
+        raise SystemExit("Rebuild failed. See log for details.")
+    print(f"Rebuilt daily_attendance_summary: {written} row(s).")
+
+
+if __name__ == "__main__":
+    main()
@@ -25,13 +25,18 @@ class AuditLog:
             (user_id, action, target_table, str(target_id), details)
         )
 
-    def get_logs(self, limit=100):
+    def get_logs(self, limit=100, as_frame=False):
         # Join with users to get names if possible
         query = """
-        SELECT a.*, u.username, u.first_name, u.last_name 
+        SELECT a.*, u.username, e.first_name, e.last_name 
         FROM audit_logs a
         LEFT JOIN users u ON a.user_id = u.id
+        LEFT JOIN employees e ON u.employee_id = e.id
         ORDER BY a.timestamp DESC
         LIMIT ?
         """
+        if as_frame:
+            return self.db.query_frame(query, (limit,), dtypes={
+                'timestamp': 'datetime', 'action': 'category', 'target_table': 'category'
+            })
         return self.db.execute_query(query, (limit,), fetch_all=True)
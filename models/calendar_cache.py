@@ -0,0 +1,82 @@
+"""
+Process-wide cache of per-employee, per-month calendar event lists.
+
+services/calendar_service.py fills it; attendance writers invalidate the
+employee they touched (or everyone, for bulk jobs). Each employee has a
+version counter: a fill records the version it started from and is
+dropped if a write landed in between, as in models/shift_cache.py. Entries
+also expire after CALENDAR_CACHE_TTL_SECONDS, which bounds staleness from
+writes made by other processes (kiosk machines, CLI jobs), and the least
+recently used are evicted past CALENDAR_CACHE_MONTHS.
+"""
+import threading
+import time
+from collections import OrderedDict
+from config import DATABASE_PATH, CALENDAR_CACHE_MONTHS, CALENDAR_CACHE_TTL_SECONDS
+
+HOLIDAYS = 'holidays'  # cache "employee" for the shared holiday events
+
+
+class CalendarCache:
+    def __init__(self, max_entries=CALENDAR_CACHE_MONTHS, ttl=CALENDAR_CACHE_TTL_SECONDS):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()  # (owner, 'YYYY-MM') -> (version, epoch, loaded_at, events)
+        self._versions = {}
+        self._epoch = 0  # bumped by invalidate() with no owner
+        self.hits = 0
+        self.misses = 0
+
+    def version(self, owner):
+        """Token to pass back to put(); a write to owner in between makes put() a no-op"""
+        return self._versions.get(owner, 0), self._epoch
+
+    def get(self, owner, month):
+        """Cached events for (owner, month), or None"""
+        with self._lock:
+            entry = self._entries.get((owner, month))
+            if entry is not None and (entry[0], entry[1]) == self.version(owner) \
+                    and time.monotonic() - entry[2] < self.ttl:
+                self._entries.move_to_end((owner, month))
+                self.hits += 1
+                return entry[3]
+            self.misses += 1
+            return None
+
+    def put(self, owner, month, events, version):
+        with self._lock:
+            if version != self.version(owner):
+                return
+            self._entries[(owner, month)] = (*version, time.monotonic(), events)
+            self._entries.move_to_end((owner, month))
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, owner=None):
+        """Drop one employee's months (or HOLIDAYS); everything when owner is None"""
+        with self._lock:
+            if owner is None:
+                self._epoch += 1
+                self._entries.clear()
+                return
+            self._versions[owner] = self._versions.get(owner, 0) + 1
+            for key in [k for k in self._entries if k[0] == owner]:
+                del self._entries[key]
+
+    def stats(self):
+        return {'entries': len(self._entries), 'hits': self.hits, 'misses': self.misses}
+
+
+_caches = {}
+_caches_lock = threading.Lock()
+
+
+def get_calendar_cache(db_path=DATABASE_PATH):
+    """The shared CalendarCache for a database file"""
+    with _caches_lock:
+        cache = _caches.get(db_path)
+        if cache is None:
+            cache = CalendarCache()
+            _caches[db_path] = cache
+        return cache
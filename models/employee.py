@@ -1,32 +1,64 @@
 from database.db_manager import DBManager
+from models.shift_cache import get_shift_cache
+from utils.pins import pin_digest
 import logging
+import sqlite3
 
 logger = logging.getLogger(__name__)
 
+class DuplicatePinError(ValueError):
+    """The PIN is already assigned to another employee"""
+
+def _raise_duplicate_pin(error):
+    # idx_employees_pin_digest (migration 0002) is UNIQUE
+    if 'employees.pin_digest' in str(error):
+        raise DuplicatePinError("PIN already in use") from error
+
 class Employee:
     def __init__(self):
         self.db = DBManager()
+        self.cache = get_shift_cache(self.db.db_path)
 
     def create_employee(self, data):
-        """Create a new employee"""
+        """
+        Create a new employee. A 'pin_code' in data is stored only as its digest.
+        Raises DuplicatePinError if another employee has the PIN, and on other database errors.
+        """
         query = """
         INSERT INTO employees (
             first_name, last_name, email, phone, national_id, address,
             employee_code, department_id, position, hire_date, salary, hourly_rate, 
-            status, shift_id, pin_code
-        ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            status, shift_id, rotation_id, pin_digest
+        ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
         """
         params = (
             data['first_name'], data['last_name'], data['email'], data['phone'],
             data['national_id'], data['address'], data['employee_code'],
             data['department_id'], data['position'], data['hire_date'],
             data['salary'], data['hourly_rate'], data['status'],
-            data.get('shift_id', 1), data.get('pin_code')
+            data.get('shift_id', 1), data.get('rotation_id'), pin_digest(data.get('pin_code'))
         )
-        return self.db.execute_query(query, params)
+        try:
+            with self.db.transaction():
+                res = self.db.execute_query(query, params)
+        except sqlite3.IntegrityError as e:
+            _raise_duplicate_pin(e)
+            raise
+        finally:
+            self.cache.invalidate()
+        return res
 
-    def get_all(self, active_only=False):
-        """Get all employees"""
+    # Column types for get_all(as_frame=True)
+    FRAME_DTYPES = {
+        'hire_date': 'datetime', 'status': 'category', 'position': 'category',
+        'department_name': 'category',
+    }
+
+    def get_all(self, active_only=False, row_format='dict', as_frame=False):
+        """
+        Get all employees.
+        row_format='record' returns compact tuple rows; as_frame=True a typed DataFrame.
+        """
         query = """
         SELECT e.*, d.name as department_name 
         FROM employees e
@@ -35,7 +67,9 @@ class Employee:
         if active_only:
             query += " WHERE e.status = 'Active'"
         query += " ORDER BY e.last_name, e.first_name"
-        return self.db.execute_query(query, fetch_all=True)
+        if as_frame:
+            return self.db.query_frame(query, dtypes=self.FRAME_DTYPES)
+        return self.db.execute_query(query, fetch_all=True, row_format=row_format)
 
     def get_by_id(self, employee_id):
         """Get employee by ID"""
@@ -53,7 +87,15 @@ class Employee:
         return self.db.execute_query(query, (email,), fetch_one=True)
 
     def update_employee(self, employee_id, data):
-        """Update employee details"""
+        """
+        Update employee details. A non-blank 'pin_code' replaces the stored PIN digest.
+        Raises DuplicatePinError if another employee has the PIN, and on other database errors.
+        """
+        data = dict(data)
+        if 'pin_code' in data:
+            digest = pin_digest(data.pop('pin_code'))
+            if digest:
+                data['pin_digest'] = digest
         fields = []
         params = []
         for key, value in data.items():
@@ -62,19 +104,31 @@ class Employee:
         
         params.append(employee_id)
         query = f"UPDATE employees SET {', '.join(fields)}, updated_at = CURRENT_TIMESTAMP WHERE id = ?"
-        res = self.db.execute_query(query, tuple(params))
         
-        # Audit Log
+        # Update and audit entry share one transaction
         try:
-            from models.audit import AuditLog
-            audit = AuditLog()
-            audit.log("UPDATE", "employees", employee_id, details=f"Updated fields: {list(data.keys())}")
-        except Exception as e:
-            pass
+            with self.db.transaction():
+                res = self.db.execute_query(query, tuple(params))
+                
+                # Audit Log
+                try:
+                    from models.audit import AuditLog
+                    audit = AuditLog()
+                    audit.log("UPDATE", "employees", employee_id, details=f"Updated fields: {list(data.keys())}")
+                except Exception as e:
+                    pass
+        except sqlite3.IntegrityError as e:
+            _raise_duplicate_pin(e)
+            raise
+        finally:
+            # Shift assignment, status or name may have changed
+            self.cache.invalidate()
             
         return res
 
     def delete_employee(self, employee_id):
         """Soft delete employee (set to Inactive)"""
         query = "UPDATE employees SET status = 'Inactive', updated_at = CURRENT_TIMESTAMP WHERE id = ?"
-        return self.db.execute_query(query, (employee_id,))
+        res = self.db.execute_query(query, (employee_id,))
+        self.cache.invalidate()
+        return res
@@ -25,15 +25,15 @@ class Expense:
         return self.db.execute_query(query, fetch_all=True)
     
     def get_approved_for_month(self, month, year):
-        # Format date filter is tricky with text dates 'YYYY-MM-DD'. 
-        # Easier to fetch relevant and filter or use LIKE
+        # Text dates 'YYYY-MM-DD' sort correctly, so a half-open range
+        # can use idx_expenses_status_date (strftime() on the column can't)
         start = f"{year}-{month:02d}-01"
-        # Simple string compare for month
+        end = f"{year + 1}-01-01" if month == 12 else f"{year}-{month + 1:02d}-01"
         query = """
         SELECT * FROM expenses 
-        WHERE status = 'Approved' AND strftime('%Y-%m', date) = ?
+        WHERE status = 'Approved' AND date >= ? AND date < ?
         """
-        return self.db.execute_query(query, (f"{year}-{month:02d}",), fetch_all=True)
+        return self.db.execute_query(query, (start, end), fetch_all=True)
 
     def update_status(self, expense_id, status, approver_id=None):
         return self.db.execute_query(
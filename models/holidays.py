@@ -1,8 +1,10 @@
 from database.db_manager import DBManager
+from models.calendar_cache import HOLIDAYS, get_calendar_cache
 
 class Holiday:
     def __init__(self):
         self.db = DBManager()
+        self.calendar_cache = get_calendar_cache(self.db.db_path)
 
     def get_all(self, year=None):
         if year:
@@ -10,13 +12,17 @@ class Holiday:
         return self.db.execute_query("SELECT * FROM public_holidays ORDER BY date", fetch_all=True)
 
     def add(self, date, name, year):
-        return self.db.execute_query(
+        res = self.db.execute_query(
             "INSERT INTO public_holidays (date, name, year) VALUES (?, ?, ?)",
             (date, name, year)
         )
+        self.calendar_cache.invalidate(HOLIDAYS)
+        return res
 
     def delete(self, holiday_id):
-        return self.db.execute_query("DELETE FROM public_holidays WHERE id = ?", (holiday_id,))
+        res = self.db.execute_query("DELETE FROM public_holidays WHERE id = ?", (holiday_id,))
+        self.calendar_cache.invalidate(HOLIDAYS)
+        return res
 
     def is_holiday(self, date_str):
         # date_str: YYYY-MM-DD
@@ -8,6 +8,10 @@ class SettingsModel:
     def get_system_settings(self):
         return self.db.execute_query("SELECT * FROM system_settings", fetch_all=True)
 
+    def get_setting(self, key, default=None):
+        row = self.db.execute_query("SELECT value FROM system_settings WHERE key = ?", (key,), fetch_one=True)
+        return row['value'] if row and row['value'] is not None else default
+
     def update_setting(self, key, value):
         return self.db.execute_query("UPDATE system_settings SET value = ? WHERE key = ?", (value, key))
 
@@ -1,8 +1,13 @@
 from database.db_manager import DBManager
+from models.shift_cache import get_shift_cache
+import logging
+
+logger = logging.getLogger(__name__)
 
 class Shift:
     def __init__(self):
         self.db = DBManager()
+        self.cache = get_shift_cache(self.db.db_path)
 
     def get_all(self):
         return self.db.execute_query("SELECT * FROM shifts", fetch_all=True)
@@ -10,12 +15,48 @@ class Shift:
     def get_by_id(self, shift_id):
         return self.db.execute_query("SELECT * FROM shifts WHERE id = ?", (shift_id,), fetch_one=True)
 
-    def create(self, name, start_time, end_time, grace_period):
-        return self.db.execute_query(
-            "INSERT INTO shifts (name, start_time, end_time, grace_period_minutes) VALUES (?, ?, ?, ?)",
-            (name, start_time, end_time, grace_period)
+    def create(self, name, start_time, end_time, grace_period, work_days='12345'):
+        """work_days: strftime('%w') digits the shift works (0 = Sunday); Monday-Friday by default"""
+        res = self.db.execute_query(
+            "INSERT INTO shifts (name, start_time, end_time, grace_period_minutes, work_days) VALUES (?, ?, ?, ?, ?)",
+            (name, start_time, end_time, grace_period, work_days)
         )
+        self.cache.invalidate()
+        return res
 
     def delete(self, shift_id):
         # Could check if used by employees first
-        return self.db.execute_query("DELETE FROM shifts WHERE id = ?", (shift_id,))
+        res = self.db.execute_query("DELETE FROM shifts WHERE id = ?", (shift_id,))
+        self.cache.invalidate()
+        return res
+
+    # --- Rotations (expanded into shift_schedule by services/roster_service.py) ---
+    def get_rotations(self):
+        query = """
+        SELECT r.*, group_concat(rs.day_index || ':' || s.name, ', ') as pattern
+        FROM shift_rotations r
+        LEFT JOIN shift_rotation_slots rs ON rs.rotation_id = r.id
+        LEFT JOIN shifts s ON s.id = rs.shift_id
+        GROUP BY r.id ORDER BY r.name
+        """
+        return self.db.execute_query(query, fetch_all=True)
+
+    def create_rotation(self, name, anchor_date, pattern):
+        """
+        pattern: one entry per day of the cycle starting at anchor_date,
+        a shift id or None for a day off.
+        """
+        try:
+            with self.db.transaction():
+                rotation_id = self.db.execute_query(
+                    "INSERT INTO shift_rotations (name, cycle_days, anchor_date) VALUES (?, ?, ?)",
+                    (name, len(pattern), str(anchor_date))
+                )
+                self.db.execute_many(
+                    "INSERT INTO shift_rotation_slots (rotation_id, day_index, shift_id) VALUES (?, ?, ?)",
+                    None, [(rotation_id, i, shift_id) for i, shift_id in enumerate(pattern) if shift_id]
+                )
+        except Exception as e:
+            logger.error(f"Error creating rotation {name}: {e}")
+            return None
+        return rotation_id
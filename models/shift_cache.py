@@ -0,0 +1,101 @@
+"""
+Process-wide cache of shifts and employee -> shift assignments.
+
+Shifts and rosters change a few times a month but are read on every
+clock-in. The cache loads both tables once and serves lookups from memory
+until a writer calls invalidate(), which bumps a version counter; the next
+read sees a newer version than the one it loaded and reloads. Writers
+(Shift.create/delete, Employee.create/update/delete_employee) invalidate
+after their commit, and a load records the version it started at, so a
+load that overlaps a write is itself treated as stale.
+"""
+import threading
+from config import DATABASE_PATH
+from database.db_manager import DBManager
+
+ROSTER_QUERY = """
+SELECT e.id, e.employee_code, e.first_name, e.last_name, e.status, e.shift_id,
+       d.name as department_name
+FROM employees e
+LEFT JOIN departments d ON e.department_id = d.id
+ORDER BY e.last_name, e.first_name
+"""
+
+
+class ShiftCache:
+    def __init__(self, db_path=DATABASE_PATH):
+        self.db_path = db_path
+        self._lock = threading.Lock()
+        self._version = 0
+        self._snapshot = None  # (version, shifts by id, roster by employee id)
+
+    @property
+    def version(self):
+        return self._version
+
+    def invalidate(self):
+        """Mark the cached data stale; call after committing a shift or roster change"""
+        with self._lock:
+            self._version += 1
+
+    def _load(self):
+        snapshot = self._snapshot
+        if snapshot is not None and snapshot[0] == self._version:
+            return snapshot
+        with self._lock:
+            snapshot = self._snapshot
+            if snapshot is not None and snapshot[0] == self._version:
+                return snapshot
+            version = self._version
+            db = DBManager(self.db_path)
+            shifts = db.execute_query("SELECT * FROM shifts", fetch_all=True, row_format='record')
+            roster = db.execute_query(ROSTER_QUERY, fetch_all=True, row_format='record')
+            if shifts is None or roster is None:
+                # Query failed (already logged); serve it uncached rather than pin an empty roster
+                return (version, {}, {})
+            snapshot = (version, {s.id: s for s in shifts}, {e.id: e for e in roster})
+            self._snapshot = snapshot
+            return snapshot
+
+    def shifts(self):
+        """All shifts as {id: record}"""
+        return self._load()[1]
+
+    def get_shift(self, shift_id):
+        return self._load()[1].get(shift_id)
+
+    def get_employee(self, employee_id):
+        """Roster record (id, names, status, shift_id, department_name) or None"""
+        return self._load()[2].get(employee_id)
+
+    def shift_for(self, employee_id):
+        """
+        (employee, shift) for an employee; shift is None when unassigned.
+        employee is None when the id is not on the roster.
+        """
+        _, shifts, roster = self._load()
+        employee = roster.get(employee_id)
+        if employee is None:
+            return None, None
+        return employee, shifts.get(employee.shift_id)
+
+    def roster(self, active_only=True):
+        """Employee roster records ordered by name"""
+        employees = self._load()[2].values()
+        if active_only:
+            return [e for e in employees if e.status == 'Active']
+        return list(employees)
+
+
+_caches = {}
+_caches_lock = threading.Lock()
+
+
+def get_shift_cache(db_path=DATABASE_PATH):
+    """The shared ShiftCache for a database file"""
+    with _caches_lock:
+        cache = _caches.get(db_path)
+        if cache is None:
+            cache = ShiftCache(db_path)
+            _caches[db_path] = cache
+        return cache
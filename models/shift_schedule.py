@@ -0,0 +1,45 @@
+from database.db_manager import DBManager
+
+class ShiftSchedule:
+    """Reads over shift_schedule, the roster expanded by services/roster_service.py"""
+
+    def __init__(self):
+        self.db = DBManager()
+
+    def get_slot(self, employee_id, date_str):
+        """The employee's slot (shift_id, start_at, end_at, grace_period_minutes) for a day, or None"""
+        query = "SELECT * FROM shift_schedule WHERE employee_id = ? AND date = ?"
+        return self.db.execute_query(query, (employee_id, str(date_str)), fetch_one=True)
+
+    def get_coverage(self, start_date, end_date, department_id=None):
+        """Headcount per (date, shift) for start_date <= date < end_date"""
+        query = """
+        SELECT ss.date, ss.shift_id, s.name as shift_name, s.start_time, s.end_time, COUNT(*) as staff
+        FROM shift_schedule ss
+        JOIN shifts s ON s.id = ss.shift_id
+        """
+        params = [str(start_date), str(end_date)]
+        if department_id:
+            query += " JOIN employees e ON e.id = ss.employee_id AND e.department_id = ?"
+            params.insert(0, department_id)
+        query += " WHERE ss.date >= ? AND ss.date < ? GROUP BY ss.date, ss.shift_id ORDER BY ss.date, s.start_time"
+        return self.db.execute_query(query, tuple(params), fetch_all=True, row_format='record')
+
+    def get_day(self, date_str, department_id=None):
+        """Everyone scheduled on a day with their shift, by start time then name"""
+        query = """
+        SELECT e.id as employee_id, e.first_name, e.last_name, e.employee_code, d.name as department_name,
+               s.name as shift_name, strftime('%H:%M', ss.start_at) as start_time,
+               strftime('%H:%M', ss.end_at) as end_time
+        FROM shift_schedule ss
+        JOIN employees e ON e.id = ss.employee_id
+        JOIN shifts s ON s.id = ss.shift_id
+        LEFT JOIN departments d ON d.id = e.department_id
+        WHERE ss.date = ?
+        """
+        params = [str(date_str)]
+        if department_id:
+            query += " AND e.department_id = ?"
+            params.append(department_id)
+        query += " ORDER BY ss.start_at, e.last_name, e.first_name"
+        return self.db.execute_query(query, tuple(params), fetch_all=True, row_format='record')
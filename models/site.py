@@ -0,0 +1,33 @@
+import json
+from database.db_manager import DBManager
+from models.site_index import get_site_index
+
+class Site:
+    def __init__(self):
+        self.db = DBManager()
+        self.index = get_site_index(self.db.db_path)
+
+    def get_all(self, active_only=False):
+        query = "SELECT * FROM sites"
+        if active_only:
+            query += " WHERE is_active = 1"
+        return self.db.execute_query(query + " ORDER BY name", fetch_all=True)
+
+    def create(self, name, latitude, longitude, radius_m=200, polygon=None):
+        """polygon: optional list of (lat, lon) vertices; replaces the radius test"""
+        res = self.db.execute_query(
+            "INSERT INTO sites (name, latitude, longitude, radius_m, polygon) VALUES (?, ?, ?, ?, ?)",
+            (name, latitude, longitude, radius_m, json.dumps([list(p) for p in polygon]) if polygon else None)
+        )
+        self.index.invalidate()
+        return res
+
+    def set_active(self, site_id, is_active):
+        res = self.db.execute_query("UPDATE sites SET is_active = ? WHERE id = ?", (1 if is_active else 0, site_id))
+        self.index.invalidate()
+        return res
+
+    def delete(self, site_id):
+        res = self.db.execute_query("DELETE FROM sites WHERE id = ?", (site_id,))
+        self.index.invalidate()
+        return res
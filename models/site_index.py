@@ -0,0 +1,121 @@
+"""
+Process-wide grid index of active work sites, for geofencing punches.
+
+Every cell of a uniform lat/lon grid that a site's bounding box touches
+lists that site. Classifying a punch hashes its coordinates to one cell and
+runs the exact circle or polygon test only for the few sites listed there,
+so it costs microseconds however many sites exist. Site writes
+(models/site.py) call invalidate(), which bumps a version counter; the
+next lookup rebuilds the index, as in models/shift_cache.py.
+"""
+import json
+import logging
+import math
+import threading
+from collections import defaultdict, namedtuple
+from config import DATABASE_PATH, GEOFENCE_CELL_DEGREES
+from database.db_manager import DBManager
+from utils.geo import haversine_m, point_in_polygon, polygon_bbox, radius_bbox
+
+logger = logging.getLogger(__name__)
+
+ON_SITE = 'On-site'
+OFF_SITE = 'Off-site'
+
+GeoSite = namedtuple('GeoSite', ['id', 'name', 'latitude', 'longitude', 'radius_m', 'polygon', 'bbox'])
+
+
+def _site(row):
+    polygon = None
+    if row['polygon']:
+        try:
+            polygon = [tuple(map(float, p)) for p in json.loads(row['polygon'])]
+        except (ValueError, TypeError):
+            logger.error(f"Site {row['id']} has an invalid polygon; using its radius instead")
+    bbox = polygon_bbox(polygon) if polygon else radius_bbox(row['latitude'], row['longitude'], row['radius_m'])
+    return GeoSite(row['id'], row['name'], row['latitude'], row['longitude'], row['radius_m'], polygon, bbox)
+
+
+def contains(site, lat, lon):
+    """Exact test: inside the site's polygon, or within its radius"""
+    if site.polygon:
+        return point_in_polygon(lat, lon, site.polygon)
+    return haversine_m(lat, lon, site.latitude, site.longitude) <= site.radius_m
+
+
+class SiteIndex:
+    def __init__(self, db_path=DATABASE_PATH, cell_degrees=GEOFENCE_CELL_DEGREES):
+        self.db_path = db_path
+        self.cell = cell_degrees
+        self._lock = threading.Lock()
+        self._version = 0
+        self._snapshot = None  # (version, sites, {cell: (site, ...)})
+
+    def invalidate(self):
+        """Mark the index stale; call after committing a site change"""
+        with self._lock:
+            self._version += 1
+
+    def _key(self, lat, lon):
+        return math.floor(lat / self.cell), math.floor(lon / self.cell)
+
+    def _load(self):
+        snapshot = self._snapshot
+        if snapshot is not None and snapshot[0] == self._version:
+            return snapshot
+        with self._lock:
+            snapshot = self._snapshot
+            if snapshot is not None and snapshot[0] == self._version:
+                return snapshot
+            version = self._version
+            rows = DBManager(self.db_path).execute_query("SELECT * FROM sites WHERE is_active = 1", fetch_all=True)
+            if rows is None:
+                return (version, [], {})  # query failed (logged); classify as no sites, uncached
+            sites = [_site(r) for r in rows]
+            grid = defaultdict(list)
+            for site in sites:
+                min_lat, min_lon, max_lat, max_lon = site.bbox
+                (r0, c0), (r1, c1) = self._key(min_lat, min_lon), self._key(max_lat, max_lon)
+                for r in range(r0, r1 + 1):
+                    for c in range(c0, c1 + 1):
+                        grid[(r, c)].append(site)
+            snapshot = (version, sites, {k: tuple(v) for k, v in grid.items()})
+            self._snapshot = snapshot
+            return snapshot
+
+    def sites(self):
+        return self._load()[1]
+
+    def locate(self, lat, lon):
+        """The site containing (lat, lon), or None"""
+        for site in self._load()[2].get(self._key(lat, lon), ()):
+            if contains(site, lat, lon):
+                return site
+        return None
+
+    def classify(self, location):
+        """
+        (geofence_status, site_id) for a (lat, lon) punch location: On-site with
+        the site, Off-site with None, or (None, None) without coordinates or
+        when no sites are configured.
+        """
+        if not location or location[0] is None or location[1] is None:
+            return None, None
+        if not self._load()[1]:
+            return None, None
+        site = self.locate(float(location[0]), float(location[1]))
+        return (ON_SITE, site.id) if site else (OFF_SITE, None)
+
+
+_indexes = {}
+_indexes_lock = threading.Lock()
+
+
+def get_site_index(db_path=DATABASE_PATH):
+    """The shared SiteIndex for a database file"""
+    with _indexes_lock:
+        index = _indexes.get(db_path)
+        if index is None:
+            index = SiteIndex(db_path)
+            _indexes[db_path] = index
+        return index
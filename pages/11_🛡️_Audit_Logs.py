@@ -1,5 +1,4 @@
 import streamlit as st
-import pandas as pd
 from utils.auth_utils import require_login, check_role, render_sidebar
 from models.audit import AuditLog
 
@@ -11,10 +10,9 @@ check_role(['Admin'])
 st.title("🛡️ Security Audit Logs")
 
 audit = AuditLog()
-logs = audit.get_logs(limit=200)
+df = audit.get_logs(limit=200, as_frame=True)
 
-if logs:
-    df = pd.DataFrame(logs)
+if df is not None and not df.empty:
     # Format details
     df['User'] = df.apply(lambda x: f"{x['username']} ({x['first_name']} {x['last_name']})" if x['username'] else "System", axis=1)
     
@@ -0,0 +1,58 @@
+import streamlit as st
+import pandas as pd
+from utils.auth_utils import require_login, check_role, render_sidebar
+from database.db_manager import DBManager
+from database.query_stats import query_stats
+
+st.set_page_config(page_title="Query Performance", page_icon="🐢", layout="wide")
+require_login()
+render_sidebar()
+check_role(['Admin'])
+
+st.title("🐢 Query Performance")
+st.caption(f"Statistics for this server process since start-up. Slow threshold: {query_stats.threshold_ms:.0f} ms")
+
+db = DBManager()
+
+# Connection pool
+pool = db.pool_stats()
+c1, c2, c3, c4 = st.columns(4)
+c1.metric("Open Connections", f"{pool['open']} / {pool['max_size']}")
+c2.metric("In Use", pool['in_use'])
+c3.metric("Pool Hits", pool['hits'])
+c4.metric("Pool Waits", pool['waits'])
+
+st.divider()
+
+st.subheader("Top Statements by Total Time")
+order_by = st.selectbox("Order by", ['total_ms', 'calls', 'max_ms', 'rows'])
+top = query_stats.top(limit=50, order_by=order_by)
+if top:
+    df = pd.DataFrame(top)
+    df['call_sites'] = df['call_sites'].apply(lambda sites: ", ".join(sites))
+    df['full_scan'] = df['full_scan'].map({True: "⚠️ Yes", False: "No"}).fillna("-")
+    st.dataframe(
+        df[['statement', 'calls', 'total_ms', 'avg_ms', 'max_ms', 'rows', 'slow_calls', 'full_scan', 'call_sites']].round(2),
+        use_container_width=True,
+        hide_index=True
+    )
+else:
+    st.info("No queries recorded yet.")
+
+st.subheader("Recent Slow Queries")
+slow = query_stats.slow_queries()
+if slow:
+    for rec in slow[:50]:
+        label = f"{rec['elapsed_ms']:.1f} ms · {rec['rows']} rows · {rec['call_site']}"
+        if rec['full_scan']:
+            label = "⚠️ FULL SCAN · " + label
+        with st.expander(label):
+            st.code(rec['statement'], language="sql")
+            st.text("\n".join(rec['plan']))
+            st.caption(rec['timestamp'])
+else:
+    st.success("No slow queries recorded.")
+
+if st.button("Reset Statistics"):
+    query_stats.reset()
+    st.rerun()
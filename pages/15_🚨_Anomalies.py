@@ -0,0 +1,69 @@
+import streamlit as st
+import pandas as pd
+from datetime import datetime, timedelta
+from utils.auth_utils import require_login, check_role, render_sidebar
+from models.attendance_anomaly import AttendanceAnomaly
+from services.anomaly_service import AnomalyDetector, KINDS
+
+st.set_page_config(page_title="Attendance Anomalies", page_icon="🚨", layout="wide")
+require_login()
+render_sidebar()
+check_role(['Admin'])
+
+st.title("🚨 Attendance Anomalies")
+
+anomaly_model = AttendanceAnomaly()
+detector = AnomalyDetector()
+user = st.session_state.user
+
+c1, c2 = st.columns([3, 1])
+c1.caption(f"Attendance checked through: {detector.processed_through() or 'never'}")
+if c2.button("Run Detector Now"):
+    with st.spinner("Checking attendance changes..."):
+        summary = detector.run()
+    if summary is None:
+        st.error("Anomaly detection failed. See log for details.")
+    else:
+        st.success(f"{summary['scanned']} record(s) checked, {summary['found']} finding(s), "
+                   f"{summary['overdue']} missing clock-out(s).")
+
+today = datetime.now().date()
+f1, f2, f3 = st.columns(3)
+date_range = f1.date_input("Date Range", value=(today - timedelta(days=30), today))
+kind = f2.selectbox("Kind", ["All"] + list(KINDS))
+include_resolved = f3.checkbox("Include resolved")
+if not isinstance(date_range, tuple) or len(date_range) != 2:
+    st.info("Select a start and end date.")
+    st.stop()
+start_date, end_date = date_range
+
+counts = anomaly_model.open_counts(start_date, end_date)
+for col, k in zip(st.columns(len(KINDS)), KINDS):
+    col.metric(k, counts.get(k, 0))
+
+st.divider()
+
+findings = anomaly_model.get_findings(start_date, end_date, kind=None if kind == "All" else kind,
+                                      include_resolved=include_resolved)
+if not findings:
+    st.success("No anomalies found.")
+    st.stop()
+
+df = pd.DataFrame(findings)
+df['employee'] = df['first_name'] + ' ' + df['last_name'] + ' (' + df['employee_code'] + ')'
+st.dataframe(
+    df[['date', 'employee', 'department_name', 'kind', 'detail', 'clock_in', 'clock_out', 'status',
+        'detected_at', 'resolved_at']],
+    use_container_width=True,
+    hide_index=True
+)
+
+open_findings = df[df['resolved_at'].isna()]
+if not open_findings.empty:
+    with st.form("resolve_anomalies"):
+        labels = {row.id: f"{row.date} · {row.employee} · {row.kind}" for row in open_findings.itertuples()}
+        selected = st.multiselect("Mark as reviewed", list(labels), format_func=labels.get)
+        if st.form_submit_button("Resolve Selected") and selected:
+            anomaly_model.resolve(selected, user['id'])
+            st.success(f"Resolved {len(selected)} finding(s).")
+            st.rerun()
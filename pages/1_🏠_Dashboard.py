@@ -1,3 +1,4 @@
+import asyncio
 import streamlit as st
 import pandas as pd
 import plotly.express as px
@@ -7,6 +8,9 @@ from utils.auth_utils import require_login
 from models.employee import Employee
 from models.attendance import Attendance
 from models.leave import LeaveRequest
+from models.attendance_summary import AttendanceSummary
+from utils.pagination import keyset_pager
+from config import HISTORY_PAGE_SIZE
 
 # Page Config
 st.set_page_config(page_title="Dashboard", page_icon="🏠", layout="wide")
@@ -19,6 +23,7 @@ render_sidebar()
 employee_model = Employee()
 attendance_model = Attendance()
 leave_model = LeaveRequest()
+summary_model = AttendanceSummary()
 
 # User Context
 user = st.session_state.user
@@ -41,21 +46,30 @@ try:
 except Exception:
     pass # Handle missing table gracefully if during migration
 
+async def fetch_admin_metrics_data(today):
+    """The dashboard's independent queries, run concurrently"""
+    from models.async_models import AsyncEmployee, AsyncAttendance, AsyncAttendanceSummary
+    emp, att, summary = AsyncEmployee(), AsyncAttendance(), AsyncAttendanceSummary()
+    return await asyncio.gather(
+        emp.get_all(active_only=True, row_format='record'),
+        summary.status_counts(today),  # today's rollup rows, not today's records
+        att.get_pending_approvals(),
+    )
+
 def get_admin_metrics():
+    today = str(datetime.now().date())
+    employees, status_counts, pending_records = asyncio.run(fetch_admin_metrics_data(today))
+
     # 1. Total Employees
-    employees = employee_model.get_all(active_only=True)
     total_emp = len(employees)
     
     # 2. Attendance Rate
-    today = str(datetime.now().date())
-    # This is a bit inefficient, better to have a count query, but ok for MVP
-    attendance_records = attendance_model.get_history(filters={'start_date': today, 'end_date': today})
-    present_count = len([a for a in attendance_records if a['status'] in ['Present', 'Late']])
+    present_count = sum(status_counts.get(s, 0) for s in ['Present', 'Late'])
     attendance_rate = (present_count / total_emp * 100) if total_emp > 0 else 0
     
     # 3. Pending Approvals
     # For now just counting attendance approvals
-    pending_attendance = len(attendance_model.get_pending_approvals())
+    pending_attendance = len(pending_records or [])
     # pending_leaves = len(leave_model.get_requests({'status': 'Pending'})) # Need to verify this method
     pending_leaves = 0 # Placeholder until leave method verified
     
@@ -87,43 +101,37 @@ def render_admin_dashboard():
         end_date = datetime.now().date()
         start_date = end_date - timedelta(days=6)
         
-        # Get raw data
-        daily_records = attendance_model.get_history({'start_date': str(start_date), 'end_date': str(end_date)})
+        # Per-day counts from the summary table (a few rows per day)
+        daily_counts = summary_model.daily_counts(start_date, end_date)
         
         # Process data
         trend_data = []
         for i in range(7):
             d = start_date + timedelta(days=i)
-            d_str = str(d)
-            
-            # Filter for this day
-            day_recs = [r for r in daily_records if r['date'] == d_str]
-            
-            present = len([r for r in day_recs if r['status'] in ['Present', 'Late']])
-            absent = len([r for r in day_recs if r['status'] == 'Absent'])
-            # Note: Absent in DB are explicit records. 
-            # If we want to count non-records as absent, we compare with total active employees.
-            # For simplicity in this visualization, we'll stick to explicit status or just Present count.
+            day = daily_counts.get(str(d))
             
+            # Finished days have explicit Absent/On Leave records (absence job),
+            # so every scheduled employee is counted once
             trend_data.append({
                 'Date': d.strftime('%a %d'),
-                'Present': present,
-                'Records': len(day_recs)
+                'Present': day['present'] if day else 0,
+                'Absent': day['absent'] if day else 0,
+                'On Leave': day['on_leave'] if day else 0,
+                'Records': day['records'] if day else 0
             })
             
         data = pd.DataFrame(trend_data)
         
         if not data.empty:
-            fig = px.bar(data, x='Date', y=['Present'], title="Daily Presence", text_auto=True)
+            fig = px.bar(data, x='Date', y=['Present', 'Absent', 'On Leave'], title="Daily Presence", text_auto=True)
             st.plotly_chart(fig, use_container_width=True)
         else:
             st.info("No data for trend chart")
         
     with c2:
         st.subheader("Department Distribution")
-        employees = employee_model.get_all(active_only=True)
-        if employees:
-            df_emp = pd.DataFrame(employees)
+        df_emp = employee_model.get_all(active_only=True, as_frame=True)
+        if df_emp is not None and not df_emp.empty:
             if 'department_name' in df_emp.columns:
                 dept_counts = df_emp['department_name'].value_counts().reset_index()
                 dept_counts.columns = ['Department', 'Count']
@@ -149,9 +157,13 @@ def render_employee_dashboard():
     col3.metric("Overtime (Month)", "2.5 Hours")
     
     st.subheader("Recent Activity")
-    history = attendance_model.get_history({'employee_id': employee_id})
-    if history:
-        df = pd.DataFrame(history)
+    rows = keyset_pager(
+        "recent_activity_pager",
+        lambda cursor: attendance_model.get_history_page({'employee_id': employee_id}, limit=HISTORY_PAGE_SIZE, after=cursor),
+        reset_on=employee_id
+    )
+    if rows:
+        df = pd.DataFrame(rows)
         st.dataframe(df[['date', 'clock_in', 'clock_out', 'status', 'total_hours']], use_container_width=True)
     else:
         st.info("No recent attendance records.")
@@ -1,7 +1,7 @@
 import streamlit as st
 import pandas as pd
 from utils.auth_utils import require_login, check_role
-from models.employee import Employee
+from models.employee import Employee, DuplicatePinError
 from models.attendance import Attendance
 from models.shift import Shift
 from utils.validators import validate_email, validate_phone
@@ -66,7 +66,14 @@ def render_employee_form():
                 current_shift_id = list(shift_options.keys())[0] if shift_options else 1
             
             shift_id = st.selectbox("Shift", options=list(shift_options.keys()), format_func=lambda x: shift_options[x], index=list(shift_options.keys()).index(current_shift_id))
-            pin = st.text_input("Kiosk PIN Code", value=emp.get('pin_code', ''))
+            rotation_options = {None: "None (fixed shift)"}
+            rotation_options.update({r['id']: r['name'] for r in Shift().get_rotations() or []})
+            current_rotation_id = emp.get('rotation_id') if emp.get('rotation_id') in rotation_options else None
+            rotation_id = st.selectbox("Shift Rotation", options=list(rotation_options.keys()), format_func=lambda x: rotation_options[x],
+                                       index=list(rotation_options.keys()).index(current_rotation_id),
+                                       help="A rotation overrides the fixed shift in the roster.")
+            pin = st.text_input("Kiosk PIN Code", type="password", max_chars=6,
+                                help="PINs are stored hashed. Leave blank to keep the current PIN." if is_edit else None)
 
         submitted = st.form_submit_button("Save Employee")
         
@@ -87,10 +94,13 @@ def render_employee_form():
                     'employee_code': employee_code,
                     'department_id': department_id,
                     'position': position,
-                    'hire_date': str(hire_date),
+                    'hire_date': str(hire_date) if hire_date else None,
                     'salary': salary,
                     'hourly_rate': hourly_rate,
-                    'status': status
+                    'status': status,
+                    'shift_id': shift_id,
+                    'rotation_id': rotation_id,
+                    'pin_code': pin
                 }
                 
                 try:
@@ -104,6 +114,8 @@ def render_employee_form():
                     st.session_state.show_employee_form = False
                     st.session_state.editing_employee = None
                     st.rerun()
+                except DuplicatePinError:
+                    st.error("PIN already in use")
                 except Exception as e:
                     st.error(f"Error saving employee: {e}")
         
@@ -124,7 +136,7 @@ def render_employee_list():
     with col_search:
         search_term = st.text_input("Search (Name, Email, Code)", placeholder="Type to search...")
 
-    employees = employee_model.get_all()
+    employees = employee_model.get_all(row_format='record')
     
     # Filtering (Client-side for MVP)
     if search_term:
@@ -1,3 +1,4 @@
+import os
 import streamlit as st
 import pandas as pd
 from datetime import datetime, time
@@ -5,6 +6,8 @@ from utils.auth_utils import require_login, check_role
 from services.attendance_service import AttendanceService
 from models.employee import Employee
 from models.attendance import Attendance
+from utils.pagination import keyset_pager, month_pager
+from config import HISTORY_PAGE_SIZE
 
 # Page Config
 st.set_page_config(page_title="Attendance", page_icon="⏰", layout="wide")
@@ -99,129 +102,115 @@ st.markdown("---")
 # --- Tabs ---
 tabs = []
 if role in ['Admin', 'Manager']:
-    tabs = ["Today's Overview", "Manual Entry", "History", "Shift Schedule"]
+    tabs = ["Today's Overview", "Manual Entry", "Bulk Import", "History", "Shift Schedule"]
 else:
     tabs = ["Today's Overview", "Calendar View", "My History", "Shift Schedule"] 
 selected_tab = st.radio("Navigation", tabs, horizontal=True)
 
 if selected_tab == "Shift Schedule":
     st.header("📅 Team Shift Schedule")
-    # Visualization of shifts
-    from models.employee import Employee
-    emp_model = Employee()
-    active_emps = emp_model.get_all(active_only=True)
+    # Read from the precomputed roster (services/roster_service.py): headcount
+    # per shift per day for the visible range, and who works on a chosen day
+    from models.shift_schedule import ShiftSchedule
+    from services.roster_service import RosterEngine
+    schedule_model = ShiftSchedule()
     
-    calendar_events = []
+    if role == 'Admin':
+        roster_engine = RosterEngine()
+        pending = roster_engine.pending()
+        through = roster_engine.generated_through()
+        c1, c2 = st.columns([3, 1])
+        c1.caption(f"Roster expanded through {through or 'never'}; {pending} employee(s) awaiting regeneration. "
+                   "Schedule `python -m services.roster_service` nightly.")
+        if c2.button("Regenerate Roster"):
+            with st.spinner("Expanding shifts..."):
+                result = roster_engine.regenerate()
+            if result is None:
+                st.error("Roster regeneration failed. See log for details.")
+            else:
+                st.success(f"Re-expanded {result['employees']} employee(s); roster runs through {result['through']}.")
     
-    today = datetime.now()
-    # Generate mock events for this month based on assigned shift
-    for e in active_emps:
-        if e.get('shift_id'):
-            # Just showing they are scheduled.
-            calendar_events.append({
-                "title": f"{e['first_name']} ({e.get('department_name', 'Gen')})",
-                "start": today.strftime("%Y-%m-%d"),
-                "end": today.strftime("%Y-%m-%d"),
-                "resourceId": e['id'],
-                "backgroundColor": "#6f42c1"
-            })
+    # The component can't report its own navigation back, so the month is
+    # chosen here and the calendar is re-mounted on it
+    start, end = month_pager('schedule_month')
+    calendar_events = [{
+        "title": f"{c.shift_name}: {c.staff}",
+        "start": c.date,
+        "allDay": True,
+        "backgroundColor": "#6f42c1"
+    } for c in schedule_model.get_coverage(start, end) or []]
             
     if calendar:
-        calendar(events=calendar_events, options={"initialView": "dayGridMonth"})
+        calendar(events=calendar_events, options={
+            "headerToolbar": {"left": "", "center": "title", "right": ""},
+            "initialView": "dayGridMonth",
+            "initialDate": str(start),
+        }, key=f"shift_schedule_calendar_{start:%Y-%m}")
     else:
         st.warning("Calendar component not available.")
+    
+    day = st.date_input("Staff on", value=datetime.now().date(), key="schedule_day")
+    day_rows = schedule_model.get_day(day) or []
+    if day_rows:
+        st.dataframe(pd.DataFrame([{
+            'Employee': f"{r.first_name} {r.last_name}",
+            'Department': r.department_name,
+            'Shift': r.shift_name,
+            'Start': r.start_time,
+            'End': r.end_time,
+        } for r in day_rows]), use_container_width=True)
+    else:
+        st.info("Nobody is scheduled on this day.")
 
 if selected_tab == "Calendar View":
     st.subheader("Attendance Calendar")
     
-    # Fetch all records for user
-    # Use current_emp_id for employee_id
-    all_recs = attendance_model.get_history({'employee_id': current_emp_id})
-    events = []
+    # Only the visible range is sent to the browser; events are cached per
+    # (employee, month) and neighbouring months are prefetched
+    from services.calendar_service import CalendarFeed
     
-    status_colors = {
-        'Present': '#28a745',
-        'Late': '#ffc107',
-        'Absent': '#dc3545',
-        'On Leave': '#17a2b8'
-    }
-    
-    for rec in all_recs:
-        color = status_colors.get(rec['status'], '#6c757d')
-        events.append({
-            "title": f"{rec['status']} ({rec['total_hours']:.2f}h)", # Format total_hours
-            "start": rec['date'],
-            "allDay": True,
-            "backgroundColor": color,
-            "borderColor": color
-        })
-        
-    # Also add Holidays
-    from models.holidays import Holiday
-    holidays = Holiday().get_all(year=datetime.now().year)
-    if holidays:
-        for h in holidays:
-            events.append({
-                "title": f"🎉 {h['name']}",
-                "start": h['date'],
-                "allDay": True,
-                "display": "background",
-                "backgroundColor": "#ffeb3b"
-            })
+    start, end = month_pager('calendar_month')
+    events = CalendarFeed(attendance_model.db.db_path).events(current_emp_id, start, end)
 
     if calendar:
+        # Month navigation is driven by month_pager above: the component can't
+        # report its own, so it is re-mounted (new key) on the chosen month
         calendar_options = {
-            "headerToolbar": {
-                "left": "today prev,next",
-                "center": "title",
-                "right": "dayGridMonth,timeGridWeek,timeGridDay",
-            },
+            "headerToolbar": {"left": "", "center": "title", "right": ""},
             "initialView": "dayGridMonth",
+            "initialDate": str(start),
         }
-        calendar(events=events, options=calendar_options)
+        calendar(events=events, options=calendar_options, key=f"attendance_calendar_{start:%Y-%m}")
 
 elif selected_tab == "Today's Overview":
     st.subheader("Today's Attendance Overview")
-    date_str = str(datetime.now().date())
+    # One LEFT JOIN with absent employees filled in, counts precomputed
+    roster = attendance_service.get_roster()
+    counts = roster['counts']
     
-    # Fetch all employees
-    employees = employee_model.get_all(active_only=True)
-    today_records = attendance_model.get_history({'start_date': date_str, 'end_date': date_str})
-    
-    # Merge data
-    data = []
-    for emp in employees:
-        record = next((r for r in today_records if r['employee_id'] == emp['id']), None)
-        status = record['status'] if record else "Absent" # Default absent if no record by now (simplified)
-        clock_in = record['clock_in'].split(' ')[1][:5] if record and record['clock_in'] else "-"
-        clock_out = record['clock_out'].split(' ')[1][:5] if record and record['clock_out'] else "-"
-        hours = f"{record['total_hours']:.2f}" if record and record['total_hours'] else "0.00"
-        
-        data.append({
-            'Employee': f"{emp['first_name']} {emp['last_name']}",
-            'Department': emp['department_name'],
-            'Status': status,
-            'Clock In': clock_in,
-            'Clock Out': clock_out,
-            'Hours': hours
-        })
-        
-    df = pd.DataFrame(data)
+    df = pd.DataFrame([{
+        'Employee': f"{r.first_name} {r.last_name}",
+        'Department': r.department_name,
+        'Status': r.status,
+        'Clock In': r.clock_in or "-",
+        'Clock Out': r.clock_out or "-",
+        'Hours': f"{r.total_hours:.2f}"
+    } for r in roster['rows']])
     
     # Coloring Status (simplified via st.dataframe)
     st.dataframe(df, use_container_width=True)
     
     c1, c2, c3 = st.columns(3)
-    c1.metric("Present", len([d for d in data if d['Status'] in ['Present', 'Late']]))
-    c2.metric("Late", len([d for d in data if d['Status'] == 'Late']))
-    c3.metric("Absent", len([d for d in data if d['Status'] == 'Absent']))
+    c1.metric("Present", counts.get('Present', 0))
+    c2.metric("Late", counts.get('Late', 0))
+    c3.metric("Absent", counts.get('Absent', 0))
 
 
 elif selected_tab == "Manual Entry":
     st.subheader("Manual Attendance Entry")
     
     with st.form("manual_attendance"):
-        employees = employee_model.get_all(active_only=True)
+        employees = employee_model.get_all(active_only=True, row_format='record')
         emp_options = {e['id']: f"{e['first_name']} {e['last_name']} ({e['employee_code']})" for e in employees}
         
         selected_emp_id = st.selectbox("Select Employee", options=list(emp_options.keys()), format_func=lambda x: emp_options[x])
@@ -261,7 +250,7 @@ elif selected_tab == "Manual Entry":
                     # Update existing
                     # Remove fields that shouldn't change generally or just overwrite?
                     # For manual entry override, we overwrite.
-                    attendance_model.update_record(existing_record['id'], data)
+                    attendance_model.update_record(existing_record['id'], data, employee_id=selected_emp_id)
                     st.success(f"Attendance record for {date} updated successfully.")
                 else:
                     # Create new
@@ -271,6 +260,30 @@ elif selected_tab == "Manual Entry":
             except Exception as e:
                 st.error(f"Error saving record: {e}")
 
+elif selected_tab == "Bulk Import":
+    st.subheader("Import Time-Clock Export")
+    st.caption("CSV or Excel with one row per employee and day: employee_code, date, clock_in "
+               "(optional: clock_out, status, notes). Existing records for the same day are overwritten.")
+    
+    upload = st.file_uploader("Export file", type=["csv", "xlsx"])
+    if upload and st.button("Import", type="primary"):
+        from services.import_service import AttendanceImporter
+        with st.spinner("Importing..."):
+            result = AttendanceImporter().import_file(upload, upload.name)
+        
+        c1, c2, c3 = st.columns(3)
+        c1.metric("Rows", result['rows'])
+        c2.metric("Imported", result['imported'])
+        c3.metric("Rejected", result['rejected'])
+        
+        if result['error_report']:
+            st.warning(f"{result['rejected']} row(s) were rejected.")
+            st.dataframe(pd.DataFrame(result['errors']), use_container_width=True)
+            with open(result['error_report'], 'rb') as f:
+                st.download_button("Download Error Report", f, file_name=os.path.basename(result['error_report']), mime="text/csv")
+        else:
+            st.success("All rows imported.")
+
 elif selected_tab == "History" or selected_tab == "My History":
     st.subheader("Attendance History")
     
@@ -289,9 +302,14 @@ elif selected_tab == "History" or selected_tab == "My History":
         # TODO: Filter by department
         pass
         
-    history = attendance_model.get_history(filters)
-    if history:
-        df = pd.DataFrame(history)
+    # One screen at a time, sorted and cut by the database
+    rows = keyset_pager(
+        "history_pager",
+        lambda cursor: attendance_model.get_history_page(filters, limit=HISTORY_PAGE_SIZE, after=cursor),
+        reset_on=tuple(sorted(filters.items()))
+    )
+    if rows:
+        df = pd.DataFrame(rows)
         st.dataframe(df[['date', 'first_name', 'last_name', 'clock_in', 'clock_out', 'status', 'total_hours']], use_container_width=True)
     else:
         st.info("No records found for selected period.")
@@ -4,6 +4,9 @@ import plotly.express as px
 from datetime import datetime, timedelta
 from utils.auth_utils import require_login, check_role
 from models.attendance import Attendance
+from models.attendance_summary import AttendanceSummary
+from utils.pagination import keyset_pager
+from config import HISTORY_PAGE_SIZE
 from models.employee import Employee
 from models.leave import LeaveRequest
 import io
@@ -20,9 +23,24 @@ check_role(['Admin', 'Manager'])
 st.title("📊 Reports & Analytics")
 
 attendance_model = Attendance()
+summary_model = AttendanceSummary()
 employee_model = Employee()
 leave_model = LeaveRequest()
 
+# Data source: the live database or a read-only backup snapshot, so heavy
+# reports can run without touching the database the kiosks write to
+from database import backup
+snapshots = backup.list_snapshots()
+report_db = None
+if snapshots:
+    source = st.selectbox("Data Source", ["Live database"] + [s['name'] for s in snapshots])
+    if source != "Live database":
+        snapshot = next(s for s in snapshots if s['name'] == source)
+        report_db = backup.open_snapshot(snapshot['path'])
+        attendance_model.db = report_db
+        summary_model.db = report_db
+        st.caption(f"📦 Reading from snapshot taken {snapshot['created']:%Y-%m-%d %H:%M} (read-only)")
+
 # Tabs
 tabs = ["Daily Report", "Monthly Report", "Overtime Report", "Advanced Analytics"]
 selected_tab = st.radio("Report Type", tabs, horizontal=True)
@@ -34,23 +52,40 @@ def get_date_range():
     e = col2.date_input("End Date", value=datetime.now())
     return s, e
 
-if selected_tab in ["Daily Report", "Monthly Report", "Overtime Report"]:
+if selected_tab == "Daily Report":
+    
+    start_date, end_date = get_date_range()
+    filters = {'start_date': str(start_date), 'end_date': str(end_date)}
+    
+    # Paged straight from the history index: one screen per query
+    rows = keyset_pager(
+        "daily_report_pager",
+        lambda cursor: attendance_model.get_history_page(filters, limit=HISTORY_PAGE_SIZE, after=cursor),
+        reset_on=(filters['start_date'], filters['end_date'], source if snapshots else None)
+    )
+    if rows:
+        df = pd.DataFrame(rows)
+        st.dataframe(df[['date', 'first_name', 'last_name', 'department_name', 'status', 'clock_in', 'clock_out', 'total_hours']], use_container_width=True)
+    else:
+        st.info("No records found.")
+
+elif selected_tab in ["Monthly Report", "Overtime Report"]:
     
     start_date, end_date = get_date_range()
     
     if st.button("Generate Report", type="primary"):
         with st.spinner("Generating..."):
-            raw_data = attendance_model.get_history({'start_date': str(start_date), 'end_date': str(end_date)})
+            if selected_tab == "Overtime Report":
+                # Department totals come straight from the daily summary
+                df = summary_model.get_range(start_date, end_date, as_frame=True)
+            else:
+                df = attendance_model.get_history({'start_date': str(start_date), 'end_date': str(end_date)}, as_frame=True)
             
-            if raw_data:
-                df = pd.DataFrame(raw_data)
+            if df is not None and not df.empty:
                 
-                if selected_tab == "Daily Report":
-                    st.dataframe(df[['date', 'first_name', 'last_name', 'department_name', 'status', 'clock_in', 'clock_out', 'total_hours']], use_container_width=True)
-                    
-                elif selected_tab == "Monthly Summary":
-                    summary = df.groupby(['employee_id', 'first_name', 'last_name', 'department_name']).agg(
-                        Days=('date', 'count'),
+                if selected_tab == "Monthly Report":
+                    summary = df.groupby(['employee_id', 'first_name', 'last_name', 'department_name'], observed=True).agg(
+                        Days=('clock_in', 'count'),  # days worked; Absent/On Leave records have no clock_in
                         Hours=('total_hours', 'sum'),
                         OT=('overtime_hours', 'sum')
                     ).reset_index()
@@ -60,7 +95,7 @@ if selected_tab in ["Daily Report", "Monthly Report", "Overtime Report"]:
                     st.plotly_chart(fig, use_container_width=True)
                     
                 elif selected_tab == "Overtime Report":
-                    ot_summary = df.groupby(['department_name'])['overtime_hours'].sum().reset_index()
+                    ot_summary = df.groupby(['department_name'], observed=True)['overtime_hours'].sum().reset_index()
                     st.dataframe(ot_summary, use_container_width=True)
                     
                     fig_ot = px.pie(ot_summary, values='overtime_hours', names='department_name', title='Overtime Share by Department')
@@ -72,22 +107,13 @@ if selected_tab in ["Daily Report", "Monthly Report", "Overtime Report"]:
 elif selected_tab == "Advanced Analytics":
     st.subheader("📈 Workforce Insights (Last 30 Days)")
     
-    # Needs data: All attendance records with dept info
-    from database.db_manager import DBManager
-    db = DBManager()
-    
-    # 30 day Lookback
-    query = """
-    SELECT a.*, e.first_name, e.last_name, d.name as dept_name
-    FROM attendance a
-    JOIN employees e ON a.employee_id = e.id
-    LEFT JOIN departments d ON e.department_id = d.id
-    WHERE a.date >= date('now', '-30 days')
-    """
-    data = db.execute_query(query, fetch_all=True)
+    # Daily summary rows (date x department x status) for the last 30 days
+    today = datetime.now().date()
+    df = summary_model.get_range(today - timedelta(days=30), today, as_frame=True)
+    if df is not None:
+        df = df.rename(columns={'department_name': 'dept_name'})
     
-    if data:
-        df = pd.DataFrame(data)
+    if df is not None and not df.empty:
         
         # Row 1: Overtime & Lateness
         c1, c2 = st.columns(2)
@@ -95,7 +121,7 @@ elif selected_tab == "Advanced Analytics":
         with c1:
             st.markdown("##### 🏢 Overtime by Department")
             if 'overtime_hours' in df.columns:
-                ot_by_dept = df.groupby('dept_name')['overtime_hours'].sum().reset_index()
+                ot_by_dept = df.groupby('dept_name', observed=True)['overtime_hours'].sum().reset_index()
                 fig_ot = px.bar(ot_by_dept, x='dept_name', y='overtime_hours', color='dept_name')
                 st.plotly_chart(fig_ot, use_container_width=True)
             else:
@@ -107,7 +133,7 @@ elif selected_tab == "Advanced Analytics":
             # Ideally we have 'status' column. If not, we might need to rely on business logic.
             # Assuming 'status' column is present from get_history query or raw table if updated.
             # Let's check status distribution
-            status_trend = df.groupby(['date', 'status']).size().reset_index(name='count')
+            status_trend = df.groupby(['date', 'status'], observed=True)['records'].sum().reset_index(name='count')
             if not status_trend.empty:
                fig_trend = px.line(status_trend, x='date', y='count', color='status', markers=True)
                st.plotly_chart(fig_trend, use_container_width=True)
@@ -116,12 +142,11 @@ elif selected_tab == "Advanced Analytics":
 
         # Row 2: Day of Week
         st.markdown("##### 📅 Lateness by Day of Week")
-        df['date_obj'] = pd.to_datetime(df['date'])
-        df['day_name'] = df['date_obj'].dt.day_name()
+        df['day_name'] = df['date'].dt.day_name()  # already parsed by query_frame
         
         late_only = df[df['status'] == 'Late']
         if not late_only.empty:
-            dow_counts = late_only['day_name'].value_counts().reindex(
+            dow_counts = late_only.groupby('day_name')['records'].sum().reindex(
                 ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday']
             ).fillna(0).reset_index()
             dow_counts.columns = ['Day', 'Late Count']
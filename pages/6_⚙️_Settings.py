@@ -1,5 +1,6 @@
 import streamlit as st
 import pandas as pd
+from datetime import datetime
 from utils.auth_utils import require_login, check_role
 from models.settings import SettingsModel
 from models.user import User
@@ -18,7 +19,7 @@ st.title("⚙️ System Settings")
 settings_model = SettingsModel()
 # user_model removed as moved to separate page
 
-tabs = ["System Config", "Departments", "Leave Types", "Public Holidays", "Branding", "Shifts"]
+tabs = ["System Config", "Departments", "Leave Types", "Public Holidays", "Branding", "Shifts", "Sites", "Backups"]
 selected_tab = st.radio("Navigation", tabs, horizontal=True)
 
 if selected_tab == "System Config":
@@ -34,6 +35,23 @@ if selected_tab == "System Config":
                 st.success("Updated")
                 st.rerun()
 
+    st.subheader("Recompute Work Hours")
+    st.caption("Re-applies the work_hours setting to existing records, e.g. after changing it.")
+    with st.form("recompute_hours"):
+        c1, c2 = st.columns(2)
+        r_start = c1.date_input("From", value=datetime.now().date().replace(day=1))
+        r_end = c2.date_input("To", value=datetime.now().date())
+        if st.form_submit_button("Recompute"):
+            from services.hours_service import HoursRecomputer
+            with st.spinner("Recomputing..."):
+                result = HoursRecomputer().recompute_period(r_start, r_end)
+            if result is None:
+                st.error("Recompute failed. See log for details.")
+            else:
+                st.success(f"{result['scanned']} record(s) checked, {result['updated']} updated.")
+                if result['failed']:
+                    st.warning(f"{result['failed']} record(s) could not be updated.")
+
 elif selected_tab == "Public Holidays":
     from models.holidays import Holiday
     from datetime import datetime
@@ -111,17 +129,138 @@ elif selected_tab == "Shifts":
         s_start = c2.time_input("Start Time")
         s_end = c3.time_input("End Time")
         s_grace = c4.number_input("Grace Period (mins)", value=15)
+        # Keys are strftime('%w') digits, as stored in shifts.work_days
+        day_names = {'1': 'Mon', '2': 'Tue', '3': 'Wed', '4': 'Thu', '5': 'Fri', '6': 'Sat', '0': 'Sun'}
+        s_days = st.multiselect("Work Days", list(day_names), default=['1', '2', '3', '4', '5'],
+                                format_func=day_names.get)
         
         if st.form_submit_button("Add Shift"):
-            if s_name:
-                shift_model.create(s_name, str(s_start), str(s_end), s_grace)
+            if s_name and s_days:
+                shift_model.create(s_name, str(s_start), str(s_end), s_grace, ''.join(s_days))
                 st.success("Shift Added")
                 st.rerun()
+            elif not s_days:
+                st.error("Select at least one work day")
                 
     shifts = shift_model.get_all()
     if shifts:
         st.dataframe(pd.DataFrame(shifts), use_container_width=True)
 
+    st.subheader("Shift Rotations")
+    st.caption("One entry per day of the cycle, starting on the anchor date: a shift ID, or 'off'.")
+    with st.form("add_rotation"):
+        c1, c2, c3 = st.columns([1, 1, 2])
+        r_name = c1.text_input("Rotation Name (e.g. 4 on 4 off)")
+        r_anchor = c2.date_input("Anchor Date")
+        r_pattern = c3.text_input("Pattern", placeholder="1, 1, 2, 2, off, off")
+        
+        if st.form_submit_button("Add Rotation"):
+            shift_ids = {s['id'] for s in shifts or []}
+            tokens = [t.strip().lower() for t in r_pattern.split(',') if t.strip()]
+            pattern = [None if t == 'off' else int(t) if t.isdigit() else t for t in tokens]
+            invalid = [t for t in pattern if t is not None and t not in shift_ids]
+            if not r_name or not pattern:
+                st.error("Name and pattern required")
+            elif invalid:
+                st.error(f"Unknown shift(s): {', '.join(map(str, invalid))}")
+            elif shift_model.create_rotation(r_name, r_anchor, pattern):
+                st.success("Rotation Added")
+                st.rerun()
+            else:
+                st.error("Could not add rotation (maybe duplicate name)")
+    
+    rotations = shift_model.get_rotations()
+    if rotations:
+        st.dataframe(pd.DataFrame(rotations), use_container_width=True)
+
+elif selected_tab == "Sites":
+    from models.site import Site
+    from services.geofence_service import GeofenceScanner
+    site_model = Site()
+    
+    st.subheader("Work Sites")
+    st.caption("Clock-ins with a location are classified on-site or off-site against these geofences.")
+    
+    with st.form("add_site"):
+        c1, c2, c3, c4 = st.columns(4)
+        site_name = c1.text_input("Site Name")
+        site_lat = c2.number_input("Latitude", min_value=-90.0, max_value=90.0, value=0.0, format="%.6f")
+        site_lon = c3.number_input("Longitude", min_value=-180.0, max_value=180.0, value=0.0, format="%.6f")
+        site_radius = c4.number_input("Radius (m)", min_value=10, value=200)
+        site_polygon = st.text_input("Polygon (optional)", placeholder="lat,lon; lat,lon; lat,lon",
+                                     help="Vertices of the site outline; when given, it is used instead of the radius.")
+        
+        if st.form_submit_button("Add Site"):
+            try:
+                polygon = [tuple(float(v) for v in p.split(',')) for p in site_polygon.split(';') if p.strip()]
+            except ValueError:
+                polygon = None
+                st.error("Polygon must be 'lat,lon' pairs separated by ';'")
+            else:
+                if polygon and (len(polygon) < 3 or any(len(p) != 2 for p in polygon)):
+                    st.error("A polygon needs at least 3 'lat,lon' vertices")
+                elif not site_name:
+                    st.error("Name required")
+                elif site_model.create(site_name, site_lat, site_lon, site_radius, polygon or None):
+                    st.success("Site Added")
+                    st.rerun()
+                else:
+                    st.error("Could not add site (maybe duplicate name)")
+    
+    sites = site_model.get_all()
+    if sites:
+        for s in sites:
+            c1, c2, c3 = st.columns([4, 1, 1])
+            shape = "polygon" if s['polygon'] else f"{s['radius_m']:.0f} m radius"
+            c1.write(f"**{s['name']}** ({s['latitude']:.5f}, {s['longitude']:.5f}), {shape}"
+                     + ("" if s['is_active'] else " *(inactive)*"))
+            if c2.button("Deactivate" if s['is_active'] else "Activate", key=f"site_toggle_{s['id']}"):
+                site_model.set_active(s['id'], not s['is_active'])
+                st.rerun()
+            if c3.button("Delete", key=f"site_del_{s['id']}"):
+                site_model.delete(s['id'])
+                st.rerun()
+    
+    st.subheader("Off-site Punches")
+    c1, c2 = st.columns(2)
+    scan_start = c1.date_input("From", value=datetime.now().date().replace(day=1), key="geo_start")
+    scan_end = c2.date_input("To", value=datetime.now().date(), key="geo_end")
+    scanner = GeofenceScanner()
+    if st.button("Re-check Punches", help="Re-classify stored punches, e.g. after adding or moving a site"):
+        with st.spinner("Scanning..."):
+            result = scanner.scan(scan_start, scan_end)
+        if result is None:
+            st.error("Scan failed. See log for details.")
+        else:
+            st.success(f"{result['scanned']} punch(es) checked: {result['off_site']} off-site, {result['updated']} updated.")
+    offsite = scanner.get_offsite(scan_start, scan_end)
+    if offsite:
+        st.dataframe(pd.DataFrame(offsite), use_container_width=True)
+    else:
+        st.info("No off-site punches in this range.")
+
+elif selected_tab == "Backups":
+    from database import backup
+    
+    st.subheader("Database Backups")
+    st.info("Snapshots are taken online with the SQLite backup API, so clock-ins keep working while they run. "
+            "Schedule `python -m database.backup` nightly for automatic rotation.")
+    
+    if st.button("Create Snapshot Now", type="primary"):
+        with st.spinner("Backing up..."):
+            path = backup.backup()
+        if path:
+            st.success(f"Snapshot saved: {path}")
+        else:
+            st.error("Backup failed. Check the server log.")
+    
+    snapshots = backup.list_snapshots()
+    if snapshots:
+        df = pd.DataFrame(snapshots)[['name', 'created', 'size_mb']]
+        st.dataframe(df, use_container_width=True, hide_index=True)
+    else:
+        st.write("No snapshots yet.")
+
 elif selected_tab == "Departments":
     st.subheader("Department Management")
     
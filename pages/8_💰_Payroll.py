@@ -82,9 +82,8 @@ if 'payroll_generated' in st.session_state and st.session_state.payroll_generate
         # Get Budgets
         from database.db_manager import DBManager
         db = DBManager()
-        depts_db = db.execute_query("SELECT name, budget FROM departments", fetch_all=True)
-        if depts_db:
-            df_budgets = pd.DataFrame(depts_db)
+        df_budgets = db.query_frame("SELECT name, budget FROM departments", dtypes={'budget': 'float64'})
+        if df_budgets is not None and not df_budgets.empty:
             df_budgets['budget'] = df_budgets['budget'].fillna(0)
             
             # Merge
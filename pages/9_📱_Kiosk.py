@@ -1,7 +1,7 @@
 import streamlit as st
 from datetime import datetime
 from services.attendance_service import AttendanceService
-from models.employee import Employee
+from services.pin_service import get_pin_resolver
 from utils.auth_utils import render_sidebar # Still needed? Kiosk usually hides this
 import time
 
@@ -9,6 +9,7 @@ import time
 st.set_page_config(page_title="Kiosk Clock-In", page_icon="📱", layout="centered", initial_sidebar_state="collapsed")
 
 # Kiosk specific CSS to hide things
+st.markdown("""
 <style>
     [data-testid="stSidebar"] {display: none;}
     /* Hide anchors - Aggressive */
@@ -20,7 +21,7 @@ st.set_page_config(page_title="Kiosk Clock-In", page_icon="📱", layout="center
 """, unsafe_allow_html=True)
 
 att_service = AttendanceService()
-emp_model = Employee()
+pin_resolver = get_pin_resolver(att_service.attendance_model.db.db_path)
 
 with st.container():
     st.title("📱 Work Attendance Kiosk")
@@ -37,11 +38,11 @@ with st.container():
         if not pin:
             st.error("PIN Required")
         else:
-            emp = emp_model.db.execute_query("SELECT id, first_name, last_name FROM employees WHERE pin_code = ?", (pin,), fetch_one=True)
+            emp = pin_resolver.resolve(pin)
             if emp:
-                success, msg = att_service.clock_in(emp['id'])
+                success, msg = att_service.clock_in(emp.id)
                 if success:
-                    st.success(f"Welcome, {emp['first_name']}! {msg}")
+                    st.success(f"Welcome, {emp.first_name}! {msg}")
                     time.sleep(2)
                     st.rerun()
                 else:
@@ -53,11 +54,11 @@ with st.container():
         if not pin:
             st.error("PIN Required")
         else:
-            emp = emp_model.db.execute_query("SELECT id, first_name FROM employees WHERE pin_code = ?", (pin,), fetch_one=True)
+            emp = pin_resolver.resolve(pin)
             if emp:
-                success, msg = att_service.clock_out(emp['id'])
+                success, msg = att_service.clock_out(emp.id)
                 if success:
-                    st.success(f"Goodbye, {emp['first_name']}! {msg}")
+                    st.success(f"Goodbye, {emp.first_name}! {msg}")
                     time.sleep(2)
                     st.rerun()
                 else:
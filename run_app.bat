@@ -42,7 +42,7 @@ REM Run Database Migrations (Sequentially to ensure latest schema)
 echo [INFO] Verification Database Schema...
 python initialize_db.py >nul 2>&1
 python seed_data.py >nul 2>&1
-REM (Add any future migration scripts here)
+REM (Schema migrations in database\migrations are applied by initialize_db.py)
 
 echo ===================================================
 echo ✅ Setup Complete! Launching App...
@@ -18,14 +18,11 @@ def seed():
         ('Sales', 30000), 
         ('Marketing', 20000)
     ]
-    dept_ids = {}
-    for name, budget in depts:
-        try:
-            db.execute_query("INSERT OR IGNORE INTO departments (name, budget) VALUES (?, ?)", (name, budget))
-            res = db.execute_query("SELECT id FROM departments WHERE name = ?", (name,), fetch_one=True)
-            dept_ids[name] = res['id']
-        except Exception:
-            pass
+    db.bulk_insert('departments', ['name', 'budget'], depts, or_ignore=True)
+    dept_ids = {
+        d['name']: d['id']
+        for d in db.execute_query("SELECT id, name FROM departments", fetch_all=True) or []
+    }
 
     # 2. Users & Employees from credentials.txt
     # (Based on the list I saw in step 799)
@@ -52,10 +49,6 @@ def seed():
         
         if not existing:
             print(f"Creating user: {username} ({role})")
-            # Create User
-            user_id = auth.register_user(username, password, role)
-            
-            # Create Employee Profile (for non-admins, or link admin too)
             # Generate fake data
             code = f"EMP{random.randint(1000,9999)}"
             emp_data = {
@@ -75,13 +68,14 @@ def seed():
                 'pin_code': str(random.randint(1000, 9999))
             }
             
-            # Direct insert via model to handle linking
+            # User, employee profile and link commit together or not at all
             try:
-                emp_model.create_employee(emp_data)
-                # Link
-                new_emp = db.execute_query("SELECT id FROM employees WHERE employee_code = ?", (code,), fetch_one=True)
-                if new_emp:
-                    db.execute_query("UPDATE users SET employee_id = ? WHERE id = ?", (new_emp['id'], user_id))
+                with db.transaction():
+                    user_id = auth.create_user(username, password, role)
+                    if not user_id:
+                        raise RuntimeError("user creation failed")
+                    emp_id = emp_model.create_employee(emp_data)
+                    db.execute_query("UPDATE users SET employee_id = ? WHERE id = ?", (emp_id, user_id))
             except Exception as e:
                 print(f"Failed to create employee for {username}: {e}")
         else:
@@ -0,0 +1,158 @@
+"""
+End-of-day absence materialization.
+
+Until a day is materialized, "Absent" is only implied by a missing record.
+materialize_day() makes it explicit: one INSERT ... SELECT writes an
+'Absent' or 'On Leave' record for every active employee who was scheduled
+that day and has no record. Scheduled means a shift_schedule slot, else a
+rotation workday, else (employees without a rotation) a shift work_day;
+never a public holiday or before the hire date. Existing records are never touched (ON CONFLICT DO NOTHING), so a
+rerun is harmless. The summary triggers count the new rows, so attendance
+rates become plain reads of daily_attendance_summary.
+
+Days are only materialized once they are over; a record written for today
+would turn a late clock-in into "Already clocked in". The last day done is
+kept in system_settings ('absences_through'), and a run catches up on
+every day since.
+
+CLI (schedule nightly after midnight, e.g. cron or Windows Task Scheduler):
+    python -m services.absence_service              # catch up through yesterday
+    python -m services.absence_service --start 2024-06-01 --end 2024-06-30
+"""
+import argparse
+import logging
+from datetime import date, datetime, timedelta
+from database.db_manager import DBManager
+from models.calendar_cache import get_calendar_cache
+
+logger = logging.getLogger(__name__)
+
+PROGRESS_KEY = 'absences_through'
+AUTO_NOTE = 'Auto: no punch recorded'
+
+MATERIALIZE_QUERY = """
+INSERT INTO attendance (employee_id, date, status, break_duration, total_hours, regular_hours,
+                        overtime_hours, notes, is_approved)
+SELECT e.id, :date,
+       CASE WHEN EXISTS (
+           SELECT 1 FROM leave_requests lr
+           WHERE lr.employee_id = e.id AND lr.status = 'Approved'
+             AND lr.start_date <= :date AND lr.end_date >= :date
+       ) THEN 'On Leave' ELSE 'Absent' END,
+       0, 0.0, 0.0, 0.0, :note, 1
+FROM employees e
+LEFT JOIN shifts s ON s.id = e.shift_id
+WHERE e.status = 'Active'
+  AND (e.hire_date IS NULL OR e.hire_date <= :date)
+  AND NOT EXISTS (SELECT 1 FROM public_holidays h WHERE h.date = :date)
+  AND (
+      -- the day's roster slot decides when there is one
+      EXISTS (SELECT 1 FROM shift_schedule ss WHERE ss.employee_id = e.id AND ss.date = :date)
+      -- rotation workdays without a slot (leave days, days before the roster was built)
+      OR EXISTS (
+          SELECT 1 FROM shift_rotations r
+          JOIN shift_rotation_slots rs ON rs.rotation_id = r.id
+          WHERE r.id = e.rotation_id
+            AND rs.day_index = ((CAST(julianday(:date) - julianday(r.anchor_date) AS INTEGER) % r.cycle_days)
+                                + r.cycle_days) % r.cycle_days
+      )
+      OR (e.rotation_id IS NULL AND instr(COALESCE(s.work_days, :default_days), strftime('%w', :date)) > 0)
+  )
+ON CONFLICT (employee_id, date) DO NOTHING
+RETURNING status
+"""
+
+
+class AbsenceMaterializer:
+    def __init__(self):
+        self.db = DBManager()
+
+    def default_work_days(self):
+        """Working days for employees without a shift, from the 'work_days' setting (Monday first)"""
+        row = self.db.execute_query("SELECT value FROM system_settings WHERE key = 'work_days'", fetch_one=True)
+        try:
+            count = min(7, max(0, int(row['value']))) if row else 5
+        except (TypeError, ValueError):
+            count = 5
+        return ''.join(str(day % 7) for day in range(1, count + 1))
+
+    def materialized_through(self):
+        """Last materialized date, or None if the job has never run"""
+        row = self.db.execute_query("SELECT value FROM system_settings WHERE key = ?", (PROGRESS_KEY,), fetch_one=True)
+        return date.fromisoformat(row['value']) if row and row['value'] else None
+
+    def materialize_day(self, day, default_days=None):
+        """
+        Write Absent/On Leave records for one finished day.
+        Returns {'Absent': n, 'On Leave': n}; raises on database errors.
+        """
+        params = {
+            'date': str(day),
+            'note': AUTO_NOTE,
+            'default_days': default_days if default_days is not None else self.default_work_days(),
+        }
+        counts = {'Absent': 0, 'On Leave': 0}
+        with self.db.transaction(immediate=True):
+            for row in self.db.execute_query(MATERIALIZE_QUERY, params, fetch_all=True):
+                counts[row['status']] += 1
+            self.db.execute_query(
+                "INSERT INTO system_settings (key, value, description) VALUES (?, ?, ?) "
+                "ON CONFLICT (key) DO UPDATE SET value = excluded.value "
+                "WHERE excluded.value > COALESCE(system_settings.value, '')",
+                (PROGRESS_KEY, str(day), 'Last day with absences materialized')
+            )
+        return counts
+
+    def run(self, start_date=None, end_date=None):
+        """
+        Materialize start_date..end_date, capped at yesterday. Without
+        start_date, resumes after the last materialized day (yesterday only on
+        the first run). Returns {date: counts} for the days processed, or
+        None if a day failed (earlier days stay committed).
+        """
+        yesterday = datetime.now().date() - timedelta(days=1)
+        end = min(date.fromisoformat(str(end_date)), yesterday) if end_date else yesterday
+        if start_date:
+            start = date.fromisoformat(str(start_date))
+        else:
+            done = self.materialized_through()
+            start = done + timedelta(days=1) if done else yesterday
+
+        default_days = self.default_work_days()
+        results = {}
+        failed = False
+        day = start
+        while day <= end:
+            try:
+                results[str(day)] = self.materialize_day(day, default_days)
+            except Exception as e:
+                logger.error(f"Absence materialization for {day} failed: {e}")
+                failed = True
+                break
+            day += timedelta(days=1)
+        if results:
+            get_calendar_cache(self.db.db_path).invalidate()
+        if failed:
+            return None
+        if results:
+            logger.info(f"Materialized absences {start}..{end}: {results}")
+        return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Write Absent/On Leave records for finished days")
+    parser.add_argument('--start', help="first date (YYYY-MM-DD); default: day after the last run")
+    parser.add_argument('--end', help="last date (YYYY-MM-DD); default and maximum: yesterday")
+    args = parser.parse_args()
+
+    results = AbsenceMaterializer().run(args.start, args.end)
+    if results is None:
+        raise SystemExit("Absence materialization failed. See log for details.")
+    for day, counts in results.items():
+        print(f"{day}: {counts['Absent']} absent, {counts['On Leave']} on leave")
+    if not results:
+        print("Nothing to do: already up to date.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,335 @@
+"""
+Streaming attendance anomaly detection.
+
+AnomalyDetector reads attendance in (updated_at, id) order from the last
+high-water mark ('anomalies_through' in system_settings) in keyset chunks,
+so a run costs what changed since the previous one, not the whole table.
+Each record is checked on its own for:
+
+  * Missing clock-out: clocked in, but no clock-out ANOMALY_CLOCK_OUT_GRACE_HOURS
+    after the shift (or the day) ended. Punches still in progress wait in
+    attendance_anomaly_pending and are flagged at the end of the run that
+    passes their deadline;
+  * Long day: ANOMALY_LONG_DAY_HOURS or more between clock-in and clock-out;
+  * Outside shift: a punch more than ANOMALY_SHIFT_TOLERANCE_MINUTES outside
+    the day's shift_schedule slot, or the assigned shift without one;
+
+and against bounded per-employee state (attendance_anomaly_state) for:
+
+  * Repeated lateness: ANOMALY_LATE_COUNT late arrivals within
+    ANOMALY_LATE_WINDOW_DAYS. The last LATE_HISTORY late days are kept, in
+    date order, so records arriving out of date order still count.
+
+Findings go to attendance_anomalies, one per (record, kind); a record that
+no longer shows an anomaly has its open finding removed. A chunk's
+findings, state and high-water mark commit together, and re-reading a
+record changes nothing, so each run starts a little before the mark, like
+services/pin_service.py.
+
+CLI (schedule every few minutes or nightly, e.g. cron or Windows Task Scheduler):
+    python -m services.anomaly_service
+    python -m services.anomaly_service --full   # rebuild state from all attendance
+"""
+import argparse
+import bisect
+import json
+import logging
+from datetime import date, datetime, time, timedelta
+from config import (DB_BULK_CHUNK_SIZE, ANOMALY_LONG_DAY_HOURS, ANOMALY_LATE_COUNT, ANOMALY_LATE_WINDOW_DAYS,
+                    ANOMALY_SHIFT_TOLERANCE_MINUTES, ANOMALY_CLOCK_OUT_GRACE_HOURS)
+from database.db_manager import DBManager
+from models.shift_cache import get_shift_cache
+
+logger = logging.getLogger(__name__)
+
+PROGRESS_KEY = 'anomalies_through'
+
+# Re-read rows changed this long before the mark, so a write that committed
+# late with an older updated_at is still picked up
+SCAN_OVERLAP = timedelta(seconds=60)
+
+LATE_HISTORY = 32  # late days kept per employee
+
+MISSING_CLOCK_OUT = 'Missing clock-out'
+LONG_DAY = 'Long day'
+OUTSIDE_SHIFT = 'Outside shift'
+REPEATED_LATENESS = 'Repeated lateness'
+RECORD_KINDS = (MISSING_CLOCK_OUT, LONG_DAY, OUTSIDE_SHIFT)
+KINDS = RECORD_KINDS + (REPEATED_LATENESS,)
+
+_TS_FORMAT = '%Y-%m-%d %H:%M:%S'
+
+SCAN_QUERY = """
+SELECT a.id, a.employee_id, a.date, a.clock_in, a.clock_out, a.status, a.updated_at,
+       ss.start_at, ss.end_at
+FROM attendance a
+LEFT JOIN shift_schedule ss ON ss.employee_id = a.employee_id AND ss.date = a.date
+WHERE (a.updated_at, a.id) > (?, ?)
+ORDER BY a.updated_at, a.id
+LIMIT ?
+"""
+
+UPSERT_FINDING = """
+INSERT INTO attendance_anomalies (attendance_id, employee_id, date, kind, detail) VALUES (?, ?, ?, ?, ?)
+ON CONFLICT (attendance_id, kind) DO UPDATE SET date = excluded.date, detail = excluded.detail
+WHERE detail IS NOT excluded.detail OR date IS NOT excluded.date
+"""
+
+# Resolved findings are kept as history even if the record changes
+CLEAR_FINDING = "DELETE FROM attendance_anomalies WHERE attendance_id = ? AND kind = ? AND resolved_at IS NULL"
+
+FLAG_OVERDUE = """
+INSERT INTO attendance_anomalies (attendance_id, employee_id, date, kind, detail)
+SELECT attendance_id, employee_id, date, ?, 'No clock-out by ' || strftime('%Y-%m-%d %H:%M', deadline)
+FROM attendance_anomaly_pending WHERE deadline <= ?
+ON CONFLICT (attendance_id, kind) DO NOTHING
+"""
+
+
+def _ts(value):
+    if value is None or isinstance(value, datetime):
+        return value
+    return datetime.fromisoformat(str(value))
+
+
+class AnomalyDetector:
+    def __init__(self, chunk_size=DB_BULK_CHUNK_SIZE):
+        self.db = DBManager()
+        self.shift_cache = get_shift_cache(self.db.db_path)
+        self.chunk_size = chunk_size
+        self.long_day_hours = ANOMALY_LONG_DAY_HOURS
+        self.late_count = ANOMALY_LATE_COUNT
+        self.late_window = timedelta(days=ANOMALY_LATE_WINDOW_DAYS - 1)
+        self.tolerance = timedelta(minutes=ANOMALY_SHIFT_TOLERANCE_MINUTES)
+        self.grace = timedelta(hours=ANOMALY_CLOCK_OUT_GRACE_HOURS)
+        self._late = {}  # employee id -> late history, for the current run
+
+    def processed_through(self):
+        """updated_at of the last record processed, or None if never run"""
+        row = self.db.execute_query("SELECT value FROM system_settings WHERE key = ?", (PROGRESS_KEY,), fetch_one=True)
+        return row['value'] if row and row['value'] else None
+
+    def _shift_window(self, row, day):
+        """(start, end) of the shift the record belongs to, or None"""
+        if row['start_at']:
+            return _ts(row['start_at']), _ts(row['end_at'])
+        _, shift = self.shift_cache.shift_for(row['employee_id'])
+        if shift is None:
+            return None
+        try:
+            start = datetime.combine(day, time.fromisoformat(shift.start_time))
+            end = datetime.combine(day, time.fromisoformat(shift.end_time))
+        except (TypeError, ValueError):
+            return None
+        if end <= start:
+            end += timedelta(days=1)  # overnight shift
+        return start, end
+
+    def _check(self, row, now):
+        """
+        Record-level anomalies: ({kind: detail}, pending clock-out deadline or None)
+        """
+        findings = {}
+        clock_in, clock_out = _ts(row['clock_in']), _ts(row['clock_out'])
+        if clock_in is None:
+            return findings, None
+        day = date.fromisoformat(str(row['date'])[:10])
+        window = self._shift_window(row, day)
+
+        deadline = None
+        if clock_out is None:
+            ends = window[1] if window else datetime.combine(day + timedelta(days=1), time())
+            deadline = max(ends, clock_in) + self.grace
+            if deadline <= now:
+                findings[MISSING_CLOCK_OUT] = f"No clock-out by {deadline:%Y-%m-%d %H:%M}"
+                deadline = None
+        else:
+            hours = (clock_out - clock_in).total_seconds() / 3600
+            if hours >= self.long_day_hours:
+                findings[LONG_DAY] = f"{hours:.1f} h between clock-in and clock-out"
+
+        if window:
+            start, end = window
+            outside = []
+            if clock_in < start - self.tolerance or clock_in > end:
+                outside.append(f"clock-in {clock_in:%H:%M}")
+            if clock_out is not None and (clock_out > end + self.tolerance or clock_out < start):
+                outside.append(f"clock-out {clock_out:%H:%M}")
+            if outside:
+                findings[OUTSIDE_SHIFT] = f"{' and '.join(outside)} outside shift {start:%H:%M}-{end:%H:%M}"
+        return findings, deadline
+
+    def _update_lateness(self, late, row, day):
+        """
+        Apply a record's status to an employee's late history (sorted
+        [[date, attendance_id], ...], changed in place). Returns
+        {attendance_id: (date, detail)} for the late days whose lateness
+        finding may have changed; detail None clears it.
+        """
+        key = str(day)
+        is_late = row['status'] == 'Late'
+        index = bisect.bisect_left(late, [key])
+        existing = late[index] if index < len(late) and late[index][0] == key else None
+        if existing is None and not is_late:
+            return {}
+        if existing is not None and is_late and existing[1] == row['id']:
+            return {}
+
+        changed = {row['id']: (key, None)}
+        if existing is not None:
+            del late[index]
+            changed[existing[1]] = (key, None)
+        if is_late:
+            late.insert(index, [key, row['id']])
+            del late[:-LATE_HISTORY]
+
+        # Only windows ending on or after this day can have changed
+        last = str(day + self.late_window)
+        for late_day, attendance_id in late:
+            if key <= late_day <= last:
+                first = str(date.fromisoformat(late_day) - self.late_window)
+                count = sum(1 for other, _ in late if first <= other <= late_day)
+                detail = f"{count} late arrivals in {self.late_window.days + 1} days" \
+                    if count >= self.late_count else None
+                changed[attendance_id] = (late_day, detail)
+        return changed
+
+    def _load_late(self, employee_ids):
+        missing = [e for e in employee_ids if e not in self._late]
+        if not missing:
+            return
+        rows = self.db.execute_query(
+            "SELECT employee_id, late FROM attendance_anomaly_state "
+            "WHERE employee_id IN (SELECT value FROM json_each(?))",
+            (json.dumps(missing),), fetch_all=True
+        )
+        if rows is None:
+            raise RuntimeError("could not load anomaly detector state")
+        for employee_id in missing:
+            self._late[employee_id] = []
+        for row in rows:
+            self._late[row['employee_id']] = json.loads(row['late'])
+
+    def _process(self, rows, now):
+        """
+        Check one chunk and commit its findings, state and the new high-water
+        mark. Returns the number of findings added or changed.
+        """
+        self._load_late({r['employee_id'] for r in rows})
+        findings = {}  # (attendance_id, kind) -> finding row, or None to clear; last write wins
+        pending, touched = [], set()
+        for row in rows:
+            employee_id = row['employee_id']
+            day = date.fromisoformat(str(row['date'])[:10])
+            found, deadline = self._check(row, now)
+            for kind in RECORD_KINDS:
+                findings[(row['id'], kind)] = (row['id'], employee_id, str(day), kind, found[kind]) \
+                    if kind in found else None
+            if deadline is not None:
+                pending.append((row['id'], employee_id, str(day), deadline.strftime(_TS_FORMAT)))
+            changed = self._update_lateness(self._late[employee_id], row, day)
+            if changed:
+                touched.add(employee_id)
+            for attendance_id, (late_day, detail) in changed.items():
+                findings[(attendance_id, REPEATED_LATENESS)] = \
+                    (attendance_id, employee_id, late_day, REPEATED_LATENESS, detail) if detail else None
+
+        upserts = [f for f in findings.values() if f is not None]
+        clears = [key for key, f in findings.items() if f is None]
+        found = 0
+        with self.db.transaction(immediate=True):
+            if clears:
+                self.db.execute_many(CLEAR_FINDING, None, clears, chunk_size=len(clears))
+            if upserts:
+                results = self.db.execute_many(UPSERT_FINDING, None, upserts, chunk_size=len(upserts))
+                found = sum(r['affected'] for r in results)
+            self.db.execute_many("DELETE FROM attendance_anomaly_pending WHERE attendance_id = ?",
+                                 None, [(r['id'],) for r in rows], chunk_size=len(rows))
+            if pending:
+                self.db.execute_many(
+                    "INSERT INTO attendance_anomaly_pending (attendance_id, employee_id, date, deadline) "
+                    "VALUES (?, ?, ?, ?)", None, pending, chunk_size=len(pending)
+                )
+            if touched:
+                state = [(e, json.dumps(self._late[e])) for e in touched]
+                self.db.execute_many(
+                    "INSERT INTO attendance_anomaly_state (employee_id, late) VALUES (?, ?) "
+                    "ON CONFLICT (employee_id) DO UPDATE SET late = excluded.late",
+                    None, state, chunk_size=len(state)
+                )
+            self._set_progress(rows[-1]['updated_at'])
+        return found
+
+    def _set_progress(self, updated_at):
+        self.db.execute_query(
+            "INSERT INTO system_settings (key, value, description) VALUES (?, ?, ?) "
+            "ON CONFLICT (key) DO UPDATE SET value = excluded.value",
+            (PROGRESS_KEY, str(updated_at), 'Last attendance change checked for anomalies')
+        )
+
+    def _flag_overdue(self, now):
+        """Turn pending punches past their deadline into missing clock-out findings"""
+        stamp = now.strftime(_TS_FORMAT)
+        with self.db.transaction(immediate=True):
+            before = self.db.execute_query("SELECT COUNT(*) as n FROM attendance_anomaly_pending WHERE deadline <= ?",
+                                           (stamp,), fetch_one=True)
+            self.db.execute_query(FLAG_OVERDUE, (MISSING_CLOCK_OUT, stamp))
+            self.db.execute_query("DELETE FROM attendance_anomaly_pending WHERE deadline <= ?", (stamp,))
+        return before['n']
+
+    def run(self, full=False, now=None):
+        """
+        Check attendance changed since the last run; full rebuilds the
+        detector state from every record. Returns {'scanned', 'found',
+        'overdue', 'through'}, or None if a chunk failed (earlier chunks
+        stay committed and the next run resumes after them).
+        """
+        now = now or datetime.now()
+        through = None if full else self.processed_through()
+        self._late = {}
+        cursor = ('', 0)
+        if through:
+            cursor = ((_ts(through) - SCAN_OVERLAP).strftime(_TS_FORMAT), 0)
+        summary = {'scanned': 0, 'found': 0, 'overdue': 0, 'through': through}
+
+        try:
+            if full:
+                with self.db.transaction(immediate=True):
+                    self.db.execute_query("DELETE FROM attendance_anomaly_state")
+                    self.db.execute_query("DELETE FROM attendance_anomaly_pending")
+            while True:
+                rows = self.db.execute_query(SCAN_QUERY, (*cursor, self.chunk_size), fetch_all=True)
+                if rows is None:
+                    raise RuntimeError("attendance scan failed")
+                if not rows:
+                    break
+                summary['found'] += self._process(rows, now)
+                summary['scanned'] += len(rows)
+                summary['through'] = str(rows[-1]['updated_at'])
+                cursor = (rows[-1]['updated_at'], rows[-1]['id'])
+            summary['overdue'] = self._flag_overdue(now)
+        except Exception as e:
+            logger.error(f"Anomaly detection failed: {e}")
+            return None
+        finally:
+            self._late = {}
+
+        logger.info(f"Anomaly detection: {summary}")
+        return summary
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Flag attendance anomalies in records changed since the last run")
+    parser.add_argument('--full', action='store_true', help="re-check all attendance and rebuild the detector state")
+    parser.add_argument('--chunk-size', type=int, default=DB_BULK_CHUNK_SIZE)
+    args = parser.parse_args()
+
+    summary = AnomalyDetector(chunk_size=args.chunk_size).run(full=args.full)
+    if summary is None:
+        raise SystemExit("Anomaly detection failed. See log for details.")
+    print(f"{summary['scanned']} record(s) checked, {summary['found']} finding(s), "
+          f"{summary['overdue']} missing clock-out(s); processed through {summary['through']}.")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,5 +1,10 @@
 from models.attendance import Attendance
-from utils.calculators import calculate_work_hours
+from models.shift_cache import get_shift_cache
+from services.hours_service import get_work_hours
+from models.site_index import OFF_SITE, get_site_index
+from config import DEFAULT_BREAK_DURATION, GEOFENCE_REJECT_OFFSITE
+from utils.calculators import calculate_work_hours, clock_in_status
+from collections import Counter
 from datetime import datetime
 import logging
 
@@ -8,56 +13,38 @@ logger = logging.getLogger(__name__)
 class AttendanceService:
     def __init__(self):
         self.attendance_model = Attendance()
+        self.shift_cache = get_shift_cache(self.attendance_model.db.db_path)
+        self.site_index = get_site_index(self.attendance_model.db.db_path)
 
     def clock_in(self, employee_id, location=None):
         """
         Record clock-in for an employee.
         """
-        today = datetime.now().date()
         now = datetime.now()
-        
-        # Check if already clocked in
-        existing = self.attendance_model.get_todays_record(employee_id, str(today))
-        if existing:
-            return False, "Already clocked in."
-            
-        # Shift Logic
-        from models.employee import Employee
-        from models.shift import Shift
-        
-        emp = Employee().get_by_id(employee_id)
-        shift_id = emp.get('shift_id', 1)
-        shift = Shift().get_by_id(shift_id)
-        
-        status = "Present"
-        
-        if shift:
-            # Parse shift start time
-            s_hour, s_min = map(int, shift['start_time'].split(':'))
-            start_time = now.replace(hour=s_hour, minute=s_min, second=0, microsecond=0)
-            grace = shift['grace_period_minutes']
-            
-            if now > start_time + timedelta(minutes=grace):
-                status = "Late"
-        else:
-            # Fallback (9 AM)
-            start_time = now.replace(hour=9, minute=0, second=0, microsecond=0)
-            if now > start_time + timedelta(minutes=15):
-                status = "Late"
-            
-        data = {
-            'employee_id': employee_id,
-            'date': str(today),
-            'clock_in': now, # timestamp
-            'status': status,
-            'work_type': 'Regular',
-            'latitude': location[0] if location else None,
-            'longitude': location[1] if location else None
-        }
-        
         try:
-            self.attendance_model.create_record(data)
-            return True, f"Clocked in successfully at {now.strftime('%H:%M')}"
+            # Late/Present from the in-memory shift cache; an employee missing
+            # from it (e.g. added by another process) is resolved in SQL instead.
+            # Either way the write is one statement that also checks the
+            # employee exists, and a double click hits ON CONFLICT DO NOTHING.
+            geofence = self.site_index.classify(location)
+            if geofence[0] == OFF_SITE and GEOFENCE_REJECT_OFFSITE:
+                return False, "Clock-in location is outside every work site."
+
+            status = None
+            employee, shift = self.shift_cache.shift_for(employee_id)
+            if employee is not None:
+                status = clock_in_status(now, shift.start_time, shift.grace_period_minutes) if shift \
+                    else clock_in_status(now)
+            record = self.attendance_model.clock_in(employee_id, now, location, status=status, geofence=geofence)
+            if record:
+                if geofence[0] == OFF_SITE:
+                    return True, f"Clocked in at {now.strftime('%H:%M')} (off-site, flagged for review)"
+                return True, f"Clocked in successfully at {now.strftime('%H:%M')}"
+
+            # No row: tell "already clocked in" from an unknown employee
+            if self.attendance_model.get_todays_record(employee_id, str(now.date())):
+                return False, "Already clocked in."
+            return False, "Employee not found."
         except Exception as e:
             logger.error(f"Clock in error: {e}")
             return False, f"System error: {str(e)}"
@@ -66,18 +53,23 @@ class AttendanceService:
         """
         Record clock-out and calculate hours.
         """
-        today_date = datetime.now().date()
-        date_str = str(today_date)
-        
+        clock_out_time = datetime.now()
+        try:
+            return self.attendance_model.db.write_unit(self._clock_out_unit, employee_id, clock_out_time)
+        except Exception as e:
+            logger.error(f"Clock out error: {e}")
+            return False, str(e)
+
+    def _clock_out_unit(self, employee_id, clock_out_time):
+        date_str = str(clock_out_time.date())
+
         record = self.attendance_model.get_todays_record(employee_id, date_str)
         if not record:
             return False, "No clock-in record found for today"
-            
+
         if record['clock_out']:
-             return False, "Already clocked out today"
+            return False, "Already clocked out today"
 
-        clock_out_time = datetime.now()
-        
         # Parse clock_in from string if needed (SQLite returns strings for datetime)
         clock_in_time = record['clock_in']
         if isinstance(clock_in_time, str):
@@ -88,22 +80,34 @@ class AttendanceService:
                 # Just a safeguard, creating a parser helper would be better
                 pass
 
-        # Calculate hours
-        total, regular, overtime = calculate_work_hours(clock_in_time, clock_out_time)
-        
+        # Calculate hours (same inputs as services.hours_service recomputes from)
+        break_minutes = record['break_duration'] if record['break_duration'] is not None else DEFAULT_BREAK_DURATION
+        total, regular, overtime = calculate_work_hours(
+            clock_in_time, clock_out_time, break_minutes, work_hours=get_work_hours()
+        )
+
         data = {
             'clock_out': clock_out_time,
             'total_hours': total,
             'regular_hours': regular,
             'overtime_hours': overtime
         }
-        
-        try:
-            self.attendance_model.update_record(record['id'], data)
-            return True, f"Clocked out at {clock_out_time.strftime('%H:%M')}. Worked {total} hours."
-        except Exception as e:
-            logger.error(f"Clock out error: {e}")
-            return False, str(e)
+
+        self.attendance_model.update_record(record['id'], data, employee_id=employee_id)
+        return True, f"Clocked out at {clock_out_time.strftime('%H:%M')}. Worked {total} hours."
+
+    def get_roster(self, date=None, department_id=None):
+        """
+        Attendance roster for a day (today by default): every active employee
+        with their status, absent ones filled in.
+        Returns {'rows': [record, ...], 'counts': {'Present', 'Late', 'Absent', 'Total', ...}};
+        'Present' includes late arrivals, as on the dashboard.
+        """
+        rows = self.attendance_model.get_roster(str(date or datetime.now().date()), department_id) or []
+        counts = Counter(r.status for r in rows)
+        counts['Present'] += counts['Late']
+        counts['Total'] = len(rows)
+        return {'rows': rows, 'counts': dict(counts)}
 
     def get_employee_today(self, employee_id):
         """Get today's status for employee"""
@@ -0,0 +1,138 @@
+"""
+Calendar feed for the attendance Calendar View.
+
+Serves FullCalendar events for the visible date range only. Events are
+built and cached per (employee, month) in models/calendar_cache.py, along
+with the holiday background events for each month. A miss loads the
+visible months and their neighbours in one indexed range query, so
+stepping to the previous or next month is a cache hit.
+"""
+from datetime import date
+from config import DATABASE_PATH
+from database.db_manager import DBManager
+from models.calendar_cache import HOLIDAYS, get_calendar_cache
+
+STATUS_COLORS = {
+    'Present': '#28a745',
+    'Late': '#ffc107',
+    'Absent': '#dc3545',
+    'On Leave': '#17a2b8'
+}
+DEFAULT_COLOR = '#6c757d'
+HOLIDAY_COLOR = '#ffeb3b'
+
+
+def _month_start(day):
+    return day.replace(day=1)
+
+
+def _add_months(month_start, n):
+    index = month_start.year * 12 + month_start.month - 1 + n
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def _months(start, end):
+    """First days of the months overlapping [start, end)"""
+    month = _month_start(start)
+    while month < end:
+        yield month
+        month = _add_months(month, 1)
+
+
+def attendance_event(rec):
+    color = STATUS_COLORS.get(rec['status'], DEFAULT_COLOR)
+    return {
+        "title": f"{rec['status']} ({rec['total_hours'] or 0:.2f}h)",
+        "start": rec['date'],
+        "allDay": True,
+        "backgroundColor": color,
+        "borderColor": color
+    }
+
+
+def holiday_event(h):
+    return {
+        "title": f"🎉 {h['name']}",
+        "start": h['date'],
+        "allDay": True,
+        "display": "background",
+        "backgroundColor": HOLIDAY_COLOR
+    }
+
+
+class CalendarFeed:
+    def __init__(self, db_path=DATABASE_PATH):
+        self.db = DBManager(db_path)
+        self.cache = get_calendar_cache(db_path)
+
+    def _load(self, owner, months):
+        """Query the span of `months` once and cache each month's events"""
+        version = self.cache.version(owner)
+        start, end = min(months), _add_months(max(months), 1)
+        if owner == HOLIDAYS:
+            rows = self.db.execute_query(
+                "SELECT date, name FROM public_holidays WHERE date >= ? AND date < ? ORDER BY date",
+                (str(start), str(end)), fetch_all=True, row_format='record'
+            )
+            build = holiday_event
+        else:
+            rows = self.db.execute_query(
+                "SELECT date, status, total_hours FROM attendance "
+                "WHERE employee_id = ? AND date >= ? AND date < ? ORDER BY date",
+                (owner, str(start), str(end)), fetch_all=True, row_format='record'
+            )
+            build = attendance_event
+        if rows is None:
+            return {}  # query failed (logged); nothing cached
+        by_month = {str(m)[:7]: [] for m in months}
+        for row in rows:
+            events = by_month.get(row['date'][:7])
+            if events is not None:
+                events.append(build(row))
+        for month, events in by_month.items():
+            self.cache.put(owner, month, events, version)
+        return by_month
+
+    def _month_events(self, owner, months):
+        """{'YYYY-MM': events} for `months`, loading misses plus one month either side"""
+        found, missing = {}, []
+        for m in months:
+            events = self.cache.get(owner, str(m)[:7])
+            if events is None:
+                missing.append(m)
+            else:
+                found[str(m)[:7]] = events
+        if missing:
+            window = set(missing) | {_add_months(min(missing), -1), _add_months(max(missing), 1)}
+            window = [m for m in window if m in missing or self.cache.get(owner, str(m)[:7]) is None]
+            loaded = self._load(owner, window)
+            found.update((str(m)[:7], loaded.get(str(m)[:7], [])) for m in missing)
+        return found
+
+    def events(self, employee_id, start, end):
+        """
+        Attendance and holiday events dated start <= date < end (date objects
+        or ISO strings), as FullCalendar event dicts. The lists are shared
+        with the cache; treat them as read-only.
+        """
+        start, end = date.fromisoformat(str(start)[:10]), date.fromisoformat(str(end)[:10])
+        months = list(_months(start, end))
+        if not months:
+            return []
+        first, last = str(start), str(end)
+        result = []
+        for owner in (employee_id, HOLIDAYS):
+            for events in self._month_events(owner, months).values():
+                result.extend(e for e in events if first <= e['start'] < last)
+        return result
+
+
+def month_range(day=None):
+    """(start, end) of the month containing `day` (today by default), end exclusive"""
+    start = _month_start(day or date.today())
+    return start, _add_months(start, 1)
+
+
+def add_months(day, n):
+    """First day of the month `n` months after the one containing `day`"""
+    return _add_months(_month_start(day), n)
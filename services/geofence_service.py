@@ -0,0 +1,127 @@
+"""
+Batch geofence checks over stored punches.
+
+GeofenceScanner re-classifies the punches of a period against the sites in
+models/site_index.py (after adding or moving a site, or for punches
+recorded before geofencing). Coordinates are read in id-keyset chunks as
+NumPy arrays; each site is one vectorized bounding-box filter plus an exact
+radius or polygon test over the remaining candidates, and only changed
+rows are written back.
+
+CLI:
+    python -m services.geofence_service 2024-06-01 2024-06-30
+"""
+import argparse
+import logging
+from config import DB_BULK_CHUNK_SIZE
+from database.db_manager import DBManager
+from models.site_index import ON_SITE, OFF_SITE, get_site_index
+from utils.geo import haversine_m_array, point_in_polygon_array
+
+logger = logging.getLogger(__name__)
+
+
+def locate_array(np, sites, lat, lon):
+    """Site id per point (0 where none) for coordinate arrays; first match wins, as in SiteIndex.locate"""
+    site_ids = np.zeros(lat.shape, dtype='int64')
+    for site in sites:
+        min_lat, min_lon, max_lat, max_lon = site.bbox
+        candidates = np.flatnonzero((site_ids == 0) & (lat >= min_lat) & (lat <= max_lat)
+                                    & (lon >= min_lon) & (lon <= max_lon))
+        if not len(candidates):
+            continue
+        if site.polygon:
+            hit = point_in_polygon_array(np, lat[candidates], lon[candidates], site.polygon)
+        else:
+            hit = haversine_m_array(np, lat[candidates], lon[candidates], site.latitude, site.longitude) <= site.radius_m
+        site_ids[candidates[hit]] = site.id
+    return site_ids
+
+
+SCAN_QUERY = """
+SELECT id, latitude, longitude, geofence_status, geofence_site_id FROM attendance
+WHERE date >= ? AND date <= ? AND id > ? AND latitude IS NOT NULL AND longitude IS NOT NULL
+ORDER BY id LIMIT ?
+"""
+
+
+class GeofenceScanner:
+    def __init__(self, chunk_size=DB_BULK_CHUNK_SIZE):
+        self.db = DBManager()
+        self.index = get_site_index(self.db.db_path)
+        self.chunk_size = chunk_size
+
+    def scan(self, start_date, end_date):
+        """
+        Re-classify every punch with coordinates dated start_date..end_date and
+        store the result where it changed.
+        Returns {'scanned', 'on_site', 'off_site', 'updated'}, or None on failure.
+        """
+        import numpy as np  # pandas dependency; only the batch scan needs it
+
+        sites = self.index.sites()
+        summary = {'scanned': 0, 'on_site': 0, 'off_site': 0, 'updated': 0}
+        if not sites:
+            return summary
+        after_id = 0
+        while True:
+            rows = self.db.execute_query(
+                SCAN_QUERY, (str(start_date), str(end_date), after_id, self.chunk_size),
+                fetch_all=True, row_format='columns'
+            )
+            if rows is None:
+                return None
+            if not rows['id']:
+                break
+            after_id = rows['id'][-1]
+            lat = np.array(rows['latitude'], dtype='float64')
+            lon = np.array(rows['longitude'], dtype='float64')
+            site_ids = locate_array(np, sites, lat, lon)
+            on_site = site_ids > 0
+
+            updates = [
+                (ON_SITE if site_id else OFF_SITE, site_id or None, record_id)
+                for record_id, site_id, status, old_site in zip(
+                    rows['id'], site_ids.tolist(), rows['geofence_status'], rows['geofence_site_id'])
+                if (ON_SITE if site_id else OFF_SITE) != status or (site_id or None) != old_site
+            ]
+            if updates:
+                results = self.db.execute_many(
+                    "UPDATE attendance SET geofence_status = ?, geofence_site_id = ? WHERE id = ?",
+                    None, updates, chunk_size=len(updates)
+                )
+                summary['updated'] += sum(r['rows'] for r in results if not r['error'])
+            summary['scanned'] += len(site_ids)
+            summary['on_site'] += int(on_site.sum())
+            summary['off_site'] += int((~on_site).sum())
+        logger.info(f"Geofence scan {start_date}..{end_date}: {summary}")
+        return summary
+
+    def get_offsite(self, start_date, end_date, limit=500):
+        """Off-site punches in a date range, newest first"""
+        query = """
+        SELECT a.id, a.date, a.clock_in, a.latitude, a.longitude, e.first_name, e.last_name, e.employee_code
+        FROM attendance a
+        JOIN employees e ON e.id = a.employee_id
+        WHERE a.geofence_status = 'Off-site' AND a.date >= ? AND a.date <= ?
+        ORDER BY a.date DESC LIMIT ?
+        """
+        return self.db.execute_query(query, (str(start_date), str(end_date), limit), fetch_all=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Re-classify stored punches against the geofenced sites")
+    parser.add_argument('start', help="first date (YYYY-MM-DD)")
+    parser.add_argument('end', help="last date (YYYY-MM-DD)")
+    parser.add_argument('--chunk-size', type=int, default=DB_BULK_CHUNK_SIZE)
+    args = parser.parse_args()
+
+    summary = GeofenceScanner(chunk_size=args.chunk_size).scan(args.start, args.end)
+    if summary is None:
+        raise SystemExit("Geofence scan failed. See log for details.")
+    print(f"{summary['scanned']} punch(es) scanned: {summary['on_site']} on-site, "
+          f"{summary['off_site']} off-site; {summary['updated']} updated.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,146 @@
+"""
+Work-hour recomputation.
+
+Recomputes total/regular/overtime hours for every closed record in a
+period with calculate_work_hours_batch, e.g. after the 'work_hours' setting
+changes or clock times were corrected in bulk. Records are read in id
+order, one chunk at a time, as NumPy arrays; only rows whose hours actually
+change are written back, one executemany per chunk. Results are identical
+to what calculate_work_hours gives the same record at clock-out.
+
+CLI:
+    python -m services.hours_service 2024-06-01 2024-06-30 [--work-hours 7.5]
+"""
+import argparse
+import logging
+from datetime import datetime
+from config import DB_BULK_CHUNK_SIZE, DEFAULT_BREAK_DURATION, DEFAULT_WORK_HOURS
+from models.attendance import Attendance
+from models.settings import SettingsModel
+from utils.calculators import calculate_work_hours_batch
+
+logger = logging.getLogger(__name__)
+
+CHUNK_QUERY = f"""
+SELECT id, employee_id, clock_in, clock_out, COALESCE(break_duration, {int(DEFAULT_BREAK_DURATION)}) as break_duration,
+       total_hours, regular_hours, overtime_hours
+FROM attendance
+WHERE date >= ? AND date <= ? AND id > ? AND clock_in IS NOT NULL AND clock_out IS NOT NULL
+"""
+
+UPDATE_QUERY = """
+UPDATE attendance SET total_hours = ?, regular_hours = ?, overtime_hours = ?, updated_at = CURRENT_TIMESTAMP
+WHERE id = ?
+"""
+
+
+def get_work_hours(settings_model=None):
+    """Standard day length from the 'work_hours' setting (DEFAULT_WORK_HOURS if unset or invalid)"""
+    value = (settings_model or SettingsModel()).get_setting('work_hours')
+    try:
+        return float(value) if value is not None else DEFAULT_WORK_HOURS
+    except ValueError:
+        logger.warning(f"Invalid work_hours setting {value!r}; using {DEFAULT_WORK_HOURS}")
+        return DEFAULT_WORK_HOURS
+
+
+def _timestamps(np, values):
+    """Stored clock times -> datetime64[us]; falls back to fromisoformat for non-ISO-basic text"""
+    try:
+        return np.array(values, dtype='datetime64[us]')
+    except ValueError:
+        return np.array([datetime.fromisoformat(str(v)) for v in values], dtype='datetime64[us]')
+
+
+class HoursRecomputer:
+    def __init__(self, chunk_size=DB_BULK_CHUNK_SIZE):
+        self.attendance_model = Attendance()
+        self.db = self.attendance_model.db
+        self.chunk_size = chunk_size
+
+    def _fetch_chunk(self, start_date, end_date, after_id, employee_ids):
+        query, params = CHUNK_QUERY, [str(start_date), str(end_date), after_id]
+        if employee_ids:
+            query += f" AND employee_id IN ({', '.join('?' * len(employee_ids))})"
+            params.extend(employee_ids)
+        query += " ORDER BY id LIMIT ?"
+        params.append(self.chunk_size)
+        return self.db.execute_query(query, tuple(params), fetch_all=True, row_format='record')
+
+    def _recompute_chunk(self, rows, work_hours, thresholds):
+        """Changed (total, regular, overtime, id) tuples for one chunk"""
+        import numpy as np
+
+        ids = np.array([r.id for r in rows], dtype='int64')
+        limits = np.array([thresholds.get(r.employee_id, work_hours) for r in rows], dtype='float64') \
+            if thresholds else work_hours
+        total, regular, overtime = calculate_work_hours_batch(
+            _timestamps(np, [r.clock_in for r in rows]),
+            _timestamps(np, [r.clock_out for r in rows]),
+            np.array([r.break_duration for r in rows], dtype='float64'),
+            limits,
+        )
+        current = np.array(
+            [(r.total_hours, r.regular_hours, r.overtime_hours) for r in rows], dtype='float64'
+        ).reshape(len(rows), 3)
+        # NaN (NULL hours) never compares equal, so such rows are always rewritten
+        changed = np.flatnonzero(
+            (current[:, 0] != total) | (current[:, 1] != regular) | (current[:, 2] != overtime)
+        )
+        return list(zip(total[changed].tolist(), regular[changed].tolist(),
+                        overtime[changed].tolist(), ids[changed].tolist()))
+
+    def recompute_period(self, start_date, end_date, employee_ids=None, work_hours=None, thresholds=None):
+        """
+        Recompute hours for closed records dated start_date..end_date.
+        work_hours: overtime threshold (default: the 'work_hours' setting);
+        thresholds: optional {employee_id: hours} overriding it per employee.
+        Returns {'scanned', 'updated', 'failed'} counts, or None if reading failed.
+        """
+        if work_hours is None:
+            work_hours = get_work_hours()
+        summary = {'scanned': 0, 'updated': 0, 'failed': 0}
+        after_id = 0
+        while True:
+            rows = self._fetch_chunk(start_date, end_date, after_id, employee_ids)
+            if rows is None:
+                return None
+            if not rows:
+                break
+            after_id = rows[-1].id
+            summary['scanned'] += len(rows)
+            try:
+                updates = self._recompute_chunk(rows, work_hours, thresholds)
+            except ValueError as e:
+                logger.error(f"Skipping records {rows[0].id}..{after_id}: unreadable clock time ({e})")
+                summary['failed'] += len(rows)
+                continue
+            if updates:
+                results = self.db.execute_many(UPDATE_QUERY, None, updates, chunk_size=len(updates))
+                failed = sum(r['rows'] for r in results if r['error'])
+                summary['failed'] += failed
+                summary['updated'] += len(updates) - failed
+        if summary['updated']:
+            self.attendance_model.calendar_cache.invalidate()
+        logger.info(f"Recomputed hours {start_date}..{end_date}: {summary}")
+        return summary
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Recompute attendance work hours for a period")
+    parser.add_argument('start', help="first date (YYYY-MM-DD)")
+    parser.add_argument('end', help="last date (YYYY-MM-DD)")
+    parser.add_argument('--work-hours', type=float, help="overtime threshold (default: work_hours setting)")
+    parser.add_argument('--chunk-size', type=int, default=DB_BULK_CHUNK_SIZE)
+    args = parser.parse_args()
+
+    summary = HoursRecomputer(chunk_size=args.chunk_size).recompute_period(
+        args.start, args.end, work_hours=args.work_hours
+    )
+    if summary is None:
+        raise SystemExit("Recompute failed. See log for details.")
+    print(f"{summary['scanned']} record(s) scanned, {summary['updated']} updated, {summary['failed']} failed.")
+
+
+if __name__ == "__main__":
+    main()
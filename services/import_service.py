@@ -0,0 +1,263 @@
+"""
+Bulk attendance import from time-clock exports (CSV or Excel).
+
+One row per employee-day with at least employee_code, date and clock_in
+(clock_out, status and notes optional; common header aliases accepted).
+Rows are streamed from the file, validated against a cached
+employee_code -> id map, given hours (one calculate_work_hours_batch call
+per chunk) and a Late/Present status, and upserted on (employee_id, date)
+one chunk per transaction. Rejected rows go to a CSV error report as they
+are found, so memory stays bounded by the chunk size rather than the file
+size.
+
+CLI (e.g. after the nightly badge-reader dump):
+    python -m services.import_service exports/2024-06-01.csv
+"""
+import argparse
+import csv
+import io
+import logging
+import os
+from datetime import date, datetime, time, timedelta
+from config import DB_BULK_CHUNK_SIZE, IMPORT_REPORT_DIR
+from models.attendance import Attendance
+from models.shift_cache import get_shift_cache
+from services.hours_service import get_work_hours
+from utils.calculators import calculate_work_hours_batch, clock_in_status
+
+logger = logging.getLogger(__name__)
+
+# Accepted header spellings (lower-cased, spaces/dashes as underscores)
+HEADER_ALIASES = {
+    'employee_code': 'employee_code', 'code': 'employee_code', 'badge': 'employee_code',
+    'badge_id': 'employee_code', 'emp_code': 'employee_code',
+    'date': 'date', 'work_date': 'date',
+    'clock_in': 'clock_in', 'in': 'clock_in', 'time_in': 'clock_in', 'punch_in': 'clock_in',
+    'clock_out': 'clock_out', 'out': 'clock_out', 'time_out': 'clock_out', 'punch_out': 'clock_out',
+    'status': 'status', 'notes': 'notes', 'note': 'notes',
+}
+REQUIRED_COLUMNS = ('employee_code', 'date', 'clock_in')
+SAMPLE_ERRORS = 50  # errors kept in memory for display; the report has them all
+
+
+class RowError(ValueError):
+    """A row that can't be imported; the message goes to the error report"""
+
+
+def _normalize_header(name):
+    key = str(name or '').strip().lower().replace(' ', '_').replace('-', '_')
+    return HEADER_ALIASES.get(key, key)
+
+
+def iter_csv(stream):
+    """(line_number, row dict) from a CSV text or binary stream"""
+    if isinstance(stream, (io.RawIOBase, io.BufferedIOBase)):
+        stream = io.TextIOWrapper(stream, encoding='utf-8-sig', newline='')
+    reader = csv.reader(stream)
+    header = [_normalize_header(h) for h in next(reader, [])]
+    for line, values in enumerate(reader, start=2):
+        if any(v.strip() for v in values):
+            yield line, dict(zip(header, values))
+
+
+def iter_excel(stream):
+    """(line_number, row dict) from the first sheet of an .xlsx workbook"""
+    from openpyxl import load_workbook  # optional: only needed for Excel files
+
+    workbook = load_workbook(stream, read_only=True, data_only=True)
+    try:
+        rows = workbook.worksheets[0].iter_rows(values_only=True)
+        header = [_normalize_header(h) for h in next(rows, ())]
+        for line, values in enumerate(rows, start=2):
+            if any(v not in (None, '') for v in values):
+                yield line, dict(zip(header, values))
+    finally:
+        workbook.close()
+
+
+def iter_file(stream, filename):
+    if filename.lower().endswith(('.xlsx', '.xlsm')):
+        return iter_excel(stream)
+    return iter_csv(stream)
+
+
+def _parse_date(value):
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, date):
+        return value
+    try:
+        return date.fromisoformat(str(value).strip()[:10])
+    except ValueError:
+        raise RowError(f"invalid date {value!r}")
+
+
+def _parse_time(value, day, column):
+    """Full timestamp, or a time of day on `day`; None if blank"""
+    if value is None or (isinstance(value, str) and not value.strip()):
+        return None
+    if isinstance(value, datetime):
+        return value
+    if isinstance(value, time):
+        return datetime.combine(day, value)
+    text = str(value).strip()
+    try:
+        return datetime.fromisoformat(text)
+    except ValueError:
+        pass
+    try:
+        return datetime.combine(day, time.fromisoformat(text))
+    except ValueError:
+        raise RowError(f"invalid {column} {value!r}")
+
+
+class AttendanceImporter:
+    def __init__(self, chunk_size=DB_BULK_CHUNK_SIZE, report_dir=IMPORT_REPORT_DIR):
+        self.attendance_model = Attendance()
+        self.chunk_size = chunk_size
+        self.report_dir = report_dir
+        self.shift_cache = get_shift_cache(self.attendance_model.db.db_path)
+        self._codes = None
+
+    def employee_codes(self):
+        """employee_code -> id, loaded once per importer"""
+        if self._codes is None:
+            rows = self.attendance_model.db.execute_query("SELECT id, employee_code FROM employees", fetch_all=True) or []
+            self._codes = {str(r['employee_code']).strip().upper(): r['id'] for r in rows}
+        return self._codes
+
+    def _validate(self, row):
+        """Import row -> attendance record dict (hours filled in later, per chunk)"""
+        code = str(row.get('employee_code') or '').strip().upper()
+        if not code:
+            raise RowError("missing employee_code")
+        employee_id = self.employee_codes().get(code)
+        if employee_id is None:
+            raise RowError(f"unknown employee_code {code!r}")
+
+        day = _parse_date(row.get('date'))
+        clock_in = _parse_time(row.get('clock_in'), day, 'clock_in')
+        if clock_in is None:
+            raise RowError("missing clock_in")
+        clock_out = _parse_time(row.get('clock_out'), day, 'clock_out')
+        if clock_out is not None and clock_out < clock_in:
+            clock_out += timedelta(days=1)  # overnight shift
+            if clock_out < clock_in:
+                raise RowError("clock_out before clock_in")
+
+        record = {
+            'employee_id': employee_id,
+            'date': str(day),
+            'clock_in': clock_in,
+            'clock_out': clock_out,
+            'status': str(row.get('status') or '').strip() or None,
+            'work_type': 'Regular',
+        }
+        if 'notes' in row:
+            record['notes'] = row.get('notes') or None
+        return record
+
+    def _finish_chunk(self, chunk):
+        """Hours (NULL while clocked in) and missing statuses for a chunk of validated records"""
+        import numpy as np  # pandas dependency, as in hours_service
+
+        records = [record for _, _, record in chunk]
+        hours = calculate_work_hours_batch(
+            np.array([r['clock_in'] for r in records], dtype='datetime64[us]'),
+            np.array([r['clock_out'] for r in records], dtype='datetime64[us]'),
+            work_hours=get_work_hours(),
+        )
+        for record, total, regular, overtime in zip(records, *(h.tolist() for h in hours)):
+            if record['clock_out'] is None:
+                total = regular = overtime = None
+            record['total_hours'] = total
+            record['regular_hours'] = regular
+            record['overtime_hours'] = overtime
+            if record['status'] is None:
+                _, shift = self.shift_cache.shift_for(record['employee_id'])
+                record['status'] = clock_in_status(record['clock_in'], shift.start_time, shift.grace_period_minutes) \
+                    if shift else clock_in_status(record['clock_in'])
+
+    def import_file(self, stream, filename):
+        """
+        Import one export file. Returns a summary dict:
+        rows, imported, rejected, error_report (CSV path or None), errors (first few).
+        """
+        os.makedirs(self.report_dir, exist_ok=True)
+        stem = os.path.splitext(os.path.basename(filename))[0]
+        report_path = os.path.join(self.report_dir, f"{stem}-errors-{datetime.now():%Y%m%d-%H%M%S}.csv")
+        summary = {'rows': 0, 'imported': 0, 'rejected': 0, 'error_report': None, 'errors': []}
+
+        with open(report_path, 'w', newline='', encoding='utf-8') as report_file:
+            report = csv.writer(report_file)
+            report.writerow(['line', 'employee_code', 'date', 'error'])
+
+            def reject(line, row, error):
+                summary['rejected'] += 1
+                report.writerow([line, row.get('employee_code'), row.get('date'), error])
+                if len(summary['errors']) < SAMPLE_ERRORS:
+                    summary['errors'].append({'line': line, 'error': error})
+
+            def flush(chunk):
+                self._finish_chunk(chunk)
+                results = self.attendance_model.upsert_records(
+                    (record for _, _, record in chunk), chunk_size=len(chunk)
+                )
+                if results and results[0]['error']:
+                    for line, code, record in chunk:
+                        reject(line, {'employee_code': code, 'date': record['date']},
+                               f"database error: {results[0]['error']}")
+                else:
+                    summary['imported'] += len(chunk)
+
+            try:
+                rows = iter_file(stream, filename)
+                header_checked = False
+                chunk = []
+                for line, row in rows:
+                    if not header_checked:
+                        missing = [c for c in REQUIRED_COLUMNS if c not in row]
+                        if missing:
+                            raise RowError(f"missing column(s): {', '.join(missing)}")
+                        header_checked = True
+                    summary['rows'] += 1
+                    try:
+                        chunk.append((line, row.get('employee_code'), self._validate(row)))
+                    except RowError as e:
+                        reject(line, row, str(e))
+                        continue
+                    if len(chunk) >= self.chunk_size:
+                        flush(chunk)
+                        chunk = []
+                if chunk:
+                    flush(chunk)
+            except (RowError, csv.Error, UnicodeDecodeError, OSError) as e:
+                # The file itself is unreadable: report it and keep the chunks already committed
+                logger.error(f"Import of {filename} stopped: {e}")
+                reject(0, {}, f"file error: {e}")
+
+        if summary['rejected']:
+            summary['error_report'] = report_path
+        else:
+            os.remove(report_path)
+        logger.info(f"Imported {summary['imported']}/{summary['rows']} attendance rows from {filename}")
+        return summary
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Import time-clock attendance exports (CSV/XLSX)")
+    parser.add_argument('files', nargs='+')
+    parser.add_argument('--chunk-size', type=int, default=DB_BULK_CHUNK_SIZE)
+    args = parser.parse_args()
+
+    importer = AttendanceImporter(chunk_size=args.chunk_size)
+    for path in args.files:
+        with open(path, 'rb') as f:
+            summary = importer.import_file(f, path)
+        print(f"{path}: {summary['imported']} imported, {summary['rejected']} rejected of {summary['rows']} rows")
+        if summary['error_report']:
+            print(f"  error report: {summary['error_report']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -25,17 +25,21 @@ class PayrollService:
         str_start = str(start_date)
         str_end = str(end_date)
         
-        employees = self.emp_model.get_all(active_only=True)
+        employees = self.emp_model.get_all(active_only=True, row_format='record')
         payroll_data = []
         
         
-        # 1. Fetch ALL attendance for this period in one go
-        # Note: We need a method to get ALL history for range, not filtered by one employee ID yet.
-        # existing get_history supports filters. If we omit employee_id, it should return all.
-        all_attendance = self.att_model.get_history({
+        # 1. Aggregate ALL attendance for this period in one streamed pass
+        # Rows are summed per employee as they arrive, so memory stays constant
+        # no matter how many records the month holds.
+        hours_by_emp = {}
+        for r in self.att_model.iter_history({
             'start_date': str_start,
             'end_date': str_end
-        })
+        }, row_format='record'):
+            totals = hours_by_emp.setdefault(r['employee_id'], [0.0, 0.0])
+            totals[0] += r['regular_hours'] or 0
+            totals[1] += r['overtime_hours'] or 0
         
         # 2. Fetch ALL approved expenses for this period
         from models.expense import Expense
@@ -45,13 +49,10 @@ class PayrollService:
         payroll_data = []
         
         for emp in employees:
-            # Filter in Python (fast for <10k records)
-            emp_recs = [r for r in all_attendance if r['employee_id'] == emp['id']]
             emp_exps = [x['amount'] for x in all_expenses if x['employee_id'] == emp['id']]
             
             # Aggregate hours
-            total_reg = sum(r['regular_hours'] for r in emp_recs if r['regular_hours'])
-            total_ot = sum(r['overtime_hours'] for r in emp_recs if r['overtime_hours'])
+            total_reg, total_ot = hours_by_emp.get(emp['id'], (0.0, 0.0))
             
             hourly_rate = emp['hourly_rate'] if emp['hourly_rate'] else 0.0
             
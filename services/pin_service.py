@@ -0,0 +1,127 @@
+"""
+Kiosk PIN resolution.
+
+PinResolver keeps an in-memory {pin digest: employee} index so a kiosk
+punch resolves a PIN with one HMAC, a dict lookup and a primary-key read.
+The index is built once, then refreshed incrementally: employee writes
+bump the roster version (models/shift_cache.py), and the next lookup
+re-reads only the employees whose updated_at moved since the last refresh.
+Writes made by other processes don't bump this process's version, so a
+hit is confirmed by reading the employee's row (a PIN changed or revoked
+elsewhere stops resolving at once), and a miss falls back to the UNIQUE
+pin_digest index, so a PIN set by another process is found without ever
+scanning the employees table.
+"""
+import threading
+from collections import namedtuple
+from config import DATABASE_PATH
+from database.db_manager import DBManager
+from models.shift_cache import get_shift_cache
+from utils.pins import pin_digest
+
+KioskEmployee = namedtuple('KioskEmployee', ['id', 'first_name', 'last_name', 'status'])
+
+_COLUMNS = "id, first_name, last_name, status, pin_digest, updated_at"
+
+# Re-read rows changed up to this long before the last refresh, so a write
+# that committed late with an older updated_at is still picked up
+REFRESH_OVERLAP = '-60 seconds'
+
+
+class PinResolver:
+    def __init__(self, db_path=DATABASE_PATH):
+        self.db = DBManager(db_path)
+        self.roster = get_shift_cache(db_path)
+        self._lock = threading.Lock()
+        self._by_digest = {}
+        self._digest_of = {}  # employee id -> digest currently indexed
+        self._loaded_version = None
+        self._high_water = None  # max(updated_at) seen
+
+    def _forget(self, employee_id):
+        old = self._digest_of.pop(employee_id, None)
+        if old is not None and self._by_digest.get(old, (None,))[0] == employee_id:
+            del self._by_digest[old]
+
+    def _apply(self, rows, advance=True):
+        for row in rows:
+            self._forget(row['id'])
+            if row['pin_digest']:
+                self._by_digest[row['pin_digest']] = KioskEmployee(
+                    row['id'], row['first_name'], row['last_name'], row['status']
+                )
+                self._digest_of[row['id']] = row['pin_digest']
+            if advance and row['updated_at'] and (self._high_water is None or row['updated_at'] > self._high_water):
+                self._high_water = row['updated_at']
+
+    def _refresh(self):
+        version = self.roster.version
+        if version == self._loaded_version:
+            return
+        with self._lock:
+            if version == self._loaded_version:
+                return
+            if self._loaded_version is None or self._high_water is None:
+                rows = self.db.execute_query(
+                    f"SELECT {_COLUMNS} FROM employees WHERE pin_digest IS NOT NULL", fetch_all=True
+                )
+            else:
+                rows = self.db.execute_query(
+                    f"SELECT {_COLUMNS} FROM employees WHERE updated_at >= datetime(?, ?)",
+                    (self._high_water, REFRESH_OVERLAP), fetch_all=True
+                )
+            if rows is None:
+                return  # query failed (logged); retry on the next lookup
+            self._apply(rows)
+            self._loaded_version = version
+
+    def resolve(self, pin):
+        """KioskEmployee for a PIN, or None"""
+        digest = pin_digest(pin)
+        if digest is None:
+            return None
+        self._refresh()
+        employee = self._by_digest.get(digest)
+        if employee is not None:
+            # Confirm against the row itself: PIN, name and status may have changed in another process
+            row = self.db.execute_query(f"SELECT {_COLUMNS} FROM employees WHERE id = ?", (employee.id,), fetch_one=True)
+            with self._lock:
+                if row is None:
+                    self._forget(employee.id)
+                else:
+                    self._apply([row], advance=False)
+            if row is not None and row['pin_digest'] == digest:
+                return self._by_digest.get(digest)
+
+        row = self.db.execute_query(f"SELECT {_COLUMNS} FROM employees WHERE pin_digest = ?", (digest,), fetch_one=True)
+        if row is None:
+            return None
+        with self._lock:
+            # A single row says nothing about other changes: keep the high-water mark
+            self._apply([row], advance=False)
+        return self._by_digest.get(digest)
+
+    def invalidate(self):
+        """Drop the index; the next lookup rebuilds it in full"""
+        with self._lock:
+            self._by_digest.clear()
+            self._digest_of.clear()
+            self._loaded_version = None
+            self._high_water = None
+
+    def stats(self):
+        return {'pins': len(self._by_digest), 'version': self._loaded_version, 'high_water': self._high_water}
+
+
+_resolvers = {}
+_resolvers_lock = threading.Lock()
+
+
+def get_pin_resolver(db_path=DATABASE_PATH):
+    """The shared PinResolver for a database file"""
+    with _resolvers_lock:
+        resolver = _resolvers.get(db_path)
+        if resolver is None:
+            resolver = PinResolver(db_path)
+            _resolvers[db_path] = resolver
+        return resolver
@@ -0,0 +1,167 @@
+"""
+Shift roster expansion.
+
+Expands each active employee's shift assignment (shift work_days) or
+rotation pattern into shift_schedule slots, from today up to
+ROSTER_HORIZON_DAYS ahead, skipping public holidays, approved leave and
+days before the hire date. Each chunk of employees is one set-based
+INSERT ... SELECT over a recursive calendar of days.
+
+regenerate() is incremental:
+  * employees queued in shift_schedule_dirty (by the triggers in migration
+    0006, which also deleted their future slots) are re-expanded in full;
+  * everyone else only gets the days between the last horizon
+    ('roster_through' in system_settings) and the new one.
+
+CLI (schedule nightly, e.g. cron or Windows Task Scheduler):
+    python -m services.roster_service              # incremental
+    python -m services.roster_service --full       # re-expand everyone
+"""
+import argparse
+import json
+import logging
+from datetime import date, datetime, timedelta
+from config import ROSTER_HORIZON_DAYS, ROSTER_CHUNK_EMPLOYEES
+from database.db_manager import DBManager
+
+logger = logging.getLogger(__name__)
+
+PROGRESS_KEY = 'roster_through'
+
+# :ids is a JSON array of employee ids; rotation day = days since anchor mod cycle
+EXPAND_QUERY = """
+WITH RECURSIVE days(d) AS (
+    SELECT :start
+    UNION ALL
+    SELECT date(d, '+1 day') FROM days WHERE d < :end
+)
+INSERT INTO shift_schedule (employee_id, date, shift_id, start_at, end_at, grace_period_minutes)
+SELECT e.id, days.d, s.id,
+       datetime(days.d || ' ' || s.start_time),
+       datetime(days.d || ' ' || s.end_time, CASE WHEN s.end_time <= s.start_time THEN '+1 day' ELSE '+0 days' END),
+       COALESCE(s.grace_period_minutes, 15)
+FROM employees e
+JOIN days
+LEFT JOIN shift_rotations r ON r.id = e.rotation_id
+LEFT JOIN shift_rotation_slots rs ON rs.rotation_id = r.id
+     AND rs.day_index = ((CAST(julianday(days.d) - julianday(r.anchor_date) AS INTEGER) % r.cycle_days)
+                         + r.cycle_days) % r.cycle_days
+JOIN shifts s ON s.id = CASE WHEN r.id IS NOT NULL THEN rs.shift_id ELSE e.shift_id END
+WHERE e.id IN (SELECT value FROM json_each(:ids))
+  AND e.status = 'Active'
+  AND (e.hire_date IS NULL OR e.hire_date <= days.d)
+  AND (r.id IS NOT NULL OR instr(s.work_days, strftime('%w', days.d)) > 0)
+  AND NOT EXISTS (SELECT 1 FROM public_holidays h WHERE h.date = days.d)
+  AND NOT EXISTS (
+      SELECT 1 FROM leave_requests lr
+      WHERE lr.employee_id = e.id AND lr.status = 'Approved'
+        AND lr.start_date <= days.d AND lr.end_date >= days.d
+  )
+ON CONFLICT (employee_id, date) DO UPDATE SET
+    shift_id = excluded.shift_id, start_at = excluded.start_at,
+    end_at = excluded.end_at, grace_period_minutes = excluded.grace_period_minutes
+"""
+
+
+def _chunks(ids, size):
+    for i in range(0, len(ids), size):
+        yield ids[i:i + size]
+
+
+class RosterEngine:
+    def __init__(self, horizon_days=ROSTER_HORIZON_DAYS, chunk_size=ROSTER_CHUNK_EMPLOYEES):
+        self.db = DBManager()
+        self.horizon_days = horizon_days
+        self.chunk_size = chunk_size
+
+    def generated_through(self):
+        """Last day expanded for everyone, or None if the roster was never built"""
+        row = self.db.execute_query("SELECT value FROM system_settings WHERE key = ?", (PROGRESS_KEY,), fetch_one=True)
+        return date.fromisoformat(row['value']) if row and row['value'] else None
+
+    def pending(self):
+        """Number of employees queued for re-expansion"""
+        row = self.db.execute_query("SELECT COUNT(*) as n FROM shift_schedule_dirty", fetch_one=True)
+        return row['n'] if row else 0
+
+    def _expand(self, employee_ids, start, end, clear=False):
+        """
+        Expand start..end for a chunk of employees in one transaction.
+        clear: first delete their slots from start on and take them off the dirty queue.
+        """
+        ids = json.dumps(employee_ids)
+        with self.db.transaction(immediate=True):
+            if clear:
+                self.db.execute_query(
+                    "DELETE FROM shift_schedule WHERE date >= ? AND employee_id IN (SELECT value FROM json_each(?))",
+                    (str(start), ids)
+                )
+                self.db.execute_query(
+                    "DELETE FROM shift_schedule_dirty WHERE employee_id IN (SELECT value FROM json_each(?))", (ids,)
+                )
+            self.db.execute_query(EXPAND_QUERY, {'start': str(start), 'end': str(end), 'ids': ids})
+
+    def regenerate(self, full=False, today=None):
+        """
+        Bring shift_schedule up to today + horizon. full re-expands every
+        employee from today. Returns {'employees', 'extended', 'through'},
+        or None if a chunk failed (earlier chunks stay committed).
+        """
+        today = today or datetime.now().date()
+        through = self.generated_through()
+        horizon = today + timedelta(days=self.horizon_days - 1)
+        if through is not None and through > horizon:
+            horizon = through  # never leave re-expanded employees short of everyone else
+        full = full or through is None
+
+        try:
+            if full:
+                self.db.execute_query("INSERT OR IGNORE INTO shift_schedule_dirty (employee_id) SELECT id FROM employees")
+            dirty = [r['employee_id'] for r in self.db.execute_query(
+                "SELECT employee_id FROM shift_schedule_dirty ORDER BY employee_id", fetch_all=True
+            )]
+            for chunk in _chunks(dirty, self.chunk_size):
+                self._expand(chunk, today, horizon, clear=True)
+
+            # Everyone else: only the days the horizon moved forward
+            extended = 0
+            if not full and through < horizon:
+                # Days before today are history; a missed night only costs the gap from today
+                extend_from = max(through + timedelta(days=1), today)
+                queued = set(dirty)
+                others = [r['id'] for r in self.db.execute_query(
+                    "SELECT id FROM employees WHERE status = 'Active' ORDER BY id", fetch_all=True
+                ) if r['id'] not in queued]
+                for chunk in _chunks(others, self.chunk_size):
+                    self._expand(chunk, extend_from, horizon)
+                extended = len(others)
+
+            self.db.execute_query(
+                "INSERT INTO system_settings (key, value, description) VALUES (?, ?, ?) "
+                "ON CONFLICT (key) DO UPDATE SET value = excluded.value",
+                (PROGRESS_KEY, str(horizon), 'Last day expanded into shift_schedule')
+            )
+        except Exception as e:
+            logger.error(f"Roster regeneration failed: {e}")
+            return None
+
+        result = {'employees': len(dirty), 'extended': extended, 'through': str(horizon)}
+        logger.info(f"Roster regenerated: {result}")
+        return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Expand shift assignments into shift_schedule")
+    parser.add_argument('--full', action='store_true', help="re-expand every employee, not just changed ones")
+    parser.add_argument('--horizon', type=int, default=ROSTER_HORIZON_DAYS, help="days ahead to expand")
+    args = parser.parse_args()
+
+    result = RosterEngine(horizon_days=args.horizon).regenerate(full=args.full)
+    if result is None:
+        raise SystemExit("Roster regeneration failed. See log for details.")
+    print(f"Re-expanded {result['employees']} employee(s), extended {result['extended']}; "
+          f"roster now runs through {result['through']}.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,34 @@
+import os
+import pytest
+import config
+from database.db_manager import DBManager
+from database.migrate import run_migrations
+
+SCHEMA = os.path.join(config.ROOT_DIR, 'database', 'schema.sql')
+
+
+@pytest.fixture
+def db(tmp_path, monkeypatch):
+    """Fresh migrated database; models created in the test use it by default"""
+    path = str(tmp_path / 'hr.db')
+    monkeypatch.setattr(config, 'DATABASE_PATH', path)
+    db = DBManager(path)
+    db.execute_script(SCHEMA)
+    run_migrations(db)
+    db.execute_query("INSERT INTO shifts (name, start_time, end_time, grace_period_minutes) VALUES ('Day', '09:00', '17:00', 15)")
+    yield db
+    db.pool.close_all()
+
+
+@pytest.fixture
+def add_employee(db):
+    """add_employee(code, shift_id=1, **columns) -> id of a new Active employee"""
+    def add(code, shift_id=1, **columns):
+        values = {'employee_code': code, 'first_name': 'F' + code, 'last_name': 'L',
+                  'email': f"{code}@example.com", 'status': 'Active', 'shift_id': shift_id}
+        values.update(columns)
+        return db.execute_query(
+            f"INSERT INTO employees ({', '.join(values)}) VALUES ({', '.join('?' * len(values))})",
+            tuple(values.values())
+        )
+    return add
@@ -0,0 +1,34 @@
+from models.shift import Shift
+from services.absence_service import AbsenceMaterializer
+
+
+def statuses(db, day):
+    rows = db.execute_query("SELECT employee_id, status FROM attendance WHERE date = ?", (day,), fetch_all=True)
+    return {r['employee_id']: r['status'] for r in rows}
+
+
+def test_rotation_off_day_is_not_absent(db, add_employee):
+    # 2 on / 2 off from Thursday 2026-10-01: 10-07 and 10-08 are off, Saturday 10-10 is on
+    rotation_id = Shift().create_rotation('2on2off', '2026-10-01', [1, 1, None, None])
+    rotating = add_employee('R1', rotation_id=rotation_id)
+    regular = add_employee('W1')
+    materializer = AbsenceMaterializer()
+
+    materializer.materialize_day('2026-10-07')
+    materializer.materialize_day('2026-10-08')
+    assert rotating not in statuses(db, '2026-10-07')
+    assert rotating not in statuses(db, '2026-10-08')
+    assert statuses(db, '2026-10-07')[regular] == 'Absent'
+
+    materializer.materialize_day('2026-10-10')
+    assert statuses(db, '2026-10-10') == {rotating: 'Absent'}
+
+
+def test_roster_slot_decides(db, add_employee):
+    employee = add_employee('W1')
+    db.execute_query(
+        "INSERT INTO shift_schedule (employee_id, date, shift_id, start_at, end_at, grace_period_minutes) "
+        "VALUES (?, '2026-10-10', 1, '2026-10-10 09:00:00', '2026-10-10 17:00:00', 15)", (employee,)
+    )
+    AbsenceMaterializer().materialize_day('2026-10-10')
+    assert statuses(db, '2026-10-10') == {employee: 'Absent'}
@@ -0,0 +1,87 @@
+from datetime import datetime
+import pytest
+from services.anomaly_service import AnomalyDetector, MISSING_CLOCK_OUT, REPEATED_LATENESS
+
+NOW = datetime(2024, 6, 30, 12)
+
+
+@pytest.fixture
+def punch(db):
+    """punch(employee_id, day, status, updated_at, clock_out=True) -> attendance id; re-punching a day updates it"""
+    def add(employee_id, day, status, updated_at, clock_out=True):
+        return db.execute_query(
+            "INSERT INTO attendance (employee_id, date, clock_in, clock_out, status, updated_at) "
+            "VALUES (?, ?, ?, ?, ?, ?) ON CONFLICT (employee_id, date) DO UPDATE SET "
+            "status = excluded.status, clock_out = excluded.clock_out, updated_at = excluded.updated_at",
+            (employee_id, day, f"{day} 09:20:00", f"{day} 17:00:00" if clock_out else None, status, updated_at)
+        )
+    return add
+
+
+def _findings(db, kind=None):
+    rows = db.execute_query(
+        "SELECT a.date, f.kind, f.detail FROM attendance_anomalies f JOIN attendance a ON a.id = f.attendance_id "
+        "ORDER BY a.date, f.kind", fetch_all=True
+    )
+    return [(r['date'], r['detail']) for r in rows if kind is None or r['kind'] == kind]
+
+
+def _snapshot(db):
+    return [db.execute_query(f"SELECT * FROM {table} ORDER BY 1", fetch_all=True)
+            for table in ('attendance_anomalies', 'attendance_anomaly_pending', 'attendance_anomaly_state')]
+
+
+def test_lateness_out_of_order_and_cleared(db, add_employee, punch):
+    employee_id = add_employee('A')
+    detector = AnomalyDetector()
+    punch(employee_id, '2024-06-03', 'Late', '2024-06-05 10:00:00')
+    punch(employee_id, '2024-06-05', 'Late', '2024-06-05 10:00:01')
+    assert detector.run(now=NOW)['scanned'] == 2
+    assert _findings(db) == []
+
+    # The late day in between arrives after the later one was processed
+    punch(employee_id, '2024-06-04', 'Late', '2024-06-06 10:00:00')
+    detector.run(now=NOW)
+    assert _findings(db, REPEATED_LATENESS) == [
+        ('2024-06-05', '3 late arrivals in 14 days'),
+    ]
+
+    # Late -> Present: back under the threshold, the finding goes away
+    punch(employee_id, '2024-06-04', 'Present', '2024-06-07 10:00:00')
+    detector.run(now=NOW)
+    assert _findings(db) == []
+    state = db.execute_query("SELECT late FROM attendance_anomaly_state WHERE employee_id = ?", (employee_id,),
+                             fetch_one=True)
+    assert '2024-06-04' not in state['late']
+
+
+def test_pending_clock_out_flagged_when_overdue(db, add_employee, punch):
+    a, b = add_employee('A'), add_employee('B')
+    detector = AnomalyDetector()
+    punch(a, '2024-06-10', 'Present', '2024-06-10 09:20:00', clock_out=False)
+    punch(b, '2024-06-10', 'Present', '2024-06-10 11:00:00')
+    summary = detector.run(now=datetime(2024, 6, 10, 12))
+    assert (summary['found'], summary['overdue']) == (0, 0)
+    assert db.execute_query("SELECT deadline FROM attendance_anomaly_pending", fetch_one=True)['deadline'] \
+        == '2024-06-10 21:00:00'
+
+    # Only B's record is inside the re-read overlap; A's punch is flagged from the pending table
+    summary = detector.run(now=datetime(2024, 6, 10, 22))
+    assert (summary['scanned'], summary['overdue']) == (1, 1)
+    assert _findings(db, MISSING_CLOCK_OUT) == [('2024-06-10', 'No clock-out by 2024-06-10 21:00')]
+    assert db.execute_query("SELECT COUNT(*) as n FROM attendance_anomaly_pending", fetch_one=True)['n'] == 0
+
+
+def test_rerun_without_changes_is_a_no_op(db, add_employee, punch):
+    employee_id = add_employee('A')
+    detector = AnomalyDetector()
+    for n, day in enumerate(('2024-06-03', '2024-06-04', '2024-06-05')):
+        punch(employee_id, day, 'Late', f"2024-06-05 10:00:0{n}")
+    punch(employee_id, '2024-06-06', 'Present', '2024-06-06 09:20:00', clock_out=False)
+    detector.run(now=datetime(2024, 6, 6, 12))
+    before = _snapshot(db)
+    assert before[0] and before[1] and before[2]
+
+    summary = detector.run(now=datetime(2024, 6, 6, 12))
+    assert (summary['found'], summary['overdue']) == (0, 0)
+    assert _snapshot(db) == before
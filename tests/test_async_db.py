@@ -0,0 +1,22 @@
+import asyncio
+from database.async_db import AsyncDBManager
+
+
+def test_iter_query_fetches_a_chunk_per_executor_hop(db):
+    db.execute_many("INSERT INTO departments (name) VALUES (?)", None, [(f"D{i}",) for i in range(25)])
+    adb = AsyncDBManager(db)
+    hops = 0
+    run = adb.run
+
+    async def counting_run(fn, *args, **kwargs):
+        nonlocal hops
+        hops += 1
+        return await run(fn, *args, **kwargs)
+    adb.run = counting_run
+
+    async def collect():
+        return [row['name'] async for row in adb.iter_query("SELECT name FROM departments ORDER BY id", chunk_size=10)]
+
+    names = asyncio.run(collect())
+    assert names == [f"D{i}" for i in range(25)]
+    assert hops == 4  # three chunks (10, 10, 5) and closing the generator
@@ -0,0 +1,56 @@
+from datetime import datetime
+from models.attendance import Attendance
+from models.employee import Employee
+from models.shift import Shift
+from models.shift_cache import get_shift_cache
+from services.attendance_service import AttendanceService
+
+NOW = datetime(2024, 6, 3, 9, 30)  # no roster slots this far back: status comes from :status or the shift
+
+
+def _count(db):
+    return db.execute_query("SELECT COUNT(*) as n FROM attendance", fetch_one=True)['n']
+
+
+def test_clock_in_query(db, add_employee):
+    a, b = add_employee('A'), add_employee('B')
+    model = Attendance()
+    # Cached status wins over the shift (09:30 is past 09:00 + 15 minutes)
+    assert model.clock_in(a, NOW, status='Present')['status'] == 'Present'
+    # Without one, the shift is looked up in SQL
+    assert model.clock_in(b, NOW)['status'] == 'Late'
+    # Second punch and unknown employee insert nothing, with or without a status
+    assert model.clock_in(a, NOW, status='Present') is None
+    assert model.clock_in(999, NOW, status='Present') is None
+    assert model.clock_in(999, NOW) is None
+    assert _count(db) == 2
+
+
+def test_clock_in_employee_deleted_behind_cache(db, add_employee):
+    employee_id = add_employee('A')
+    service = AttendanceService()
+    assert service.shift_cache.shift_for(employee_id)[0] is not None
+    # Removed by another process: this process's cache still has them
+    db.execute_query("DELETE FROM employees WHERE id = ?", (employee_id,))
+    assert service.shift_cache.shift_for(employee_id)[0] is not None
+
+    assert service.clock_in(employee_id) == (False, "Employee not found.")
+    assert _count(db) == 0
+
+
+def test_shift_cache_invalidation(db, add_employee):
+    employee_id = add_employee('A')
+    cache = get_shift_cache(db.db_path)
+    assert cache.shift_for(employee_id)[1].name == 'Day'
+
+    late_id = Shift().create('Late', '13:00', '21:00', 10)
+    assert cache.get_shift(late_id).name == 'Late'
+
+    Employee().update_employee(employee_id, {'shift_id': late_id, 'first_name': 'Renamed'})
+    employee, shift = cache.shift_for(employee_id)
+    assert (employee.first_name, shift.name) == ('Renamed', 'Late')
+
+    Employee().update_employee(employee_id, {'shift_id': 1})
+    Shift().delete(late_id)
+    assert cache.get_shift(late_id) is None
+    assert cache.shift_for(employee_id)[1].name == 'Day'
@@ -0,0 +1,33 @@
+from datetime import datetime, timedelta
+import database.backup as backup
+
+NOW = datetime(2024, 6, 3, 2, 0, 0, 123456)
+
+
+def test_snapshots_in_the_same_instant_get_their_own_files(db, tmp_path, monkeypatch):
+    # The second snapshot's clock reads the first one's instant, then one claimed by a backup in progress
+    ticks = iter([NOW, NOW, NOW + timedelta(microseconds=1), NOW + timedelta(microseconds=2)])
+
+    class Clock(datetime):
+        @classmethod
+        def now(cls, tz=None):
+            return next(ticks)
+
+    monkeypatch.setattr(backup, 'datetime', Clock)
+    db.execute_query("CREATE TABLE marker (x)")
+    backup_dir = str(tmp_path / 'backups')
+    first = backup.create_snapshot(db.db_path, backup_dir, sleep=0)
+    in_progress = tmp_path / 'backups' / 'hr-20240603-020000-123457.db.partial'
+    in_progress.write_bytes(b'')
+    second = backup.create_snapshot(db.db_path, backup_dir, sleep=0)
+    assert second.endswith('hr-20240603-020000-123458.db')
+    assert in_progress.read_bytes() == b''
+
+    # A snapshot from before microsecond names is still listed
+    legacy = tmp_path / 'backups' / 'hr-20240602-020000.db'
+    legacy.write_bytes(b'')
+    snapshots = backup.list_snapshots(backup_dir)
+    assert [s['path'] for s in snapshots] == [second, first, str(legacy)]
+    assert [s['created'] for s in snapshots] == [NOW + timedelta(microseconds=2), NOW, datetime(2024, 6, 2, 2)]
+    assert [f.name for f in (tmp_path / 'backups').iterdir() if f.suffix == '.partial'] == [in_progress.name]
+    assert backup.open_snapshot(second).execute_query("SELECT COUNT(*) as n FROM marker", fetch_one=True)['n'] == 0
@@ -0,0 +1,62 @@
+from datetime import date
+from models.attendance import Attendance
+from services.calendar_service import CalendarFeed, add_months, month_range
+
+
+def add_day(db, employee_id, day, status='Present'):
+    return db.execute_query(
+        "INSERT INTO attendance (employee_id, date, status, total_hours) VALUES (?, ?, ?, 8)",
+        (employee_id, day, status)
+    )
+
+
+def counting(feed):
+    """Wrap feed.db.execute_query; returns the list of statements it runs"""
+    calls = []
+    execute = feed.db.execute_query
+
+    def wrapper(query, *args, **kwargs):
+        calls.append(query)
+        return execute(query, *args, **kwargs)
+    feed.db.execute_query = wrapper
+    return calls
+
+
+def test_events_are_limited_to_the_range(db, add_employee):
+    employee = add_employee('E1')
+    other = add_employee('E2')
+    for day in ('2026-09-30', '2026-10-01', '2026-10-15', '2026-10-31', '2026-11-01'):
+        add_day(db, employee, day)
+    add_day(db, other, '2026-10-02')
+    db.execute_query("INSERT INTO public_holidays (date, name, year) VALUES ('2026-10-20', 'Fête', 2026)")
+
+    events = CalendarFeed(db.db_path).events(employee, '2026-10-01', '2026-11-01')
+    assert sorted(e['start'] for e in events) == ['2026-10-01', '2026-10-15', '2026-10-20', '2026-10-31']
+
+    week = CalendarFeed(db.db_path).events(employee, date(2026, 10, 12), date(2026, 10, 19))
+    assert [e['start'] for e in week] == ['2026-10-15']
+
+
+def test_neighbouring_months_are_prefetched(db, add_employee):
+    employee = add_employee('E1')
+    add_day(db, employee, '2026-09-10')
+    add_day(db, employee, '2026-11-10')
+    feed = CalendarFeed(db.db_path)
+    calls = counting(feed)
+
+    feed.events(employee, '2026-10-01', '2026-11-01')
+    assert len(calls) == 2  # one range query for attendance, one for holidays
+
+    # Previous and next month come from the cache
+    assert [e['start'] for e in feed.events(employee, '2026-09-01', '2026-10-01')] == ['2026-09-10']
+    assert [e['start'] for e in feed.events(employee, '2026-11-01', '2026-12-01')] == ['2026-11-10']
+    assert len(calls) == 2
+
+    # A write invalidates the employee's months
+    Attendance().update_record(add_day(db, employee, '2026-11-11'), {'status': 'Late'}, employee_id=employee)
+    assert len(feed.events(employee, '2026-11-01', '2026-12-01')) == 2
+
+
+def test_month_helpers():
+    assert month_range(date(2026, 12, 15)) == (date(2026, 12, 1), date(2027, 1, 1))
+    assert add_months(date(2026, 1, 31), -1) == date(2025, 12, 1)
@@ -0,0 +1,89 @@
+import sqlite3
+import pytest
+from database.db_manager import ConnectionPool, DBManager
+
+
+@pytest.mark.parametrize('row_format', ['columns', 'dicts'])
+def test_iter_query_rejects_unstreamable_row_format(db, row_format):
+    with pytest.raises(ValueError):
+        db.iter_query("SELECT * FROM shifts", row_format=row_format)
+
+
+def test_iter_query_streams_records(db):
+    rows = list(db.iter_query("SELECT name FROM shifts", row_format='record'))
+    assert [r.name for r in rows] == ['Day']
+
+
+def department_names(db):
+    return [r['name'] for r in db.execute_query("SELECT name FROM departments ORDER BY id", fetch_all=True)]
+
+
+def test_transaction_commits_once_on_success(db):
+    other = DBManager(db.db_path)
+    with db.transaction():
+        db.execute_query("INSERT INTO departments (name) VALUES ('A')")
+        other.execute_query("INSERT INTO departments (name) VALUES ('B')")  # joins the same connection
+        assert db.in_transaction() and other.in_transaction()
+    assert not db.in_transaction()
+    assert department_names(db) == ['A', 'B']
+
+
+def test_transaction_rolls_back_and_raises(db):
+    with pytest.raises(sqlite3.IntegrityError):
+        with db.transaction():
+            db.execute_query("INSERT INTO departments (name) VALUES ('A')")
+            db.execute_query("INSERT INTO departments (name) VALUES ('A')")  # UNIQUE: raises inside the block
+    assert department_names(db) == []
+    # Outside a transaction the same error is logged and swallowed
+    assert db.execute_query("INSERT INTO departments (name) VALUES (NULL)") is None
+
+
+def test_nested_transaction_joins_the_outer_one(db):
+    with pytest.raises(RuntimeError):
+        with db.transaction():
+            with db.transaction():
+                db.execute_query("INSERT INTO departments (name) VALUES ('A')")
+            assert department_names(db) == ['A']  # inner exit did not commit on its own
+            raise RuntimeError("abort")
+    assert department_names(db) == []
+
+
+def test_write_and_write_unit_join_an_open_transaction(db):
+    with pytest.raises(RuntimeError):
+        with db.transaction(immediate=True):
+            db.write("INSERT INTO departments (name) VALUES (?)", ('A',))
+            db.write_unit(db.execute_query, "INSERT INTO departments (name) VALUES ('B')")
+            raise RuntimeError("abort")
+    assert department_names(db) == []
+
+
+def test_write_unit_failure_undoes_its_writes(db):
+    def unit():
+        db.execute_query("INSERT INTO departments (name) VALUES ('A')")
+        raise ValueError("bad unit")
+
+    assert db.write("INSERT INTO departments (name) VALUES (?)", ('Kept',))
+    with pytest.raises(ValueError):
+        db.write_unit(unit)
+    assert department_names(db) == ['Kept']
+
+
+def test_writer_that_cannot_connect_fails_its_jobs_and_restarts(tmp_path):
+    folder = tmp_path / 'not-yet'
+    pool = ConnectionPool(str(folder / 'hr.db'), pragmas={})
+    first = pool.writer()
+    futures = [first.submit(lambda conn: 1) for _ in range(3)]
+    for future in futures:
+        with pytest.raises(sqlite3.OperationalError):
+            future.result(timeout=5)
+    first.join(timeout=5)
+    assert not first.is_alive()
+    # Late submits to the stopped writer fail instead of hanging
+    with pytest.raises(sqlite3.OperationalError):
+        first.submit(lambda conn: 1).result(timeout=5)
+
+    folder.mkdir()
+    second = pool.writer()
+    assert second is not first
+    assert second.submit(lambda conn: conn.execute("CREATE TABLE t (x)") and 'ok').result(timeout=5) == 'ok'
+    pool.close_all()
@@ -0,0 +1,24 @@
+import pytest
+from models.employee import Employee, DuplicatePinError
+
+
+def employee_data(code, pin):
+    return {
+        'first_name': 'F', 'last_name': 'L', 'email': f"{code}@example.com", 'phone': '',
+        'national_id': '', 'address': '', 'employee_code': code, 'department_id': None,
+        'position': '', 'hire_date': None, 'salary': 0, 'hourly_rate': 0, 'status': 'Active',
+        'pin_code': pin,
+    }
+
+
+def test_duplicate_pin_raises(db):
+    model = Employee()
+    first = model.create_employee(employee_data('E1', '1234'))
+    second = model.create_employee(employee_data('E2', '5678'))
+    assert first and second
+
+    with pytest.raises(DuplicatePinError):
+        model.create_employee(employee_data('E3', '1234'))
+    with pytest.raises(DuplicatePinError):
+        model.update_employee(second, {'pin_code': '1234'})
+    assert db.execute_query("SELECT COUNT(*) as n FROM employees", fetch_one=True)['n'] == 2
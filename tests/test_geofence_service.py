@@ -0,0 +1,61 @@
+import math
+import numpy as np
+from utils.geo import EARTH_RADIUS_M
+from models.site import Site
+from models.site_index import OFF_SITE, ON_SITE
+from services.geofence_service import GeofenceScanner, locate_array
+
+
+def _rim(lat, lon, radius_m, n=72):
+    """n points just inside a circle's edge, all the way round"""
+    p, angle = math.radians(lat), radius_m * 0.9999 / EARTH_RADIUS_M
+    points = []
+    for k in range(n):
+        bearing = 2 * math.pi * k / n
+        p2 = math.asin(math.sin(p) * math.cos(angle) + math.cos(p) * math.sin(angle) * math.cos(bearing))
+        dl = math.atan2(math.sin(bearing) * math.sin(angle) * math.cos(p), math.cos(angle) - math.sin(p) * math.sin(p2))
+        points.append((math.degrees(p2), lon + math.degrees(dl)))
+    return points
+
+
+def test_locate_array_matches_locate(db):
+    site = Site()
+    site.create('Depot', 51.500, -0.120, radius_m=300)
+    site.create('Annex', 51.502, -0.120, radius_m=400)  # overlaps Depot; Depot was added first
+    # L-shaped (concave) polygon overlapping Annex, with a radius that must be ignored
+    site.create('Yard', 51.503, -0.118, radius_m=5000, polygon=[
+        (51.501, -0.119), (51.506, -0.119), (51.506, -0.117), (51.503, -0.117), (51.503, -0.110), (51.501, -0.110),
+    ])
+    site.create('Campus', 51.520, -0.100, radius_m=2500)  # spans several grid cells
+    index = site.index
+
+    rng = np.random.default_rng(24)
+    lat = rng.uniform(51.490, 51.545, 20000)
+    lon = rng.uniform(-0.140, -0.065, 20000)
+    site_ids = locate_array(np, index.sites(), lat, lon)
+
+    expected = [getattr(index.locate(a, o), 'id', 0) for a, o in zip(lat.tolist(), lon.tolist())]
+    assert site_ids.tolist() == expected
+    # Every site (and open ground) is actually hit by some point
+    assert set(expected) == {0} | {s.id for s in index.sites()}
+
+
+def test_circle_edge_is_inside_its_cells(db):
+    site = Site()
+    for name, lat, lon, radius in (('Depot', 51.5, -0.12, 300), ('Campus', 51.6, -0.3, 2500),
+                                   ('Arctic', 69.0, 20.0, 50000)):
+        site_id = site.create(name, lat, lon, radius_m=radius)
+        rim = np.array(_rim(lat, lon, radius))
+        assert [getattr(site.index.locate(a, o), 'id', 0) for a, o in rim.tolist()] == [site_id] * len(rim)
+        assert locate_array(np, site.index.sites(), rim[:, 0], rim[:, 1]).tolist() == [site_id] * len(rim)
+
+
+def test_classify_without_sites(db):
+    index = Site().index
+    assert index.classify((51.5, -0.12)) == (None, None)
+    assert index.classify((None, None)) == (None, None)
+    assert GeofenceScanner().scan('2024-06-01', '2024-06-30') == {'scanned': 0, 'on_site': 0, 'off_site': 0, 'updated': 0}
+
+    site_id = Site().create('Depot', 51.500, -0.120, radius_m=300)
+    assert index.classify((51.5, -0.12)) == (ON_SITE, site_id)
+    assert index.classify((51.6, -0.12)) == (OFF_SITE, None)
@@ -0,0 +1,90 @@
+import random
+from datetime import datetime, timedelta
+import numpy as np
+from services.hours_service import HoursRecomputer
+from utils.calculators import calculate_work_hours, calculate_work_hours_batch
+
+
+def _assert_parity(clock_in, clock_out, breaks, work_hours):
+    batch = calculate_work_hours_batch(
+        np.array(clock_in, dtype='datetime64[us]'), np.array(clock_out, dtype='datetime64[us]'),
+        np.array(breaks, dtype='float64'), work_hours,
+    )
+    for i, (cin, cout, brk) in enumerate(zip(clock_in, clock_out, breaks)):
+        expected = calculate_work_hours(cin, cout, brk, work_hours)
+        assert tuple(float(column[i]) for column in batch) == expected, (cin, cout, brk)
+
+
+def test_batch_matches_scalar_on_random_records():
+    rng = random.Random(20241018)
+    base = datetime(2024, 6, 3, 6)
+    clock_in, clock_out, breaks = [], [], []
+    for _ in range(5000):
+        cin = base + timedelta(seconds=rng.randrange(0, 6 * 3600), microseconds=rng.randrange(0, 10**6))
+        clock_in.append(cin)
+        clock_out.append(cin + timedelta(seconds=rng.randrange(0, 16 * 3600), microseconds=rng.randrange(0, 10**6)))
+        breaks.append(rng.choice([0, 15, 30, 45, 60, 90]))
+    _assert_parity(clock_in, clock_out, breaks, 8.0)
+    _assert_parity(clock_in, clock_out, breaks, 7.5)
+
+
+def test_batch_matches_scalar_on_half_way_values():
+    # Every multiple of 18 s is a whole number of 0.005 h: x.xx5 hours, where np.round and round() can disagree
+    cin = datetime(2024, 6, 3, 8)
+    clock_in, clock_out, breaks = [], [], []
+    for n in range(0, 16 * 200):
+        for brk in (0, 30, 45):
+            clock_in.append(cin)
+            clock_out.append(cin + timedelta(seconds=18 * n))
+            breaks.append(brk)
+    _assert_parity(clock_in, clock_out, breaks, 8.0)
+
+
+def test_batch_missing_clock_out_is_zero():
+    total, regular, overtime = calculate_work_hours_batch(
+        np.array(['2024-06-03T09:00', '2024-06-03T09:00'], dtype='datetime64[us]'),
+        np.array(['NaT', '2024-06-03T19:00'], dtype='datetime64[us]'),
+        60, 8.0,
+    )
+    assert total.tolist() == [0.0, 9.0]
+    assert regular.tolist() == [0.0, 8.0]
+    assert overtime.tolist() == [0.0, 1.0]
+
+
+def test_recompute_period_writes_only_changed_rows(db, add_employee):
+    ids = [add_employee(code) for code in ('A', 'B', 'C', 'D')]
+    day = '2024-06-03'
+    cin, cout = datetime(2024, 6, 3, 9), datetime(2024, 6, 3, 18, 30)
+    correct = calculate_work_hours(cin, cout, 60, 8.0)
+    rows = {
+        'current': (ids[0], correct),
+        'stale': (ids[1], (8.0, 8.0, 0.0)),
+        'null': (ids[2], (None, None, None)),
+    }
+    record = {}
+    for name, (employee_id, hours) in rows.items():
+        record[name] = db.execute_query(
+            "INSERT INTO attendance (employee_id, date, clock_in, clock_out, break_duration, total_hours, "
+            "regular_hours, overtime_hours, updated_at) VALUES (?, ?, ?, ?, 60, ?, ?, ?, '2000-01-01 00:00:00')",
+            (employee_id, day, cin, cout) + hours
+        )
+    # Still clocked in: not a closed record, never touched
+    record['open'] = db.execute_query(
+        "INSERT INTO attendance (employee_id, date, clock_in, updated_at) VALUES (?, ?, ?, '2000-01-01 00:00:00')",
+        (ids[3], day, cin)
+    )
+
+    summary = HoursRecomputer(chunk_size=2).recompute_period(day, day, work_hours=8.0)
+    assert summary == {'scanned': 3, 'updated': 2, 'failed': 0}
+
+    stored = {r['id']: r for r in db.execute_query(
+        "SELECT id, total_hours, regular_hours, overtime_hours, updated_at FROM attendance", fetch_all=True)}
+    untouched = {record['current'], record['open']}
+    for name, attendance_id in record.items():
+        row = stored[attendance_id]
+        assert (row['updated_at'] == '2000-01-01 00:00:00') == (attendance_id in untouched), name
+        if name != 'open':
+            assert (row['total_hours'], row['regular_hours'], row['overtime_hours']) == correct, name
+
+    # Nothing left to change on a second pass
+    assert HoursRecomputer().recompute_period(day, day, work_hours=8.0) == {'scanned': 3, 'updated': 0, 'failed': 0}
@@ -0,0 +1,62 @@
+import csv
+import io
+from services.import_service import AttendanceImporter
+
+
+def _import(tmp_path, text, name='clock.csv'):
+    importer = AttendanceImporter(chunk_size=2, report_dir=str(tmp_path / 'reports'))
+    return importer.import_file(io.BytesIO(text.encode('utf-8')), name)
+
+
+def _records(db):
+    rows = db.execute_query(
+        "SELECT e.employee_code, a.date, a.clock_in, a.clock_out, a.total_hours, a.regular_hours, "
+        "a.overtime_hours, a.status, a.notes FROM attendance a JOIN employees e ON e.id = a.employee_id",
+        fetch_all=True
+    )
+    return {(r['employee_code'], r['date']): r for r in rows}
+
+
+def test_import_file(db, add_employee, tmp_path):
+    add_employee('A')
+    add_employee('B')
+    summary = _import(tmp_path, (
+        "Badge,Work Date,Time In,Time-Out,Note\n"
+        "a,2024-06-03,09:05,17:35,\n"
+        "B,2024-06-03,22:00,06:30,night\n"
+        "ZZZ,2024-06-03,09:00,17:00,\n"
+        "A,2024-06-04,09:30,,\n"
+        "A,06/05/2024,09:00,17:00,\n"
+    ))
+    assert {k: summary[k] for k in ('rows', 'imported', 'rejected')} == {'rows': 5, 'imported': 3, 'rejected': 2}
+
+    records = _records(db)
+    day = records[('A', '2024-06-03')]
+    assert (day['total_hours'], day['regular_hours'], day['overtime_hours'], day['status']) == (7.5, 7.5, 0.0, 'Present')
+    night = records[('B', '2024-06-03')]
+    assert night['clock_out'].startswith('2024-06-04 06:30')
+    assert (night['total_hours'], night['status'], night['notes']) == (7.5, 'Late', 'night')
+    # Still clocked in: hours stay NULL until clock-out
+    open_day = records[('A', '2024-06-04')]
+    assert (open_day['total_hours'], open_day['regular_hours'], open_day['overtime_hours']) == (None, None, None)
+    assert open_day['status'] == 'Late'
+
+    with open(summary['error_report'], newline='', encoding='utf-8') as f:
+        report = list(csv.DictReader(f))
+    assert [(r['line'], r['employee_code']) for r in report] == [('4', 'ZZZ'), ('6', 'A')]
+    assert 'unknown employee_code' in report[0]['error']
+    assert 'invalid date' in report[1]['error']
+
+    # Re-importing a day overwrites it in place
+    summary = _import(tmp_path, "employee_code,date,clock_in,clock_out\nA,2024-06-03,08:55,18:55\n", 'fix.csv')
+    assert (summary['imported'], summary['error_report']) == (1, None)
+    records = _records(db)
+    assert len(records) == 3
+    day = records[('A', '2024-06-03')]
+    assert (day['total_hours'], day['regular_hours'], day['overtime_hours'], day['status']) == (9.0, 8.0, 1.0, 'Present')
+
+
+def test_import_missing_column(db, tmp_path):
+    summary = _import(tmp_path, "badge,date\nA,2024-06-03\n")
+    assert summary['imported'] == 0
+    assert summary['errors'][0]['error'] == 'file error: missing column(s): clock_in'
@@ -0,0 +1,38 @@
+from services.pin_service import PinResolver
+from utils.pins import pin_digest
+
+
+def _set_pin(db, employee_id, pin, **columns):
+    """A write from another process: this process's roster version is not bumped"""
+    values = {'pin_digest': pin_digest(pin), **columns}
+    db.execute_query(
+        f"UPDATE employees SET {', '.join(f'{k} = ?' for k in values)} WHERE id = ?",
+        (*values.values(), employee_id)
+    )
+
+
+def test_hits_see_changes_from_other_processes(db, add_employee):
+    a, b = add_employee('A'), add_employee('B')
+    _set_pin(db, a, '1234')
+    resolver = PinResolver(db.db_path)
+    assert resolver.resolve('1234').id == a
+
+    # Changed elsewhere: the old PIN stops resolving, the new one is found
+    _set_pin(db, a, '5678')
+    assert resolver.resolve('1234') is None
+    assert resolver.resolve('5678').id == a
+
+    # Deactivated elsewhere: the hit carries the current status
+    _set_pin(db, a, '5678', status='Inactive')
+    assert resolver.resolve('5678').status == 'Inactive'
+
+    # Revoked, then handed to someone else
+    _set_pin(db, a, None)
+    assert resolver.resolve('5678') is None
+    _set_pin(db, b, '5678')
+    assert resolver.resolve('5678').id == b
+
+    # Employee row removed
+    db.execute_query("DELETE FROM employees WHERE id = ?", (b,))
+    assert resolver.resolve('5678') is None
+    assert resolver.stats()['pins'] == 0
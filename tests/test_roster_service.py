@@ -0,0 +1,107 @@
+from datetime import date, timedelta
+import pytest
+from models.shift import Shift
+from services.roster_service import RosterEngine
+
+# The schedule triggers compare against date('now', 'localtime'), so the
+# tests work relative to the real today
+TODAY = date.today()
+HORIZON = 14
+
+
+def day(n):
+    return str(TODAY + timedelta(days=n))
+
+
+@pytest.fixture
+def roster(db, add_employee):
+    """Two employees on two every-day shifts, expanded for HORIZON days"""
+    db.execute_query("UPDATE shifts SET work_days = '0123456' WHERE id = 1")
+    db.execute_query("INSERT INTO shifts (name, start_time, end_time, grace_period_minutes, work_days) "
+                     "VALUES ('Late', '13:00', '21:00', 15, '0123456')")
+    first, second = add_employee('A', shift_id=1), add_employee('B', shift_id=2)
+    engine = RosterEngine(horizon_days=HORIZON)
+    result = engine.regenerate(today=TODAY)
+    assert result == {'employees': 2, 'extended': 0, 'through': day(HORIZON - 1)}
+    return engine, first, second
+
+
+def slots(db, employee_id):
+    rows = db.execute_query("SELECT date FROM shift_schedule WHERE employee_id = ? ORDER BY date",
+                            (employee_id,), fetch_all=True)
+    return [r['date'] for r in rows]
+
+
+def dirty(db):
+    return {r['employee_id'] for r in db.execute_query("SELECT employee_id FROM shift_schedule_dirty", fetch_all=True)}
+
+
+def test_full_expansion(db, roster):
+    engine, first, second = roster
+    assert slots(db, first) == [day(n) for n in range(HORIZON)]
+    assert slots(db, second) == [day(n) for n in range(HORIZON)]
+    assert engine.pending() == 0
+    assert engine.generated_through() == TODAY + timedelta(days=HORIZON - 1)
+
+
+def test_shift_change_queues_only_its_employees(db, roster):
+    engine, first, second = roster
+    db.execute_query("UPDATE shifts SET start_time = '14:00' WHERE id = 2")
+    assert dirty(db) == {second}
+    assert slots(db, second) == [] and len(slots(db, first)) == HORIZON
+
+    assert engine.regenerate(today=TODAY)['employees'] == 1
+    start = db.execute_query("SELECT start_at FROM shift_schedule WHERE employee_id = ? AND date = ?",
+                             (second, day(1)), fetch_one=True)['start_at']
+    assert start == f"{day(1)} 14:00:00"
+
+
+def test_employee_change_queues_only_that_employee(db, roster):
+    engine, first, second = roster
+    db.execute_query("UPDATE employees SET shift_id = 2 WHERE id = ?", (first,))
+    assert dirty(db) == {first}
+    db.execute_query("UPDATE employees SET first_name = 'Renamed' WHERE id = ?", (second,))
+    assert dirty(db) == {first}
+
+
+def test_approved_leave_removes_its_slots(db, roster):
+    _, first, second = roster
+    db.execute_query("INSERT INTO leave_requests (employee_id, leave_type_id, start_date, end_date, status) "
+                     "VALUES (?, 1, ?, ?, 'Approved')", (first, day(2), day(3)))
+    assert day(2) not in slots(db, first) and day(3) not in slots(db, first)
+    assert len(slots(db, first)) == HORIZON - 2
+    assert len(slots(db, second)) == HORIZON
+    assert dirty(db) == set()
+
+
+def test_deleted_holiday_refills_the_day(db, roster):
+    engine, first, second = roster
+    db.execute_query("INSERT INTO public_holidays (date, name, year) VALUES (?, 'Holiday', 2026)", (day(5),))
+    assert day(5) not in slots(db, first) and day(5) not in slots(db, second)
+
+    db.execute_query("DELETE FROM public_holidays WHERE date = ?", (day(5),))
+    assert dirty(db) == {first, second}
+    engine.regenerate(today=TODAY)
+    assert day(5) in slots(db, first) and day(5) in slots(db, second)
+
+
+def test_regenerate_extends_only_the_horizon_gap(db, roster):
+    engine, first, second = roster
+    # Marker on an existing slot: re-expanding that day would overwrite it
+    db.execute_query("UPDATE shift_schedule SET grace_period_minutes = 99 WHERE date = ?", (day(5),))
+
+    later = TODAY + timedelta(days=3)
+    result = engine.regenerate(today=later)
+    assert result == {'employees': 0, 'extended': 2, 'through': day(HORIZON + 2)}
+    assert slots(db, first)[-3:] == [day(HORIZON), day(HORIZON + 1), day(HORIZON + 2)]
+    marked = db.execute_query("SELECT COUNT(*) as n FROM shift_schedule WHERE date = ? AND grace_period_minutes = 99",
+                              (day(5),), fetch_one=True)['n']
+    assert marked == 2
+
+
+def test_rotation_follows_the_cycle_around_its_anchor(db, add_employee):
+    # Anchored tomorrow: today is index -1, which must wrap to 2 (a working day), not stay negative
+    rotation_id = Shift().create_rotation('on-off-on', day(1), [1, None, 1])
+    employee = add_employee('R', rotation_id=rotation_id)
+    RosterEngine(horizon_days=HORIZON).regenerate(today=TODAY)
+    assert slots(db, employee) == [day(n) for n in range(HORIZON) if (n - 1) % 3 != 1]
@@ -44,6 +44,8 @@ def render_sidebar():
         ("pages/11_🛡️_Audit_Logs.py", "Audit Logs", "🛡️", ['Admin']),
         ("pages/12_👤_User_Management.py", "User Management", "👤", ['Admin']),
         ("pages/13_💸_Expenses.py", "Expenses", "💸", None),
+        ("pages/14_🐢_Query_Performance.py", "Query Performance", "🐢", ['Admin']),
+        ("pages/15_🚨_Anomalies.py", "Anomalies", "🚨", ['Admin']),
     ]
 
     with st.sidebar:
@@ -1,6 +1,6 @@
 from datetime import datetime, timedelta
 import math
-from config import DEFAULT_WORK_HOURS
+from config import DEFAULT_BREAK_DURATION, DEFAULT_WORK_HOURS
 
 def calculate_time_difference(start_time, end_time):
     """Calculate difference in hours between two datetime objects"""
@@ -15,9 +15,9 @@ def calculate_time_difference(start_time, end_time):
     hours = diff.total_seconds() / 3600
     return round(bytes_to_float=hours, ndigits=2)
 
-def calculate_work_hours(clock_in, clock_out, break_duration_minutes=60):
+def calculate_work_hours(clock_in, clock_out, break_duration_minutes=DEFAULT_BREAK_DURATION, work_hours=DEFAULT_WORK_HOURS):
     """
-    Calculate total and regular hours.
+    Calculate total and regular hours; hours past work_hours are overtime.
     Returns: (total_hours, regular_hours, overtime_hours)
     """
     if not clock_in or not clock_out:
@@ -30,8 +30,8 @@ def calculate_work_hours(clock_in, clock_out, break_duration_minutes=60):
     break_hours = break_duration_minutes / 60
     actual_work_hours = max(0.0, total_hours_raw - break_hours)
     
-    regular_hours = min(actual_work_hours, DEFAULT_WORK_HOURS)
-    overtime_hours = max(0.0, actual_work_hours - DEFAULT_WORK_HOURS)
+    regular_hours = min(actual_work_hours, work_hours)
+    overtime_hours = max(0.0, actual_work_hours - work_hours)
     
     return (
         round(actual_work_hours, 2),
@@ -39,6 +39,62 @@ def calculate_work_hours(clock_in, clock_out, break_duration_minutes=60):
         round(overtime_hours, 2)
     )
 
+def _round2(np, values):
+    """
+    round(x, 2) for each element, bit-for-bit. np.round scales by 100 and
+    rounds half to even on the scaled value, which can disagree with Python's
+    correctly rounded round() when x * 100 lands next to a .5; those few
+    elements are redone with round().
+    """
+    rounded = np.round(values, 2)
+    scaled = values * 100
+    close = np.abs(scaled - np.floor(scaled) - 0.5) < 1e-6
+    for i in np.flatnonzero(close):
+        rounded[i] = round(float(values[i]), 2)
+    return rounded
+
+def calculate_work_hours_batch(clock_in, clock_out, break_minutes=DEFAULT_BREAK_DURATION, work_hours=DEFAULT_WORK_HOURS):
+    """
+    calculate_work_hours over arrays: clock_in/clock_out are datetime64 arrays
+    (or anything np.asarray turns into one; NaT where missing), break_minutes
+    and work_hours arrays or scalars. Returns (total, regular, overtime)
+    float64 arrays, equal element for element to the scalar function.
+    """
+    import numpy as np  # pandas dependency; only batch jobs need it
+
+    clock_in = np.asarray(clock_in, dtype='datetime64[us]')
+    clock_out = np.asarray(clock_out, dtype='datetime64[us]')
+    missing = np.isnat(clock_in) | np.isnat(clock_out)
+
+    # Same float steps as the scalar path: exact microseconds, then / 1e6 / 3600
+    micros = np.where(missing, 0, (clock_out - clock_in).astype('int64'))
+    total_raw = micros / 1e6 / 3600
+    break_hours = np.asarray(break_minutes, dtype='float64') / 60
+    actual = total_raw - break_hours
+    actual = np.where(actual > 0.0, actual, 0.0)
+
+    work_hours = np.asarray(work_hours, dtype='float64')
+    regular = np.minimum(actual, work_hours)
+    overtime = actual - work_hours
+    overtime = np.where(overtime > 0.0, overtime, 0.0)
+
+    total, regular, overtime = (
+        np.where(missing, 0.0, _round2(np, np.broadcast_to(v, missing.shape).astype('float64')))
+        for v in (actual, regular, overtime)
+    )
+    return total, regular, overtime
+
+def clock_in_status(clock_in, start_time=None, grace_minutes=None):
+    """
+    'Late' or 'Present' for a clock-in datetime against a shift start
+    ("HH:MM" or "HH:MM:SS") plus grace. Without a shift: 09:00 and 15 minutes.
+    """
+    start_time = start_time or "09:00"
+    grace_minutes = 15 if grace_minutes is None else grace_minutes
+    s_hour, s_min = map(int, start_time.split(':')[:2])
+    start = clock_in.replace(hour=s_hour, minute=s_min, second=0, microsecond=0)
+    return "Late" if clock_in > start + timedelta(minutes=grace_minutes) else "Present"
+
 def calculate_salary(hourly_rate, regular_hours, overtime_hours, overtime_rate_multiplier=1.5):
     """Calculate salary based on hours and rates"""
     regular_pay = regular_hours * hourly_rate
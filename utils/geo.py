@@ -0,0 +1,66 @@
+import math
+
+EARTH_RADIUS_M = 6371008.8
+
+
+def haversine_m(lat1, lon1, lat2, lon2):
+    """Great-circle distance in meters between two (lat, lon) points in degrees"""
+    p1, p2 = math.radians(lat1), math.radians(lat2)
+    dp, dl = p2 - p1, math.radians(lon2 - lon1)
+    a = math.sin(dp / 2) ** 2 + math.cos(p1) * math.cos(p2) * math.sin(dl / 2) ** 2
+    return 2 * EARTH_RADIUS_M * math.asin(min(1.0, math.sqrt(a)))
+
+
+def haversine_m_array(np, lat, lon, lat0, lon0):
+    """haversine_m from arrays of points to one point (same formula, element-wise)"""
+    p1, p2 = np.radians(lat), math.radians(lat0)
+    dp, dl = p2 - p1, np.radians(lon0 - lon)
+    a = np.sin(dp / 2) ** 2 + np.cos(p1) * math.cos(p2) * np.sin(dl / 2) ** 2
+    return 2 * EARTH_RADIUS_M * np.arcsin(np.minimum(1.0, np.sqrt(a)))
+
+
+def point_in_polygon(lat, lon, polygon):
+    """Even-odd ray casting; polygon is a list of (lat, lon) vertices (small areas, no antimeridian)"""
+    inside = False
+    j = len(polygon) - 1
+    for i in range(len(polygon)):
+        lat_i, lon_i = polygon[i]
+        lat_j, lon_j = polygon[j]
+        if (lat_i > lat) != (lat_j > lat) and lon < (lon_j - lon_i) * (lat - lat_i) / (lat_j - lat_i) + lon_i:
+            inside = not inside
+        j = i
+    return inside
+
+
+def point_in_polygon_array(np, lat, lon, polygon):
+    """point_in_polygon over arrays of points: one vectorized pass per edge"""
+    inside = np.zeros(lat.shape, dtype=bool)
+    j = len(polygon) - 1
+    for i in range(len(polygon)):
+        lat_i, lon_i = polygon[i]
+        lat_j, lon_j = polygon[j]
+        if lat_i != lat_j:  # horizontal edges never satisfy the straddle test
+            straddles = (lat_i > lat) != (lat_j > lat)
+            crossing = lon < (lon_j - lon_i) * (lat - lat_i) / (lat_j - lat_i) + lon_i
+            inside ^= straddles & crossing
+        j = i
+    return inside
+
+
+def radius_bbox(lat, lon, radius_m):
+    """
+    (min_lat, min_lon, max_lat, max_lon) enclosing a circle, on the same
+    sphere as haversine_m so every point within radius_m is inside
+    """
+    angle = radius_m / EARTH_RADIUS_M
+    dlat = math.degrees(angle)
+    # Widest point is where a meridian touches the circle, not level with its centre
+    ratio = math.sin(min(angle, math.pi / 2)) / max(1e-9, math.cos(math.radians(lat)))
+    dlon = math.degrees(math.asin(ratio)) if ratio < 1 else 180.0
+    return lat - dlat, lon - dlon, lat + dlat, lon + dlon
+
+
+def polygon_bbox(polygon):
+    lats = [p[0] for p in polygon]
+    lons = [p[1] for p in polygon]
+    return min(lats), min(lons), max(lats), max(lons)
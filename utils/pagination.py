@@ -0,0 +1,47 @@
+import streamlit as st
+from services.calendar_service import add_months, month_range
+
+
+def keyset_pager(key, fetch_page, reset_on=None):
+    """
+    Show one page of a keyset-paginated source with Previous/Next controls.
+    fetch_page(cursor) -> (rows, next_cursor), cursor None for the first page.
+    The cursors that led to the current page are kept in st.session_state[key],
+    so Previous is just a pop; they reset whenever `reset_on` (e.g. the
+    filters) changes. Returns the rows of the current page.
+    """
+    state = st.session_state.get(key)
+    if state is None or state['reset_on'] != reset_on:
+        state = {'cursors': [None], 'reset_on': reset_on}
+        st.session_state[key] = state
+
+    rows, next_cursor = fetch_page(state['cursors'][-1])
+
+    c1, c2, c3 = st.columns([1, 1, 6])
+    if c1.button("◀ Previous", key=f"{key}_prev", disabled=len(state['cursors']) == 1):
+        state['cursors'].pop()
+        st.rerun()
+    if c2.button("Next ▶", key=f"{key}_next", disabled=next_cursor is None):
+        state['cursors'].append(next_cursor)
+        st.rerun()
+    c3.caption(f"Page {len(state['cursors'])}")
+    return rows
+
+
+def month_pager(key):
+    """
+    Previous/This Month/Next controls for a view shown one month at a time.
+    The first day of the shown month is kept in st.session_state[key].
+    Returns (start, end) of that month, end exclusive.
+    """
+    month = st.session_state.get(key) or month_range()[0]
+    c1, c2, c3, c4 = st.columns([1, 1, 1, 5])
+    if c1.button("◀ Previous", key=f"{key}_prev"):
+        month = add_months(month, -1)
+    if c2.button("This Month", key=f"{key}_this"):
+        month = month_range()[0]
+    if c3.button("Next ▶", key=f"{key}_next"):
+        month = add_months(month, 1)
+    st.session_state[key] = month
+    c4.markdown(f"**{month:%B %Y}**")
+    return month_range(month)
@@ -0,0 +1,17 @@
+import hashlib
+import hmac
+from config import SECRET_KEY
+
+
+def pin_digest(pin, key=SECRET_KEY):
+    """
+    Keyed HMAC-SHA256 digest of a kiosk PIN, as stored in employees.pin_digest.
+    Keyed with SECRET_KEY so the short PIN space can't be brute-forced from
+    a copy of the database alone; changing SECRET_KEY invalidates all PINs.
+    """
+    if pin is None:
+        return None
+    pin = str(pin).strip()
+    if not pin:
+        return None
+    return hmac.new(key.encode('utf-8'), pin.encode('utf-8'), hashlib.sha256).hexdigest()